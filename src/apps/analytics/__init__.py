@@ -0,0 +1 @@
+default_app_config = 'apps.analytics.apps.AnalyticsConfig'
\ No newline at end of file
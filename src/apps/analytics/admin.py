@@ -0,0 +1,81 @@
+from django.contrib import admin
+from .models import (
+    DailyProductSales,
+    DailyVendorSales,
+    DailyCategorySales,
+    VendorSalesSummary,
+)
+
+
+class SalesRollupAdmin(admin.ModelAdmin):
+    """Read-only admin dashboard for daily sales rollups."""
+    
+    metric_display = (
+        'orders_count', 'units_sold', 'gross_revenue', 'cancelled_revenue',
+        'paid_revenue', 'refunded_amount', 'net_revenue'
+    )
+    date_hierarchy = 'date'
+    list_filter = ('date',)
+    ordering = ('-date',)
+    
+    def net_revenue(self, obj):
+        """Display revenue after cancellations and refunds."""
+        return obj.net_revenue
+    net_revenue.short_description = 'Net revenue'
+    
+    def has_add_permission(self, request):
+        """Rollups are maintained by the analytics services only."""
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+    
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(DailyProductSales)
+class DailyProductSalesAdmin(SalesRollupAdmin):
+    """Admin dashboard for daily product sales."""
+    
+    list_display = ('date', 'product') + SalesRollupAdmin.metric_display
+    list_select_related = ('product',)
+    search_fields = ('product__name',)
+
+
+@admin.register(DailyVendorSales)
+class DailyVendorSalesAdmin(SalesRollupAdmin):
+    """Admin dashboard for daily vendor sales."""
+    
+    list_display = ('date', 'vendor') + SalesRollupAdmin.metric_display
+    list_select_related = ('vendor',)
+    search_fields = ('vendor__email',)
+
+
+@admin.register(DailyCategorySales)
+class DailyCategorySalesAdmin(SalesRollupAdmin):
+    """Admin dashboard for daily category sales."""
+    
+    list_display = ('date', 'category') + SalesRollupAdmin.metric_display
+    list_select_related = ('category',)
+    list_filter = ('date', 'category')
+
+
+
+@admin.register(VendorSalesSummary)
+class VendorSalesSummaryAdmin(admin.ModelAdmin):
+    """Read-only admin for per-vendor dashboard counters."""
+    
+    list_display = (
+        'vendor', 'orders_count', 'units_sold', 'gross_revenue', 'cancelled_revenue',
+        'review_count', 'average_rating', 'pending_responses', 'updated_at'
+    )
+    list_select_related = ('vendor',)
+    search_fields = ('vendor__email',)
+    ordering = ('-gross_revenue',)
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
\ No newline at end of file
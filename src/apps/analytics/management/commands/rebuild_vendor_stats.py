@@ -0,0 +1,81 @@
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+
+from apps.orders.models import OrderItem
+from apps.reviews.models import Review
+from apps.analytics.models import VendorSalesSummary, VendorProductSales
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the per-vendor dashboard counters from orders and reviews'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--vendor',
+            type=int,
+            action='append',
+            help='Only rebuild this vendor (can be repeated)',
+        )
+
+    @transaction.atomic
+    def handle(self, *args, **options):
+        vendor_ids = options['vendor']
+
+        items = OrderItem.objects.all()
+        reviews = Review.objects.filter(is_approved=True)
+        summaries = VendorSalesSummary.objects.all()
+        product_sales = VendorProductSales.objects.all()
+        if vendor_ids:
+            items = items.filter(product__created_by_id__in=vendor_ids)
+            reviews = reviews.filter(product__created_by_id__in=vendor_ids)
+            summaries = summaries.filter(vendor_id__in=vendor_ids)
+            product_sales = product_sales.filter(vendor_id__in=vendor_ids)
+
+        cancelled = Q(order__status='cancelled')
+        totals = defaultdict(dict)
+
+        for row in items.values('product__created_by_id').annotate(
+            orders_count=Count('order_id', distinct=True),
+            units_sold=Sum('quantity', filter=~cancelled),
+            gross_revenue=Sum('subtotal'),
+            cancelled_orders=Count('order_id', distinct=True, filter=cancelled),
+            cancelled_revenue=Sum('subtotal', filter=cancelled),
+        ):
+            vendor_id = row.pop('product__created_by_id')
+            totals[vendor_id].update({field: value or 0 for field, value in row.items()})
+
+        for row in reviews.values('product__created_by_id').annotate(
+            review_count=Count('id'),
+            rating_sum=Sum('rating'),
+            pending_responses=Count('id', filter=Q(vendor_response__isnull=True)),
+        ):
+            vendor_id = row.pop('product__created_by_id')
+            totals[vendor_id].update({field: value or 0 for field, value in row.items()})
+
+        summaries.delete()
+        VendorSalesSummary.objects.bulk_create(
+            [VendorSalesSummary(vendor_id=vendor_id, **values) for vendor_id, values in totals.items()],
+            batch_size=1000
+        )
+
+        product_sales.delete()
+        VendorProductSales.objects.bulk_create(
+            [
+                VendorProductSales(
+                    vendor_id=row['product__created_by_id'],
+                    product_id=row['product_id'],
+                    units_sold=row['units_sold'] or 0,
+                    revenue=row['revenue'] or 0,
+                )
+                for row in items.values('product_id', 'product__created_by_id').annotate(
+                    units_sold=Sum('quantity', filter=~cancelled),
+                    revenue=Sum('subtotal', filter=~cancelled),
+                )
+            ],
+            batch_size=1000
+        )
+
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt dashboard counters for {len(totals)} vendors'))
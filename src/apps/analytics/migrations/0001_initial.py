@@ -0,0 +1,93 @@
+# Generated by Django 6.0 on 2026-10-19 10:12
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('products', '0002_product_image_variants'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyCategorySales',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('orders_count', models.IntegerField(default=0)),
+                ('units_sold', models.IntegerField(default=0)),
+                ('gross_revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('cancelled_orders', models.IntegerField(default=0)),
+                ('cancelled_revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('paid_revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('refund_count', models.IntegerField(default=0)),
+                ('refunded_amount', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_sales', to='products.category')),
+            ],
+            options={
+                'verbose_name': 'Daily Category Sales',
+                'verbose_name_plural': 'Daily Category Sales',
+                'db_table': 'analytics_daily_category_sales',
+                'ordering': ['-date'],
+                'abstract': False,
+                'unique_together': {('date', 'category')},
+            },
+        ),
+        migrations.CreateModel(
+            name='DailyProductSales',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('orders_count', models.IntegerField(default=0)),
+                ('units_sold', models.IntegerField(default=0)),
+                ('gross_revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('cancelled_orders', models.IntegerField(default=0)),
+                ('cancelled_revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('paid_revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('refund_count', models.IntegerField(default=0)),
+                ('refunded_amount', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_sales', to='products.product')),
+            ],
+            options={
+                'verbose_name': 'Daily Product Sales',
+                'verbose_name_plural': 'Daily Product Sales',
+                'db_table': 'analytics_daily_product_sales',
+                'ordering': ['-date'],
+                'abstract': False,
+                'unique_together': {('date', 'product')},
+            },
+        ),
+        migrations.CreateModel(
+            name='DailyVendorSales',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('orders_count', models.IntegerField(default=0)),
+                ('units_sold', models.IntegerField(default=0)),
+                ('gross_revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('cancelled_orders', models.IntegerField(default=0)),
+                ('cancelled_revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('paid_revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('refund_count', models.IntegerField(default=0)),
+                ('refunded_amount', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('vendor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_sales', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Daily Vendor Sales',
+                'verbose_name_plural': 'Daily Vendor Sales',
+                'db_table': 'analytics_daily_vendor_sales',
+                'ordering': ['-date'],
+                'abstract': False,
+                'unique_together': {('date', 'vendor')},
+            },
+        ),
+    ]
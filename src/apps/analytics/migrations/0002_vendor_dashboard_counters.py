@@ -0,0 +1,55 @@
+# Generated by Django 6.0 on 2026-10-19 11:40
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0001_initial'),
+        ('products', '0002_product_image_variants'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VendorSalesSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('orders_count', models.IntegerField(default=0)),
+                ('units_sold', models.IntegerField(default=0)),
+                ('gross_revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('cancelled_orders', models.IntegerField(default=0)),
+                ('cancelled_revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('review_count', models.IntegerField(default=0)),
+                ('rating_sum', models.IntegerField(default=0)),
+                ('pending_responses', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('vendor', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='sales_summary', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Vendor Sales Summary',
+                'verbose_name_plural': 'Vendor Sales Summaries',
+                'db_table': 'analytics_vendor_sales_summary',
+            },
+        ),
+        migrations.CreateModel(
+            name='VendorProductSales',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('units_sold', models.IntegerField(default=0)),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('product', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='sales_totals', to='products.product')),
+                ('vendor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='product_sales', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Vendor Product Sales',
+                'verbose_name_plural': 'Vendor Product Sales',
+                'db_table': 'analytics_vendor_product_sales',
+                'indexes': [models.Index(fields=['vendor', '-revenue'], name='analytics_v_vendor__389753_idx')],
+            },
+        ),
+    ]
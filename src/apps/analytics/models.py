@@ -0,0 +1,162 @@
+from django.db import models
+from django.conf import settings
+from apps.products.models import Category, Product
+
+
+class SalesRollup(models.Model):
+    """
+    Daily sales metrics, attributed to the day the order was placed.
+    
+    Rows are maintained incrementally from checkout, payment and refund
+    events, and rebuilt by the ``backfill_sales_analytics`` command.
+    """
+    
+    METRIC_FIELDS = (
+        'orders_count', 'units_sold', 'gross_revenue',
+        'cancelled_orders', 'cancelled_revenue', 'paid_revenue',
+        'refund_count', 'refunded_amount',
+    )
+    
+    date = models.DateField()
+    
+    orders_count = models.IntegerField(default=0)
+    # Units of the orders that weren't cancelled
+    units_sold = models.IntegerField(default=0)
+    gross_revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    
+    cancelled_orders = models.IntegerField(default=0)
+    cancelled_revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    
+    paid_revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    
+    refund_count = models.IntegerField(default=0)
+    refunded_amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        abstract = True
+        ordering = ['-date']
+    
+    @property
+    def net_revenue(self):
+        """Revenue after cancellations and refunds."""
+        return self.gross_revenue - self.cancelled_revenue - self.refunded_amount
+    
+    @property
+    def refund_rate(self):
+        """Share of paid revenue that was refunded."""
+        if not self.paid_revenue:
+            return 0
+        return self.refunded_amount / self.paid_revenue
+
+
+class DailyProductSales(SalesRollup):
+    """Daily sales rollup per product."""
+    
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='daily_sales')
+    
+    class Meta(SalesRollup.Meta):
+        db_table = 'analytics_daily_product_sales'
+        verbose_name = 'Daily Product Sales'
+        verbose_name_plural = 'Daily Product Sales'
+        unique_together = ('date', 'product')
+    
+    def __str__(self):
+        return f"Product #{self.product_id} sales on {self.date}"
+
+
+class DailyVendorSales(SalesRollup):
+    """Daily sales rollup per vendor (``Product.created_by``)."""
+    
+    vendor = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='daily_sales')
+    
+    class Meta(SalesRollup.Meta):
+        db_table = 'analytics_daily_vendor_sales'
+        verbose_name = 'Daily Vendor Sales'
+        verbose_name_plural = 'Daily Vendor Sales'
+        unique_together = ('date', 'vendor')
+    
+    def __str__(self):
+        return f"Vendor #{self.vendor_id} sales on {self.date}"
+
+
+class DailyCategorySales(SalesRollup):
+    """Daily sales rollup per category."""
+    
+    category = models.ForeignKey(Category, on_delete=models.CASCADE, related_name='daily_sales')
+    
+    class Meta(SalesRollup.Meta):
+        db_table = 'analytics_daily_category_sales'
+        verbose_name = 'Daily Category Sales'
+        verbose_name_plural = 'Daily Category Sales'
+        unique_together = ('date', 'category')
+    
+    def __str__(self):
+        return f"Category #{self.category_id} sales on {self.date}"
+
+
+class VendorSalesSummary(models.Model):
+    """
+    Running per-vendor counters behind the vendor dashboard.
+    
+    Kept up to date by the checkout/cancel paths and review signals, and
+    rebuilt by the ``rebuild_vendor_stats`` command.
+    """
+    
+    vendor = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='sales_summary')
+    
+    orders_count = models.IntegerField(default=0)
+    # Units of the orders that weren't cancelled
+    units_sold = models.IntegerField(default=0)
+    gross_revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    cancelled_orders = models.IntegerField(default=0)
+    cancelled_revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    
+    # Approved reviews of the vendor's products
+    review_count = models.IntegerField(default=0)
+    rating_sum = models.IntegerField(default=0)
+    pending_responses = models.IntegerField(default=0)
+    
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'analytics_vendor_sales_summary'
+        verbose_name = 'Vendor Sales Summary'
+        verbose_name_plural = 'Vendor Sales Summaries'
+    
+    def __str__(self):
+        return f"Sales summary of vendor #{self.vendor_id}"
+    
+    @property
+    def net_revenue(self):
+        """Revenue after cancellations."""
+        return self.gross_revenue - self.cancelled_revenue
+    
+    @property
+    def average_rating(self):
+        """Average rating of the vendor's approved reviews."""
+        if not self.review_count:
+            return 0
+        return round(self.rating_sum / self.review_count, 2)
+
+
+class VendorProductSales(models.Model):
+    """Net all-time sales per product, used to rank a vendor's top products."""
+    
+    vendor = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='product_sales')
+    product = models.OneToOneField(Product, on_delete=models.CASCADE, related_name='sales_totals')
+    units_sold = models.IntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'analytics_vendor_product_sales'
+        verbose_name = 'Vendor Product Sales'
+        verbose_name_plural = 'Vendor Product Sales'
+        indexes = [
+            models.Index(fields=['vendor', '-revenue']),
+        ]
+    
+    def __str__(self):
+        return f"Sales totals of product #{self.product_id}"
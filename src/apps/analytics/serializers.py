@@ -0,0 +1,83 @@
+from rest_framework import serializers
+from .models import (
+    SalesRollup,
+    DailyProductSales,
+    DailyVendorSales,
+    DailyCategorySales,
+    VendorSalesSummary,
+    VendorProductSales,
+)
+
+
+ROLLUP_FIELDS = ('date',) + SalesRollup.METRIC_FIELDS + ('net_revenue', 'refund_rate')
+
+
+class SalesRollupSerializer(serializers.ModelSerializer):
+    """Base serializer for daily sales rollups."""
+    
+    net_revenue = serializers.DecimalField(max_digits=14, decimal_places=2, read_only=True)
+    refund_rate = serializers.DecimalField(max_digits=6, decimal_places=4, read_only=True)
+
+
+class DailyProductSalesSerializer(SalesRollupSerializer):
+    """Serializer for daily product sales."""
+    
+    product_name = serializers.CharField(source='product.name', read_only=True)
+    
+    class Meta:
+        model = DailyProductSales
+        fields = ('product', 'product_name') + ROLLUP_FIELDS
+
+
+class DailyVendorSalesSerializer(SalesRollupSerializer):
+    """Serializer for daily vendor sales."""
+    
+    vendor_email = serializers.EmailField(source='vendor.email', read_only=True)
+    
+    class Meta:
+        model = DailyVendorSales
+        fields = ('vendor', 'vendor_email') + ROLLUP_FIELDS
+
+
+class DailyCategorySalesSerializer(SalesRollupSerializer):
+    """Serializer for daily category sales."""
+    
+    category_name = serializers.CharField(source='category.name', read_only=True)
+    
+    class Meta:
+        model = DailyCategorySales
+        fields = ('category', 'category_name') + ROLLUP_FIELDS
+
+
+class VendorSalesSummarySerializer(serializers.ModelSerializer):
+    """Serializer for a vendor's running totals."""
+    
+    net_revenue = serializers.DecimalField(max_digits=14, decimal_places=2, read_only=True)
+    average_rating = serializers.FloatField(read_only=True)
+    
+    class Meta:
+        model = VendorSalesSummary
+        fields = (
+            'orders_count', 'units_sold', 'gross_revenue', 'cancelled_orders',
+            'cancelled_revenue', 'net_revenue', 'review_count', 'average_rating',
+            'pending_responses', 'updated_at'
+        )
+
+
+class VendorDailySalesSerializer(serializers.ModelSerializer):
+    """Serializer for one day of a vendor's sales."""
+    
+    class Meta:
+        model = DailyVendorSales
+        fields = ('date', 'orders_count', 'units_sold', 'gross_revenue', 'cancelled_revenue')
+
+
+class VendorTopProductSerializer(serializers.ModelSerializer):
+    """Serializer for a vendor's best selling products."""
+    
+    product_name = serializers.CharField(source='product.name', read_only=True)
+    product_slug = serializers.CharField(source='product.slug', read_only=True)
+    
+    class Meta:
+        model = VendorProductSales
+        fields = ('product', 'product_name', 'product_slug', 'units_sold', 'revenue')
@@ -0,0 +1,198 @@
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import (
+    DailyProductSales,
+    DailyVendorSales,
+    DailyCategorySales,
+    VendorSalesSummary,
+    VendorProductSales,
+)
+
+
+# Rollup model -> attribute of an item row holding its dimension key
+ROLLUP_DIMENSIONS = (
+    (DailyProductSales, 'product_id'),
+    (DailyVendorSales, 'vendor_id'),
+    (DailyCategorySales, 'category_id'),
+)
+
+CENT = Decimal('0.01')
+
+
+def order_date(order):
+    """Return the (local) day an order is attributed to."""
+    return timezone.localtime(order.created_at).date()
+
+
+def _order_item_rows(order):
+    """Return the items of an order with their product, vendor and category keys."""
+    return list(
+        order.items.values(
+            'product_id', 'quantity', 'subtotal',
+            vendor_id=F('product__created_by_id'),
+            category_id=F('product__category_id'),
+        )
+    )
+
+
+def _collect(rows, metrics_for_item):
+    """
+    Group per-item metric deltas by rollup model and dimension key.
+    
+    ``orders_count``/``cancelled_orders``/``refund_count`` are counted once per
+    dimension key, not once per item.
+    """
+    deltas = {model: defaultdict(lambda: defaultdict(int)) for model, _ in ROLLUP_DIMENSIONS}
+    once_per_key = ('orders_count', 'cancelled_orders', 'refund_count')
+    
+    for row in rows:
+        item_metrics = metrics_for_item(row)
+        for model, key_attr in ROLLUP_DIMENSIONS:
+            bucket = deltas[model][row[key_attr]]
+            for field, value in item_metrics.items():
+                if field in once_per_key:
+                    bucket[field] = value
+                else:
+                    bucket[field] += value
+    return deltas
+
+
+def increment(model, lookup, metrics, defaults=None):
+    """Atomically add ``metrics`` to the row matching ``lookup``, creating it if needed."""
+    updates = {field: F(field) + value for field, value in metrics.items()}
+    
+    if model.objects.filter(**lookup).update(**updates):
+        return
+    
+    try:
+        with transaction.atomic():
+            model.objects.create(**lookup, **(defaults or {}), **metrics)
+    except IntegrityError:
+        # Another transaction created the row first
+        model.objects.filter(**lookup).update(**updates)
+
+
+def _apply(date, deltas):
+    """Add metric deltas to the rollup rows of a day."""
+    for model, key_attr in ROLLUP_DIMENSIONS:
+        for key, metrics in deltas[model].items():
+            increment(model, {'date': date, key_attr: key}, metrics)
+
+
+def _apply_vendor_totals(rows, sign):
+    """Add (sign=1) or remove (sign=-1) order items from the per-vendor counters."""
+    vendors = defaultdict(lambda: {'units_sold': 0, 'gross_revenue': 0})
+    for row in rows:
+        vendors[row['vendor_id']]['units_sold'] += row['quantity']
+        vendors[row['vendor_id']]['gross_revenue'] += row['subtotal']
+        
+        increment(
+            VendorProductSales,
+            {'product_id': row['product_id']},
+            {'units_sold': sign * row['quantity'], 'revenue': sign * row['subtotal']},
+            defaults={'vendor_id': row['vendor_id']},
+        )
+    
+    for vendor_id, totals in vendors.items():
+        if sign > 0:
+            metrics = {'orders_count': 1, **totals}
+        else:
+            metrics = {
+                'cancelled_orders': 1,
+                'units_sold': -totals['units_sold'],
+                'cancelled_revenue': totals['gross_revenue'],
+            }
+        increment(VendorSalesSummary, {'vendor_id': vendor_id}, metrics)
+
+
+def _allocate(amount, rows):
+    """
+    Split an order-level amount across items pro rata to their subtotal.
+    
+    Shares are rounded to the cent and the rounding remainder goes to the
+    last item, so they always add up to ``amount``.
+    """
+    total = sum(row['subtotal'] for row in rows)
+    if not total:
+        return {}
+    shares = {id(row): (amount * row['subtotal'] / total).quantize(CENT) for row in rows}
+    shares[id(rows[-1])] += amount - sum(shares.values())
+    return shares
+
+
+@transaction.atomic
+def record_order_placed(order):
+    """Add a newly placed order to the rollups."""
+    rows = _order_item_rows(order)
+    deltas = _collect(rows, lambda row: {
+        'orders_count': 1,
+        'units_sold': row['quantity'],
+        'gross_revenue': row['subtotal'],
+    })
+    _apply(order_date(order), deltas)
+    _apply_vendor_totals(rows, 1)
+
+
+@transaction.atomic
+def record_order_cancelled(order):
+    """Record the cancellation of an order."""
+    rows = _order_item_rows(order)
+    deltas = _collect(rows, lambda row: {
+        'cancelled_orders': 1,
+        'units_sold': -row['quantity'],
+        'cancelled_revenue': row['subtotal'],
+    })
+    _apply(order_date(order), deltas)
+    _apply_vendor_totals(rows, -1)
+
+
+@transaction.atomic
+def record_payment_completed(payment):
+    """Record the revenue collected by a completed payment."""
+    order = payment.order
+    if order is None:
+        # Archived orders are no longer in the rollups' source data
+        return
+    rows = _order_item_rows(order)
+    deltas = _collect(rows, lambda row: {'paid_revenue': row['subtotal']})
+    _apply(order_date(order), deltas)
+
+
+def refund_deltas(refund):
+    """Return the rollup deltas of a completed refund, split across the order's items."""
+    order = refund.payment.order
+    rows = _order_item_rows(order)
+    shares = _allocate(refund.amount, rows)
+    return _collect(rows, lambda row: {
+        'refund_count': 1,
+        'refunded_amount': shares.get(id(row), Decimal('0')),
+    })
+
+
+@transaction.atomic
+def record_refund_completed(refund):
+    """Record a completed refund."""
+    if refund.payment.order is None:
+        return
+    _apply(order_date(refund.payment.order), refund_deltas(refund))
+
+
+def review_contribution(review, has_response):
+    """Return the (review_count, rating_sum, pending_responses) a review adds to its vendor."""
+    if not review['is_approved']:
+        return 0, 0, 0
+    return 1, review['rating'], 0 if has_response else 1
+
+
+def record_review_change(vendor_id, before, after):
+    """Apply the difference between two review contributions to the vendor counters."""
+    delta = [new - old for old, new in zip(before, after)]
+    if any(delta):
+        increment(VendorSalesSummary, {'vendor_id': vendor_id}, dict(zip(
+            ('review_count', 'rating_sum', 'pending_responses'), delta
+        )))
@@ -0,0 +1,66 @@
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from apps.reviews.models import Review, VendorResponse
+from .services import review_contribution, record_review_change
+
+TRACKED_REVIEW_FIELDS = {'rating', 'is_approved'}
+NO_CONTRIBUTION = (0, 0, 0)
+
+
+def _tracks(update_fields):
+    return update_fields is None or TRACKED_REVIEW_FIELDS & set(update_fields)
+
+
+@receiver(pre_save, sender=Review)
+def remember_review_state(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Keep the stored rating/approval so post_save can apply a delta."""
+    instance._stats_before = None
+    if not raw and instance.pk and _tracks(update_fields):
+        instance._stats_before = (
+            Review.objects.filter(pk=instance.pk).values('rating', 'is_approved').first()
+        )
+
+
+@receiver(post_save, sender=Review)
+def track_review_saved(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    """Update the vendor's rating summary and pending response count."""
+    if raw or not _tracks(update_fields):
+        return
+    
+    has_response = not created and VendorResponse.objects.filter(review_id=instance.pk).exists()
+    before = getattr(instance, '_stats_before', None)
+    after = {'rating': instance.rating, 'is_approved': instance.is_approved}
+    
+    record_review_change(
+        instance.product.created_by_id,
+        review_contribution(before, has_response) if before else NO_CONTRIBUTION,
+        review_contribution(after, has_response),
+    )
+
+
+@receiver(post_delete, sender=Review)
+def track_review_deleted(sender, instance, **kwargs):
+    """Remove a deleted review from the vendor's rating summary."""
+    # Responses are deleted first by the cascade, so the review counts as unanswered
+    after = {'rating': instance.rating, 'is_approved': instance.is_approved}
+    record_review_change(
+        instance.product.created_by_id,
+        review_contribution(after, has_response=False),
+        NO_CONTRIBUTION,
+    )
+
+
+@receiver(post_save, sender=VendorResponse)
+def track_response_created(sender, instance, created, raw=False, **kwargs):
+    """A new response clears one pending review."""
+    review = instance.review
+    if created and not raw and review.is_approved:
+        record_review_change(review.product.created_by_id, (0, 0, 1), NO_CONTRIBUTION)
+
+
+@receiver(post_delete, sender=VendorResponse)
+def track_response_deleted(sender, instance, **kwargs):
+    """Deleting a response makes the review pending again."""
+    review = instance.review
+    if review.is_approved:
+        record_review_change(review.product.created_by_id, NO_CONTRIBUTION, (0, 0, 1))
@@ -0,0 +1,44 @@
+from apps.core.events import (
+    subscriber,
+    ORDER_CREATED,
+    ORDER_STATUS_CHANGED,
+    PAYMENT_COMPLETED,
+    REFUND_COMPLETED,
+    VENDOR_REVIEWS_CHANGED,
+)
+from apps.orders.models import Order
+from apps.payments.models import Payment, Refund
+from . import services
+from .signals import NO_CONTRIBUTION
+
+
+@subscriber(ORDER_CREATED)
+def order_created(event):
+    services.record_order_placed(Order.objects.get(pk=event.aggregate_id))
+
+
+@subscriber(ORDER_STATUS_CHANGED)
+def order_status_changed(event):
+    if event.payload['new_status'] == 'cancelled':
+        services.record_order_cancelled(Order.objects.get(pk=event.aggregate_id))
+
+
+@subscriber(PAYMENT_COMPLETED)
+def payment_completed(event):
+    services.record_payment_completed(Payment.objects.select_related('order').get(pk=event.aggregate_id))
+
+
+@subscriber(REFUND_COMPLETED)
+def refund_completed(event):
+    services.record_refund_completed(Refund.objects.select_related('payment__order').get(pk=event.aggregate_id))
+
+
+@subscriber(VENDOR_REVIEWS_CHANGED)
+def vendor_reviews_changed(event):
+    """Apply the rating counter change of a bulk review (dis)approval."""
+    delta = event.payload
+    services.record_review_change(
+        int(event.aggregate_id),
+        NO_CONTRIBUTION,
+        (delta['review_count'], delta['rating_sum'], delta['pending_responses']),
+    )
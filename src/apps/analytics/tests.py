@@ -0,0 +1,180 @@
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from apps.orders.models import Order, OrderItem
+from apps.payments.models import Payment, Refund
+from apps.products.models import Category, Product
+from apps.reviews.models import Review, VendorResponse
+from . import services
+from .models import DailyCategorySales, DailyProductSales, DailyVendorSales, VendorProductSales, VendorSalesSummary
+
+ADDRESS = {
+    'shipping_address': '1 Main Street',
+    'shipping_city': 'Springfield',
+    'shipping_state': 'IL',
+    'shipping_zip_code': '62701',
+    'shipping_country': 'US',
+    'phone_number': '+15555550100',
+}
+
+ROLLUP_VALUES = ('orders_count', 'units_sold', 'gross_revenue', 'cancelled_orders', 'cancelled_revenue', 'refunded_amount')
+SUMMARY_COUNTERS = ('orders_count', 'units_sold', 'gross_revenue', 'review_count', 'rating_sum', 'pending_responses')
+
+
+@override_settings(SNOWFLAKE_NODE_ID=7)
+class SalesRollupTests(TestCase):
+    """Orders, cancellations and refunds are added to the rollups as the backfill would count them."""
+    
+    def setUp(self):
+        User = get_user_model()
+        self.vendor = User.objects.create_user('vendor@example.com', None)
+        buyer = User.objects.create_user('buyer@example.com', None)
+        category = Category.objects.create(name='Books')
+        self.products = [
+            Product.objects.create(name=name, description='', price=10, stock=10, category=category, created_by=self.vendor)
+            for name in ('First', 'Second', 'Third')
+        ]
+        
+        # Three items of 10.00 behind a total with 5.00 shipping
+        self.order = Order.objects.create(user=buyer, subtotal=30, shipping_cost=5, total=35, **ADDRESS)
+        for product in self.products:
+            OrderItem.objects.create(
+                order=self.order, product=product, product_name=product.name,
+                product_price=10, quantity=1, subtotal=10,
+            )
+        services.record_order_placed(self.order)
+    
+    def rollup(self, model=DailyVendorSales, **lookup):
+        return model.objects.filter(**lookup or {'vendor': self.vendor}).values(*ROLLUP_VALUES).get()
+    
+    def refund(self, amount):
+        payment = Payment.objects.create(
+            order=self.order, user=self.order.user, payment_method='stripe', status='refunded', amount=35,
+        )
+        refund = Refund.objects.create(payment=payment, amount=amount, reason='Damaged', status='completed')
+        services.record_refund_completed(refund)
+    
+    def assertMatchesBackfill(self):
+        def rollups():
+            return {
+                model: list(model.objects.order_by(key_attr).values(key_attr, *ROLLUP_VALUES))
+                for model, key_attr in services.ROLLUP_DIMENSIONS
+            }
+        
+        live = rollups()
+        call_command('backfill_sales_analytics', stdout=StringIO())
+        self.assertEqual(rollups(), live)
+    
+    def test_order_placed(self):
+        self.assertEqual(self.rollup(), {
+            'orders_count': 1, 'units_sold': 3, 'gross_revenue': 30,
+            'cancelled_orders': 0, 'cancelled_revenue': 0, 'refunded_amount': 0,
+        })
+        self.assertEqual(VendorSalesSummary.objects.get(vendor=self.vendor).units_sold, 3)
+        self.assertMatchesBackfill()
+    
+    def test_order_cancelled(self):
+        self.order.status = 'cancelled'
+        self.order.save()
+        services.record_order_cancelled(self.order)
+        
+        self.assertEqual(self.rollup(), {
+            'orders_count': 1, 'units_sold': 0, 'gross_revenue': 30,
+            'cancelled_orders': 1, 'cancelled_revenue': 30, 'refunded_amount': 0,
+        })
+        summary = VendorSalesSummary.objects.get(vendor=self.vendor)
+        self.assertEqual((summary.units_sold, summary.net_revenue), (0, 0))
+        self.assertFalse(VendorProductSales.objects.exclude(units_sold=0).exists())
+        self.assertMatchesBackfill()
+        
+        call_command('rebuild_vendor_stats', stdout=StringIO())
+        self.assertEqual(VendorSalesSummary.objects.get(vendor=self.vendor).units_sold, 0)
+    
+    def test_refund_is_split_over_the_items(self):
+        # 10.00 over three equal items: 3.33 + 3.33 + 3.34, shipping doesn't dilute it
+        self.refund(Decimal('10.00'))
+        
+        self.assertEqual(self.rollup()['refunded_amount'], Decimal('10.00'))
+        shares = [self.rollup(DailyProductSales, product=product)['refunded_amount'] for product in self.products]
+        self.assertEqual(sorted(shares), [Decimal('3.33'), Decimal('3.33'), Decimal('3.34')])
+        self.assertMatchesBackfill()
+    
+    def test_full_refund_including_shipping(self):
+        self.refund(Decimal('35.00'))
+        
+        self.assertEqual(self.rollup()['refunded_amount'], Decimal('35.00'))
+        self.assertMatchesBackfill()
+
+
+@override_settings(SNOWFLAKE_NODE_ID=7)
+class VendorDashboardTests(TestCase):
+    """Vendors see their running counters, kept in step with orders and reviews."""
+    
+    def setUp(self):
+        User = get_user_model()
+        self.vendor = User.objects.create_user('vendor@example.com', None, role='vendor')
+        self.buyer = User.objects.create_user('buyer@example.com', None)
+        category = Category.objects.create(name='Books')
+        self.product = Product.objects.create(
+            name='Book', description='', price=10, stock=10, category=category, created_by=self.vendor
+        )
+        
+        order = Order.objects.create(user=self.buyer, subtotal=20, total=20, **ADDRESS)
+        OrderItem.objects.create(order=order, product=self.product, product_name='Book', product_price=10, quantity=2)
+        services.record_order_placed(order)
+        
+        self.client = APIClient()
+        self.client.force_authenticate(self.vendor)
+    
+    def dashboard(self, query=''):
+        return self.client.get(f'/api/v1/analytics/vendor/dashboard/{query}')
+    
+    def review(self, rating, **fields):
+        return Review.objects.create(
+            product=self.product, user=self.buyer, rating=rating, title='Review', comment='', **fields
+        )
+    
+    def test_dashboard(self):
+        response = self.dashboard()
+        
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual((data['totals']['orders_count'], data['totals']['units_sold']), (1, 2))
+        self.assertEqual(data['totals']['net_revenue'], '20.00')
+        self.assertEqual([day['units_sold'] for day in data['daily']], [2])
+        self.assertEqual([(row['product_slug'], row['units_sold']) for row in data['top_products']], [('book', 2)])
+    
+    def test_review_counters(self):
+        review = self.review(4)
+        other = self.review(2, is_approved=False)
+        self.assertEqual(self.dashboard().json()['totals']['review_count'], 1)
+        
+        VendorResponse.objects.create(review=review, vendor=self.vendor, response='Thanks')
+        other.is_approved = True
+        other.save()
+        totals = self.dashboard().json()['totals']
+        self.assertEqual((totals['review_count'], totals['average_rating'], totals['pending_responses']), (2, 3.0, 1))
+        
+        review.delete()
+        summary = VendorSalesSummary.objects.filter(vendor=self.vendor).values(*SUMMARY_COUNTERS)
+        live = summary.get()
+        call_command('rebuild_vendor_stats', stdout=StringIO())
+        self.assertEqual(summary.get(), live)
+    
+    def test_customers_are_refused(self):
+        self.client.force_authenticate(self.buyer)
+        self.assertEqual(self.dashboard().status_code, 403)
+    
+    def test_invalid_parameters(self):
+        self.assertEqual(self.dashboard('?days=0').status_code, 400)
+        self.assertEqual(self.dashboard('?days=week').status_code, 400)
+        
+        admin = get_user_model().objects.create_user('admin@example.com', None, is_staff=True)
+        self.client.force_authenticate(admin)
+        self.assertEqual(self.dashboard('?vendor=me').status_code, 400)
+        self.assertEqual(self.dashboard(f'?vendor={self.vendor.pk}').json()['totals']['orders_count'], 1)
@@ -0,0 +1,16 @@
+from django.urls import path
+from .views import (
+    ProductSalesListView,
+    VendorSalesListView,
+    CategorySalesListView,
+    VendorDashboardView,
+)
+
+app_name = 'analytics'
+
+urlpatterns = [
+    path('sales/products/', ProductSalesListView.as_view(), name='product_sales'),
+    path('sales/vendors/', VendorSalesListView.as_view(), name='vendor_sales'),
+    path('sales/categories/', CategorySalesListView.as_view(), name='category_sales'),
+    path('vendor/dashboard/', VendorDashboardView.as_view(), name='vendor_dashboard'),
+]
@@ -0,0 +1,122 @@
+from datetime import timedelta
+from rest_framework import generics, status
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from django_filters.rest_framework import DjangoFilterBackend
+from .models import (
+    DailyProductSales,
+    DailyVendorSales,
+    DailyCategorySales,
+    VendorSalesSummary,
+    VendorProductSales,
+)
+from .serializers import (
+    DailyProductSalesSerializer,
+    DailyVendorSalesSerializer,
+    DailyCategorySalesSerializer,
+    VendorSalesSummarySerializer,
+    VendorDailySalesSerializer,
+    VendorTopProductSerializer,
+)
+
+
+class SalesRollupListView(generics.ListAPIView):
+    """Base view for read-only daily sales rollups filtered by date range."""
+    
+    permission_classes = (IsAdminUser,)
+    filter_backends = [DjangoFilterBackend]
+    
+    def filter_date_range(self, queryset):
+        """Apply the optional ``start``/``end`` (YYYY-MM-DD) query parameters."""
+        for param, lookup in (('start', 'date__gte'), ('end', 'date__lte')):
+            value = self.request.query_params.get(param)
+            if value:
+                day = parse_date(value)
+                if day is None:
+                    raise ValidationError({param: 'Use YYYY-MM-DD.'})
+                queryset = queryset.filter(**{lookup: day})
+        return queryset
+
+
+class ProductSalesListView(SalesRollupListView):
+    """API endpoint to list daily sales per product (admin only)."""
+    
+    serializer_class = DailyProductSalesSerializer
+    filterset_fields = ['product', 'date']
+    
+    def get_queryset(self):
+        return self.filter_date_range(DailyProductSales.objects.select_related('product'))
+
+
+class VendorSalesListView(SalesRollupListView):
+    """API endpoint to list daily sales per vendor (admin only)."""
+    
+    serializer_class = DailyVendorSalesSerializer
+    filterset_fields = ['vendor', 'date']
+    
+    def get_queryset(self):
+        return self.filter_date_range(DailyVendorSales.objects.select_related('vendor'))
+
+
+class CategorySalesListView(SalesRollupListView):
+    """API endpoint to list daily sales per category (admin only)."""
+    
+    serializer_class = DailyCategorySalesSerializer
+    filterset_fields = ['category', 'date']
+    
+    def get_queryset(self):
+        return self.filter_date_range(DailyCategorySales.objects.select_related('category'))
+
+
+class VendorDashboardView(APIView):
+    """
+    API endpoint for a vendor's sales dashboard.
+    
+    Every section reads precomputed counters, so the cost does not depend on
+    the size of the vendor's order history. Admins can pass ``?vendor=<id>``.
+    """
+    
+    permission_classes = (IsAuthenticated,)
+    max_days = 365
+    top_products_limit = 10
+    
+    def get(self, request):
+        user = request.user
+        if user.is_staff and request.query_params.get('vendor'):
+            try:
+                vendor_id = int(request.query_params['vendor'])
+            except ValueError:
+                raise ValidationError({'vendor': 'Must be an integer.'})
+        elif user.role == 'vendor':
+            vendor_id = user.id
+        else:
+            return Response(
+                {'error': 'Only vendors can view the vendor dashboard.'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
+        try:
+            days = min(int(request.query_params.get('days', 30)), self.max_days)
+        except ValueError:
+            raise ValidationError({'days': 'Must be an integer.'})
+        if days < 1:
+            raise ValidationError({'days': 'Must be at least 1.'})
+        
+        summary = VendorSalesSummary.objects.filter(vendor_id=vendor_id).first() or VendorSalesSummary()
+        since = timezone.localdate() - timedelta(days=days - 1)
+        daily = DailyVendorSales.objects.filter(vendor_id=vendor_id, date__gte=since).order_by('date')
+        top_products = (
+            VendorProductSales.objects.filter(vendor_id=vendor_id)
+            .select_related('product')
+            .order_by('-revenue')[:self.top_products_limit]
+        )
+        
+        return Response({
+            'totals': VendorSalesSummarySerializer(summary).data,
+            'daily': VendorDailySalesSerializer(daily, many=True).data,
+            'top_products': VendorTopProductSerializer(top_products, many=True).data,
+        })
@@ -0,0 +1,19 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from apps.core.jobs import delete_in_batches, periodic_job
+
+from .models import Cart, CartItem
+
+
+@periodic_job(interval=timedelta(days=1))
+def purge_abandoned_carts():
+    """Delete carts (and their items) untouched for ``CART_ABANDONED_DAYS``."""
+    cutoff = timezone.now() - timedelta(days=settings.CART_ABANDONED_DAYS)
+    recent_items = CartItem.objects.filter(cart=OuterRef('pk'), updated_at__gte=cutoff)
+    return {'deleted': delete_in_batches(
+        Cart.objects.filter(updated_at__lt=cutoff).exclude(Exists(recent_items))
+    )}
@@ -1,4 +1,9 @@
+from decimal import Decimal
+
 from django.db import models
+from django.db.models import F, Sum
+from django.db.models.functions import Coalesce
+from django.utils.functional import cached_property
 from django.conf import settings
 from django.core.validators import MinValueValidator
 from apps.products.models import Product
@@ -28,6 +33,15 @@ class Cart(models.Model):
     def total_price(self):
         """Calculate total price of all items in cart."""
         return sum(item.subtotal for item in self.items.all())
+    
+    @cached_property
+    def totals(self):
+        """Item count and price of the cart, summed in one query."""
+        price = F('quantity') * F('product__price')
+        return self.items.aggregate(
+            items=Coalesce(Sum('quantity'), 0),
+            price=Coalesce(Sum(price, output_field=models.DecimalField()), Decimal('0')),
+        )
 
 
 class CartItem(models.Model):
@@ -56,8 +70,9 @@ class CartItem(models.Model):
     def clean(self):
         """Validate that quantity doesn't exceed stock."""
         from django.core.exceptions import ValidationError
-        if self.quantity > self.product.stock:
-            raise ValidationError(f'Only {self.product.stock} items available in stock.')
+        available = self.product.available_stock
+        if self.quantity > available:
+            raise ValidationError(f'Only {available} items available in stock.')
     
     def save(self, *args, **kwargs):
         """Validate before saving."""
@@ -1,20 +1,28 @@
 from rest_framework import serializers
 from .models import Cart, CartItem
 from apps.products.models import Product
+from apps.products.serializers import ImageVariantField
+from apps.core.serializers import CompiledListSerializer, CompiledSerializerMixin
 
 
-class CartItemSerializer(serializers.ModelSerializer):
+class CartItemSerializer(CompiledSerializerMixin, serializers.ModelSerializer):
     """Serializer for cart items."""
     
     product_name = serializers.CharField(source='product.name', read_only=True)
     product_price = serializers.DecimalField(source='product.price', max_digits=10, decimal_places=2, read_only=True)
     product_image = serializers.ImageField(source='product.image', read_only=True)
+    product_thumbnail = ImageVariantField('thumbnail', source='product')
     subtotal = serializers.DecimalField(max_digits=10, decimal_places=2, read_only=True)
     
     class Meta:
         model = CartItem
-        fields = ('id', 'product', 'product_name', 'product_price', 'product_image', 'quantity', 'subtotal', 'created_at')
+        fields = ('id', 'product', 'product_name', 'product_price', 'product_image', 'product_thumbnail', 'quantity', 'subtotal', 'created_at')
         read_only_fields = ('id', 'created_at')
+        # Nested cart items are read as rows
+        list_serializer_class = CompiledListSerializer
+        compiled_sources = {
+            'subtotal': (('product__price', 'quantity'), lambda price, quantity: price * quantity),
+        }
     
     def validate_quantity(self, value):
         """Validate quantity."""
@@ -30,8 +38,9 @@ class CartItemSerializer(serializers.ModelSerializer):
         if not product.is_active:
             raise serializers.ValidationError("This product is not available.")
         
-        if quantity > product.stock:
-            raise serializers.ValidationError(f"Only {product.stock} items available in stock.")
+        available = product.available_stock
+        if quantity > available:
+            raise serializers.ValidationError(f"Only {available} items available in stock.")
         
         return attrs
 
@@ -40,8 +49,9 @@ class CartSerializer(serializers.ModelSerializer):
     """Serializer for shopping cart."""
     
     items = CartItemSerializer(many=True, read_only=True)
-    total_items = serializers.IntegerField(read_only=True)
-    total_price = serializers.DecimalField(max_digits=10, decimal_places=2, read_only=True)
+    # Summed by the database: the items are read as rows, not instances
+    total_items = serializers.IntegerField(source='totals.items', read_only=True)
+    total_price = serializers.DecimalField(source='totals.price', max_digits=10, decimal_places=2, read_only=True)
     
     class Meta:
         model = Cart
@@ -70,8 +80,9 @@ class AddToCartSerializer(serializers.Serializer):
         
         try:
             product = Product.objects.get(id=product_id)
-            if quantity > product.stock:
-                raise serializers.ValidationError(f"Only {product.stock} items available in stock.")
+            available = product.available_stock
+            if quantity > available:
+                raise serializers.ValidationError(f"Only {available} items available in stock.")
         except Product.DoesNotExist:
             raise serializers.ValidationError("Product not found.")
         
@@ -1,3 +1,44 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from apps.products.models import Category, Product
+from .models import Cart, CartItem
+
+
+class CartViewTests(TestCase):
+    """The cart is read in a fixed number of queries, however many items it holds."""
+    
+    def setUp(self):
+        user = get_user_model().objects.create_user('buyer@example.com', None)
+        category = Category.objects.create(name='Books')
+        self.products = [
+            Product.objects.create(name=f'Book {n}', description='', price=n, stock=10, category=category, created_by=user)
+            for n in (5, 10, 20)
+        ]
+        self.cart = Cart.objects.create(user=user)
+        self.client = APIClient()
+        self.client.force_authenticate(user)
+    
+    def get_cart(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/v1/cart/')
+        self.assertEqual(response.status_code, 200)
+        return response.json(), len(queries)
+    
+    def test_empty_cart(self):
+        data, _ = self.get_cart()
+        self.assertEqual((data['items'], data['total_items'], data['total_price']), ([], 0, '0.00'))
+    
+    def test_totals(self):
+        CartItem.objects.create(cart=self.cart, product=self.products[0], quantity=1)
+        _, one_item = self.get_cart()
+        
+        for product in self.products[1:]:
+            CartItem.objects.create(cart=self.cart, product=product, quantity=2)
+        data, three_items = self.get_cart()
+        
+        self.assertEqual(three_items, one_item)
+        self.assertEqual((len(data['items']), data['total_items'], data['total_price']), (3, 5, '65.00'))
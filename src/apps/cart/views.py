@@ -53,9 +53,10 @@ class AddToCartView(APIView):
             if not created:
                 # Update quantity if item already exists
                 new_quantity = cart_item.quantity + quantity
-                if new_quantity > product.stock:
+                available = product.available_stock
+                if new_quantity > available:
                     return Response(
-                        {'error': f'Cannot add more items. Only {product.stock} available in stock.'},
+                        {'error': f'Cannot add more items. Only {available} available in stock.'},
                         status=status.HTTP_400_BAD_REQUEST
                     )
                 cart_item.quantity = new_quantity
@@ -91,9 +92,10 @@ class UpdateCartItemView(APIView):
             )
             
             # Validate stock
-            if quantity > cart_item.product.stock:
+            available = cart_item.product.available_stock
+            if quantity > available:
                 return Response(
-                    {'error': f'Only {cart_item.product.stock} items available in stock.'},
+                    {'error': f'Only {available} items available in stock.'},
                     status=status.HTTP_400_BAD_REQUEST
                 )
             
@@ -0,0 +1,127 @@
+from django.contrib import admin
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404
+from django.urls import path
+from .models import BulkAction, IdempotencyKey, OutboxEvent, PeriodicJob, SnowflakeNode
+
+
+@admin.register(OutboxEvent)
+class OutboxEventAdmin(admin.ModelAdmin):
+    """Admin configuration for OutboxEvent model."""
+    
+    list_display = ('id', 'event_type', 'aggregate_type', 'aggregate_id', 'status', 'attempts', 'created_at', 'dispatched_at')
+    list_filter = ('status', 'event_type', 'created_at')
+    search_fields = ('aggregate_id', 'event_type')
+    readonly_fields = (
+        'event_type', 'aggregate_type', 'aggregate_id', 'payload', 'attempts',
+        'delivered_to', 'last_error', 'created_at', 'dispatched_at'
+    )
+    ordering = ('-id',)
+    
+    actions = ['retry_events']
+    
+    def retry_events(self, request, queryset):
+        """Put failed events back in the queue."""
+        from django.utils import timezone
+        count = queryset.filter(status='failed').update(status='pending', attempts=0, available_at=timezone.now())
+        self.message_user(request, f'{count} event(s) queued for retry.')
+    retry_events.short_description = 'Retry selected failed events'
+
+
+@admin.register(PeriodicJob)
+class PeriodicJobAdmin(admin.ModelAdmin):
+    """Admin configuration for PeriodicJob model."""
+    
+    list_display = (
+        'name', 'is_enabled', 'interval_seconds', 'next_run_at', 'last_status',
+        'last_duration_ms', 'average_duration_ms', 'run_count', 'failure_count'
+    )
+    list_filter = ('is_enabled', 'last_status')
+    list_editable = ('is_enabled',)
+    search_fields = ('name',)
+    readonly_fields = (
+        'name', 'last_started_at', 'last_finished_at', 'last_status', 'last_duration_ms',
+        'last_result', 'last_error', 'run_count', 'failure_count', 'total_duration_ms'
+    )
+    
+    actions = ['run_now']
+    
+    def run_now(self, request, queryset):
+        """Make the selected jobs due on the next runner pass."""
+        from django.utils import timezone
+        count = queryset.update(next_run_at=timezone.now())
+        self.message_user(request, f'{count} job(s) scheduled to run on the next pass.')
+    run_now.short_description = 'Run selected jobs on the next pass'
+
+
+@admin.register(IdempotencyKey)
+class IdempotencyKeyAdmin(admin.ModelAdmin):
+    """Admin configuration for IdempotencyKey model."""
+    
+    list_display = ('key', 'user', 'request_method', 'request_path', 'response_status', 'created_at', 'expires_at')
+    list_filter = ('request_method', 'response_status', 'created_at')
+    search_fields = ('key', 'user__email', 'request_path')
+    raw_id_fields = ('user',)
+    readonly_fields = (
+        'user', 'key', 'request_method', 'request_path', 'fingerprint',
+        'response_status', 'response_body', 'created_at', 'expires_at'
+    )
+
+
+@admin.register(BulkAction)
+class BulkActionAdmin(admin.ModelAdmin):
+    """Admin configuration for BulkAction model."""
+    
+    list_display = ('id', 'name', 'status', 'progress', 'affected', 'created_by', 'created_at', 'finished_at')
+    list_filter = ('status', 'name', 'created_at')
+    list_select_related = ('created_by',)
+    search_fields = ('name', 'created_by__email')
+    exclude = ('object_ids',)
+    readonly_fields = (
+        'name', 'status', 'progress', 'total', 'processed', 'affected', 'error',
+        'created_by', 'created_at', 'updated_at', 'started_at', 'finished_at'
+    )
+    ordering = ('-id',)
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def progress(self, obj):
+        return f'{obj.processed}/{obj.total} ({obj.percent}%)'
+    progress.short_description = 'Progress'
+    
+    def get_urls(self):
+        urls = [
+            path(
+                '<path:object_id>/progress/',
+                self.admin_site.admin_view(self.progress_view),
+                name='core_bulkaction_progress'
+            ),
+        ]
+        return urls + super().get_urls()
+    
+    def progress_view(self, request, object_id):
+        """Report the progress of a bulk action as JSON, for polling."""
+        if not self.has_view_permission(request):
+            return JsonResponse({'detail': 'Permission denied.'}, status=403)
+        task = get_object_or_404(BulkAction, pk=object_id)
+        return JsonResponse({
+            'status': task.status,
+            'processed': task.processed,
+            'total': task.total,
+            'percent': task.percent,
+            'affected': task.affected,
+            'error': task.error,
+        })
+
+
+@admin.register(SnowflakeNode)
+class SnowflakeNodeAdmin(admin.ModelAdmin):
+    """Admin configuration for SnowflakeNode model."""
+    
+    list_display = ('node_id', 'owner', 'leased_until')
+    search_fields = ('owner',)
+    readonly_fields = ('node_id', 'owner', 'leased_until')
+    
+    def has_add_permission(self, request):
+        return False
@@ -0,0 +1,18 @@
+from django.apps import AppConfig
+from django.utils.module_loading import autodiscover_modules
+
+
+class CoreConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.core'
+    verbose_name = 'Core'
+    
+    def ready(self):
+        from . import checks  # noqa: F401
+        
+        # Register domain event subscribers declared in <app>/subscribers.py,
+        # periodic jobs declared in <app>/jobs.py and admin bulk action
+        # handlers declared in <app>/bulk_actions.py
+        autodiscover_modules('subscribers')
+        autodiscover_modules('jobs')
+        autodiscover_modules('bulk_actions')
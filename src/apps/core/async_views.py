@@ -0,0 +1,98 @@
+"""
+Native async views for I/O-bound endpoints served under ASGI.
+
+DRF's ``APIView`` is synchronous, so under ASGI every request to it holds a
+thread from the sync pool while it waits on Stripe, SMTP or the database.
+``AsyncAPIView`` is a small async counterpart: it authenticates JWT bearer
+tokens, applies the view's ``throttle_scope``, parses JSON bodies and renders
+JSON responses, while the handlers themselves are coroutines using the async
+ORM and Stripe's async client. Blocking calls shared with the sync views
+(the throttle's cache, Stripe calls that write payments) run through
+``sync_to_async``.
+"""
+import json
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import JsonResponse
+from django.utils.decorators import classonlymethod
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import status
+from rest_framework.exceptions import APIException, AuthenticationFailed, ParseError
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+from .throttling import TokenBucketThrottle
+
+User = get_user_model()
+
+
+class AsyncAPIView(View):
+    """Base class for async JSON endpoints."""
+    
+    # Set to False for public endpoints
+    authentication_required = True
+    throttle_scope = None
+    
+    @classonlymethod
+    def as_view(cls, **initkwargs):
+        # Token authenticated API endpoints don't use CSRF, like DRF's APIView
+        return csrf_exempt(super().as_view(**initkwargs))
+    
+    async def dispatch(self, request, *args, **kwargs):
+        try:
+            request.user = await self.authenticate(request)
+            if self.authentication_required and not request.user.is_authenticated:
+                raise AuthenticationFailed('Authentication credentials were not provided.')
+            
+            # The throttle's cache calls are blocking
+            throttle = TokenBucketThrottle()
+            if not await sync_to_async(throttle.allow_request)(request, self):
+                response = self.respond({'detail': 'Request was throttled.'}, status.HTTP_429_TOO_MANY_REQUESTS)
+                response['Retry-After'] = str(int(throttle.wait() + 1))
+                return response
+            
+            return await super().dispatch(request, *args, **kwargs)
+        except APIException as exc:
+            data = exc.detail if isinstance(exc.detail, (dict, list)) else {'detail': exc.detail}
+            return self.respond(data, exc.status_code)
+    
+    async def authenticate(self, request):
+        """Return the user of the request's JWT bearer token, or an anonymous user."""
+        authentication = JWTAuthentication()
+        header = authentication.get_header(request)
+        raw_token = authentication.get_raw_token(header) if header else None
+        if raw_token is None:
+            return AnonymousUser()
+        
+        validated_token = authentication.get_validated_token(raw_token)
+        user = await User.objects.filter(
+            **{jwt_settings.USER_ID_FIELD: validated_token[jwt_settings.USER_ID_CLAIM]}
+        ).afirst()
+        if user is None or not user.is_active:
+            raise AuthenticationFailed('User not found or inactive.')
+        return user
+    
+    def parse_body(self, request):
+        """Return the request body parsed as JSON (or form data)."""
+        if request.method not in ('POST', 'PUT', 'PATCH') or not request.body:
+            return {}
+        if request.content_type != 'application/json':
+            return request.POST
+        try:
+            return json.loads(request.body)
+        except ValueError:
+            raise ParseError('Invalid JSON body.')
+    
+    async def validate(self, serializer_class, request):
+        """Validate the request body with a DRF serializer, off the event loop."""
+        serializer = serializer_class(data=self.parse_body(request), context={'request': request})
+        await sync_to_async(serializer.is_valid)()
+        return serializer
+    
+    def respond(self, data=None, status_code=status.HTTP_200_OK):
+        """Render ``data`` as a JSON response."""
+        return JsonResponse(data, status=status_code, encoder=DjangoJSONEncoder, safe=False)
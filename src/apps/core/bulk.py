@@ -0,0 +1,155 @@
+"""
+Set-based admin actions over large selections.
+
+Actions register a handler with ``@bulk_action`` in their app's
+``bulk_actions.py``. A handler receives a batch of primary keys and the
+acting user, changes the rows with ``queryset.update()`` and publishes
+outbox events for its side effects (emails, counters), so it never loads or
+saves rows one by one. It returns the number of rows it changed.
+
+``run_bulk_action`` runs selections of up to ``ADMIN_BULK_ACTION_INLINE_LIMIT``
+rows inline in one transaction. Larger selections are stored as a
+``BulkAction`` and processed in batches by a background worker; the admin
+shows their progress. The ``resume_bulk_actions`` job picks up actions whose
+worker never started or died.
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.html import format_html
+
+from .jobs import periodic_job
+from .models import BulkAction
+
+logger = logging.getLogger(__name__)
+
+
+_registry = {}
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def bulk_action(name):
+    """Register the decorated function as the handler of a bulk action."""
+    def decorator(func):
+        _registry[name] = func
+        return func
+    return decorator
+
+
+def _get_executor():
+    """Return the shared worker pool, creating it on first use."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.BULK_ACTION_WORKERS,
+                thread_name_prefix='bulk-actions'
+            )
+        return _executor
+
+
+def run_bulk_action(name, queryset, user=None):
+    """
+    Apply a registered action to the rows of ``queryset``.
+    
+    Returns ``(affected, None)`` when it ran inline, or ``(None, bulk_action)``
+    when the selection was queued for the background worker.
+    """
+    handler = _registry[name]
+    ids = list(queryset.order_by('pk').values_list('pk', flat=True))
+    
+    if len(ids) <= settings.ADMIN_BULK_ACTION_INLINE_LIMIT:
+        with transaction.atomic():
+            return handler(ids, user), None
+    
+    with transaction.atomic():
+        task = BulkAction.objects.create(name=name, object_ids=ids, total=len(ids), created_by=user)
+        transaction.on_commit(lambda: _get_executor().submit(_process_in_worker, task.pk))
+    return None, task
+
+
+def process_bulk_action(pk):
+    """Claim a pending bulk action and process its remaining batches."""
+    now = timezone.now()
+    claimed = BulkAction.objects.filter(pk=pk, status='pending').update(
+        status='running', started_at=now, updated_at=now
+    )
+    if not claimed:
+        return
+    
+    task = BulkAction.objects.select_related('created_by').get(pk=pk)
+    handler = _registry[task.name]
+    batch_size = settings.JOBS_BATCH_SIZE
+    
+    try:
+        for start in range(task.processed, task.total, batch_size):
+            ids = task.object_ids[start:start + batch_size]
+            with transaction.atomic():
+                affected = handler(ids, task.created_by)
+                BulkAction.objects.filter(pk=pk).update(
+                    processed=start + len(ids),
+                    affected=F('affected') + affected,
+                    updated_at=timezone.now(),
+                )
+    except Exception as e:
+        logger.exception('Bulk action %s failed', pk)
+        BulkAction.objects.filter(pk=pk).update(
+            status='failed', error=str(e), updated_at=timezone.now(), finished_at=timezone.now()
+        )
+        return
+    
+    BulkAction.objects.filter(pk=pk).update(
+        status='completed', updated_at=timezone.now(), finished_at=timezone.now()
+    )
+
+
+def _process_in_worker(pk):
+    try:
+        process_bulk_action(pk)
+    finally:
+        close_old_connections()
+
+
+def run_from_admin(modeladmin, request, queryset, name, message):
+    """
+    Run a bulk action from an admin action and report the outcome.
+    
+    ``message`` is formatted with the number of changed rows.
+    """
+    affected, task = run_bulk_action(name, queryset, request.user)
+    if task is None:
+        modeladmin.message_user(request, message.format(count=affected))
+        return
+    
+    url = reverse('admin:core_bulkaction_change', args=[task.pk])
+    modeladmin.message_user(request, format_html(
+        '{} rows are being processed in the background. <a href="{}">Follow the progress</a>.',
+        task.total, url
+    ))
+
+
+@periodic_job(interval=timedelta(minutes=1))
+def resume_bulk_actions():
+    """Process bulk actions whose worker never started or stopped reporting progress."""
+    now = timezone.now()
+    stale = BulkAction.objects.filter(
+        status='running',
+        updated_at__lt=now - timedelta(minutes=settings.BULK_ACTION_STALE_MINUTES),
+    ).update(status='pending', updated_at=now)
+    
+    pending = list(
+        BulkAction.objects.filter(status='pending', updated_at__lt=now - timedelta(minutes=1))
+        .values_list('pk', flat=True)
+    )
+    for pk in pending:
+        process_bulk_action(pk)
+    return {'resumed': stale, 'processed': len(pending)}
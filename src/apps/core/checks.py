@@ -0,0 +1,23 @@
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+
+PROCESS_LOCAL_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    """Throttling counters must be shared by every process serving the API."""
+    if settings.CACHES['default']['BACKEND'] not in PROCESS_LOCAL_CACHES:
+        return []
+    return [Error(
+        'The default cache is not shared between processes.',
+        hint=(
+            'Each worker would keep its own throttle buckets (multiplying the allowed rate) '
+            'and its own copy of cached responses. Set CACHE_BACKEND and CACHE_LOCATION to '
+            'a Redis or Memcached server.'
+        ),
+        id='core.E001',
+    )]
@@ -0,0 +1,174 @@
+"""
+Domain events with a transactional outbox.
+
+State changes call ``publish()`` inside their own transaction, which stores an
+``OutboxEvent`` row. The ``dispatch_events`` command later delivers pending
+events in batches to the in-process subscribers registered with
+``@subscriber`` (declared in each app's ``subscribers.py``) and, if
+``EVENT_BUS_BACKEND`` is set, to an external queue.
+
+Delivery is at least once: a dispatcher leases a batch of events in a short
+transaction and delivers them outside of it, so a handler may see an event
+again if the dispatcher dies before recording the outcome.
+"""
+import logging
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import OutboxEvent
+
+logger = logging.getLogger(__name__)
+
+
+ORDER_CREATED = 'order.created'
+ORDER_STATUS_CHANGED = 'order.status_changed'
+PAYMENT_COMPLETED = 'payment.completed'
+PAYMENT_FAILED = 'payment.failed'
+REFUND_COMPLETED = 'refund.completed'
+VENDOR_REQUEST_REVIEWED = 'vendor_request.reviewed'
+VENDOR_REVIEWS_CHANGED = 'vendor.reviews_changed'
+
+EXTERNAL_SUBSCRIBER = 'external'
+
+_subscribers = defaultdict(list)
+
+
+def subscriber(*event_types):
+    """Register the decorated function as a handler for the given event types."""
+    def decorator(func):
+        for event_type in event_types:
+            if func not in _subscribers[event_type]:
+                _subscribers[event_type].append(func)
+        return func
+    return decorator
+
+
+def _subscriber_name(func):
+    return f'{func.__module__}.{func.__qualname__}'
+
+
+def publish(event_type, instance, **payload):
+    """
+    Record a domain event about ``instance`` in the current transaction.
+    
+    The event is only delivered if the surrounding transaction commits.
+    """
+    return OutboxEvent.objects.create(
+        event_type=event_type,
+        aggregate_type=instance._meta.model_name,
+        aggregate_id=str(instance.pk),
+        payload=payload,
+    )
+
+
+def publish_many(event_type, model, payloads):
+    """
+    Record one event per object in a single insert.
+    
+    ``payloads`` maps primary keys of ``model`` to event payloads. Used by
+    set-based updates that never load the instances.
+    """
+    return OutboxEvent.objects.bulk_create([
+        OutboxEvent(
+            event_type=event_type,
+            aggregate_type=model._meta.model_name,
+            aggregate_id=str(pk),
+            payload=payload,
+        )
+        for pk, payload in payloads.items()
+    ])
+
+
+def _get_external_backend():
+    backend = getattr(settings, 'EVENT_BUS_BACKEND', '')
+    return import_string(backend) if backend else None
+
+
+def _deliver(event, external_backend):
+    """Run every handler that has not yet processed the event."""
+    handlers = [(_subscriber_name(func), func) for func in _subscribers.get(event.event_type, [])]
+    if external_backend is not None:
+        handlers.append((EXTERNAL_SUBSCRIBER, external_backend))
+    
+    errors = []
+    for name, handler in handlers:
+        if name in event.delivered_to:
+            continue
+        try:
+            if name == EXTERNAL_SUBSCRIBER:
+                # A network call: no transaction is held open while it runs
+                handler(event)
+            else:
+                # Each subscriber commits on its own so one failure doesn't undo the others
+                with transaction.atomic():
+                    handler(event)
+            event.delivered_to.append(name)
+        except Exception as e:
+            logger.exception('Subscriber %s failed for event %s', name, event.pk)
+            errors.append(f'{name}: {e}')
+    return errors
+
+
+def _claim(batch_size, now):
+    """
+    Lease a batch of due events to this dispatcher.
+    
+    Rows are locked with ``SELECT ... FOR UPDATE SKIP LOCKED`` only while
+    they are marked ``processing``; the lease (``available_at``) lets another
+    dispatcher take them over if this one dies before recording the outcome.
+    """
+    with transaction.atomic():
+        events = list(
+            OutboxEvent.objects.select_for_update(skip_locked=True)
+            .filter(status__in=('pending', 'processing'), available_at__lte=now)
+            .order_by('id')[:batch_size]
+        )
+        OutboxEvent.objects.filter(pk__in=[event.pk for event in events]).update(
+            status='processing',
+            available_at=now + timedelta(seconds=settings.EVENT_BUS_LEASE_SECONDS),
+        )
+    return events
+
+
+def dispatch_pending(batch_size=100):
+    """
+    Deliver one batch of pending events.
+    
+    The batch is leased first (see ``_claim``) so several dispatchers can run
+    side by side, then each event is delivered outside any transaction and
+    its outcome saved. Failed events are retried with exponential backoff and
+    marked ``failed`` after ``EVENT_BUS_MAX_ATTEMPTS``. Returns the number of
+    events processed.
+    """
+    external_backend = _get_external_backend()
+    events = _claim(batch_size, timezone.now())
+    
+    for event in events:
+        errors = _deliver(event, external_backend)
+        event.attempts += 1
+        
+        if not errors:
+            event.status = 'dispatched'
+            event.dispatched_at = timezone.now()
+            event.last_error = ''
+        else:
+            event.last_error = '\n'.join(errors)
+            if event.attempts >= settings.EVENT_BUS_MAX_ATTEMPTS:
+                event.status = 'failed'
+            else:
+                event.status = 'pending'
+                event.available_at = timezone.now() + timedelta(seconds=2 ** event.attempts)
+        
+        event.save(update_fields=['status', 'attempts', 'delivered_to', 'last_error', 'available_at', 'dispatched_at'])
+    
+    return len(events)
+
+
+def log_backend(event):
+    """Example external backend that only logs events."""
+    logger.info('Event %s %s:%s %s', event.event_type, event.aggregate_type, event.aggregate_id, event.payload)
@@ -0,0 +1,19 @@
+from django.urls import re_path
+from .exports import FORMATS, ExportView
+from apps.orders.exports import OrderExport
+from apps.payments.exports import PaymentExport, RefundExport
+
+app_name = 'exports'
+
+formats = '|'.join(FORMATS)
+
+urlpatterns = []
+for export_class in (OrderExport, PaymentExport, RefundExport):
+    view = ExportView.as_view(export_class=export_class)
+    urlpatterns += [
+        re_path(rf'^{export_class.name}\.(?P<file_format>{formats})$', view, name=export_class.name),
+        re_path(
+            rf'^{export_class.name}\.(?P<file_format>{formats})\.gz$', view, {'compress': True},
+            name=f'{export_class.name}_gzip'
+        ),
+    ]
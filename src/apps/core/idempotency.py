@@ -0,0 +1,163 @@
+"""
+``Idempotency-Key`` support for POST endpoints.
+
+Decorate a view method with ``@idempotent``. When the client sends an
+``Idempotency-Key`` header, the first request runs normally and, if it
+succeeds, its response is stored per user and key; retries with the same
+key replay the stored response. A concurrent duplicate blocks on the key's row until the first
+request commits, then replays its response. Stored responses are also kept
+in the cache so most replays cost a single cache lookup.
+
+Coroutine methods of ``AsyncAPIView`` are supported too: the key's
+transaction runs in the sync thread, and the handler's async ORM queries
+run in that same thread, inside it.
+"""
+import hashlib
+import json
+from datetime import timedelta
+from functools import partial, wraps
+from inspect import iscoroutinefunction
+
+from asgiref.sync import async_to_sync, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, transaction
+from django.http import JsonResponse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+
+from .models import IdempotencyKey
+
+HEADER = 'Idempotency-Key'
+REPLAYED_HEADER = 'Idempotent-Replayed'
+
+
+def _fingerprint(request, data):
+    """Hash the method, path and body of a request."""
+    body = json.dumps(data, sort_keys=True, cls=DjangoJSONEncoder)
+    return hashlib.sha256(f'{request.method}:{request.path}:{body}'.encode()).hexdigest()
+
+
+def _cache_key(user_id, key):
+    return f'idempotency:{user_id}:{hashlib.sha256(key.encode()).hexdigest()}'
+
+
+def _replay(respond, fingerprint, stored_fingerprint, response_status, response_body):
+    if fingerprint != stored_fingerprint:
+        return respond(
+            {'error': f'{HEADER} was already used with a different request.'},
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY
+        )
+    return respond(response_body, status=response_status, headers={REPLAYED_HEADER: 'true'})
+
+
+def _response_data(response):
+    if hasattr(response, 'data'):
+        return json.loads(json.dumps(response.data, cls=DjangoJSONEncoder))
+    return json.loads(response.content)
+
+
+def _claim(request, key, fingerprint, expires_at, respond):
+    """
+    Lock the key's row for this request.
+    
+    Returns ``(record, None)`` when the request should run, or ``(None, response)``
+    when a stored response must be replayed.
+    """
+    lookup = {'user': request.user, 'key': key}
+    defaults = {
+        'request_method': request.method,
+        'request_path': request.path[:255],
+        'fingerprint': fingerprint,
+        'expires_at': expires_at,
+    }
+    
+    while True:
+        try:
+            with transaction.atomic():
+                return IdempotencyKey.objects.create(**lookup, **defaults), None
+        except IntegrityError:
+            pass
+        
+        # Waits here while another request holding the key is still running
+        record = IdempotencyKey.objects.select_for_update().filter(**lookup).first()
+        if record is None:
+            # The other request failed and rolled back; try again
+            continue
+        
+        if record.is_expired():
+            for field, value in defaults.items():
+                setattr(record, field, value)
+            record.response_status = None
+            record.response_body = None
+            return record, None
+        
+        return None, _replay(respond, fingerprint, record.fingerprint, record.response_status, record.response_body)
+
+
+def _run(request, data, call, respond):
+    """Run ``call()`` for a request with an ``Idempotency-Key``, or replay its stored response."""
+    key = request.headers[HEADER]
+    if len(key) > 255:
+        return respond(
+            {'error': f'{HEADER} must be at most 255 characters.'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    fingerprint = _fingerprint(request, data)
+    cache_key = _cache_key(request.user.pk, key)
+    
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return _replay(respond, fingerprint, *cached)
+    
+    ttl = timedelta(hours=settings.IDEMPOTENCY_KEY_TTL_HOURS)
+    
+    with transaction.atomic():
+        record, replay = _claim(request, key, fingerprint, timezone.now() + ttl, respond)
+        if replay is not None:
+            return replay
+        
+        response = call()
+        
+        if not status.is_success(response.status_code):
+            # Errors often depend on state that changes (stock, the cart), so a retry runs again
+            record.delete()
+            return response
+        
+        record.response_status = response.status_code
+        record.response_body = _response_data(response)
+        record.save()
+        
+        stored = (fingerprint, record.response_status, record.response_body)
+        transaction.on_commit(lambda: cache.set(cache_key, stored, int(ttl.total_seconds())))
+    
+    return response
+
+
+def idempotent(view_method):
+    """
+    Make a view method replay its stored response for repeated ``Idempotency-Key`` requests.
+    
+    Only successful (2xx) responses are stored: after an error or an exception
+    the request can be retried with the same key.
+    """
+    if iscoroutinefunction(view_method):
+        respond = partial(JsonResponse, encoder=DjangoJSONEncoder, safe=False)
+        
+        @wraps(view_method)
+        async def async_wrapper(view, request, *args, **kwargs):
+            if not request.headers.get(HEADER) or not request.user.is_authenticated:
+                return await view_method(view, request, *args, **kwargs)
+            call = partial(async_to_sync(view_method), view, request, *args, **kwargs)
+            return await sync_to_async(_run)(request, view.parse_body(request), call, respond)
+        return async_wrapper
+    
+    @wraps(view_method)
+    def wrapper(view, request, *args, **kwargs):
+        if not request.headers.get(HEADER) or not request.user.is_authenticated:
+            return view_method(view, request, *args, **kwargs)
+        return _run(request, request.data, partial(view_method, view, request, *args, **kwargs), Response)
+    return wrapper
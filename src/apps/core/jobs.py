@@ -0,0 +1,185 @@
+"""
+Lightweight scheduler for periodic maintenance jobs.
+
+Jobs are plain functions registered with ``@periodic_job`` in each app's
+``jobs.py``. The ``run_jobs`` command claims due jobs from the
+``periodic_jobs`` table with ``SELECT ... FOR UPDATE SKIP LOCKED`` (so
+several runners never execute the same job twice) and runs them in a
+thread pool, recording per-job metrics.
+"""
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import IdempotencyKey, OutboxEvent, PeriodicJob
+
+logger = logging.getLogger(__name__)
+
+
+_registry = {}
+
+
+def periodic_job(interval, name=None):
+    """
+    Register the decorated function as a periodic job.
+    
+    ``interval`` is a ``timedelta`` or a number of seconds. The function's
+    return value is stored as the job's last result.
+    """
+    if isinstance(interval, timedelta):
+        interval = int(interval.total_seconds())
+    
+    def decorator(func):
+        job_name = name or f'{func.__module__.rsplit(".", 2)[-2]}.{func.__name__}'
+        _registry[job_name] = (func, interval)
+        return func
+    return decorator
+
+
+def registered_jobs():
+    """Return the registered jobs as ``{name: (func, interval_seconds)}``."""
+    return dict(_registry)
+
+
+def sync_jobs():
+    """Create schedule rows for new jobs and update changed intervals."""
+    existing = dict(PeriodicJob.objects.values_list('name', 'interval_seconds'))
+    for name, (func, interval) in _registry.items():
+        if name not in existing:
+            PeriodicJob.objects.get_or_create(name=name, defaults={'interval_seconds': interval})
+        elif existing[name] != interval:
+            PeriodicJob.objects.filter(name=name).update(interval_seconds=interval)
+
+
+def claim_due_jobs(names=None, force=False):
+    """
+    Claim the jobs that are due and schedule their next run.
+    
+    Jobs locked by another runner are skipped. Returns the claimed job names.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        jobs = PeriodicJob.objects.select_for_update(skip_locked=True).filter(
+            is_enabled=True,
+            name__in=names or list(_registry),
+        )
+        if not force:
+            jobs = jobs.filter(next_run_at__lte=now)
+        
+        claimed = []
+        for job in jobs:
+            job.next_run_at = now + timedelta(seconds=job.interval_seconds)
+            job.last_started_at = now
+            job.save(update_fields=['next_run_at', 'last_started_at'])
+            claimed.append(job.name)
+    return claimed
+
+
+def run_job(name):
+    """Run one registered job and record its metrics."""
+    func, _ = _registry[name]
+    started = time.monotonic()
+    try:
+        result = func()
+        status, error = 'success', ''
+    except Exception as e:
+        logger.exception('Periodic job %s failed', name)
+        result, status, error = None, 'failed', str(e)
+    duration_ms = int((time.monotonic() - started) * 1000)
+    
+    PeriodicJob.objects.filter(name=name).update(
+        last_finished_at=timezone.now(),
+        last_status=status,
+        last_duration_ms=duration_ms,
+        last_result=result,
+        last_error=error,
+        run_count=F('run_count') + 1,
+        failure_count=F('failure_count') + (1 if status == 'failed' else 0),
+        total_duration_ms=F('total_duration_ms') + duration_ms,
+    )
+    return status, duration_ms, result
+
+
+def _run_in_worker(name):
+    try:
+        return run_job(name)
+    finally:
+        close_old_connections()
+
+
+def run_due_jobs(max_workers=4, names=None, force=False):
+    """Run every due job in a thread pool. Returns ``{name: (status, duration_ms, result)}``."""
+    sync_jobs()
+    claimed = claim_due_jobs(names=names, force=force)
+    if not claimed:
+        return {}
+    
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='periodic-job') as pool:
+        return dict(zip(claimed, pool.map(_run_in_worker, claimed)))
+
+
+def delete_in_batches(queryset, batch_size=None, max_batches=None):
+    """
+    Delete the rows of ``queryset`` in bounded batches of primary keys.
+    
+    Each batch is its own short transaction, and at most ``max_batches``
+    batches run per call so a single job run stays bounded. Returns the
+    number of rows deleted (not counting cascades).
+    """
+    batch_size = batch_size or settings.JOBS_BATCH_SIZE
+    max_batches = max_batches or settings.JOBS_MAX_BATCHES
+    model = queryset.model
+    deleted = 0
+    
+    for _ in range(max_batches):
+        ids = list(queryset.values_list('pk', flat=True)[:batch_size])
+        if not ids:
+            break
+        with transaction.atomic():
+            count, per_model = model.objects.filter(pk__in=ids).delete()
+        deleted += per_model.get(model._meta.label, 0)
+        if len(ids) < batch_size:
+            break
+    
+    return deleted
+
+
+def update_in_batches(queryset, batch_size=None, max_batches=None, **updates):
+    """Apply ``queryset.update(**updates)`` in bounded batches. Returns the rows updated."""
+    batch_size = batch_size or settings.JOBS_BATCH_SIZE
+    max_batches = max_batches or settings.JOBS_MAX_BATCHES
+    model = queryset.model
+    updated = 0
+    
+    for _ in range(max_batches):
+        ids = list(queryset.values_list('pk', flat=True)[:batch_size])
+        if not ids:
+            break
+        updated += model.objects.filter(pk__in=ids).update(**updates)
+        if len(ids) < batch_size:
+            break
+    
+    return updated
+
+
+@periodic_job(interval=timedelta(hours=1))
+def purge_dispatched_events():
+    """Delete outbox events that were delivered more than ``EVENT_RETENTION_DAYS`` ago."""
+    cutoff = timezone.now() - timedelta(days=settings.EVENT_RETENTION_DAYS)
+    return {'deleted': delete_in_batches(
+        OutboxEvent.objects.filter(status='dispatched', dispatched_at__lt=cutoff)
+    )}
+
+
+@periodic_job(interval=timedelta(hours=1))
+def purge_expired_idempotency_keys():
+    """Delete stored Idempotency-Key responses past their TTL."""
+    return {'deleted': delete_in_batches(
+        IdempotencyKey.objects.filter(expires_at__lt=timezone.now())
+    )}
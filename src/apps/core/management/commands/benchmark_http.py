@@ -0,0 +1,103 @@
+"""
+Compare the concurrency one server worker sustains, e.g. WSGI vs ASGI.
+
+Start the same code once under each server with a single worker::
+
+    gunicorn config.wsgi -w 1 --threads 8 -b :8001
+    uvicorn config.asgi:application --workers 1 --port 8002
+
+then point the benchmark at the sync endpoint on the WSGI server and at its
+``/api/v1/async/`` variant on the ASGI server::
+
+    python manage.py benchmark_http http://localhost:8001/api/v1/products/some-slug/ \\
+        http://localhost:8002/api/v1/async/products/some-slug/ --concurrency 1 10 50 100
+"""
+import http.client
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = 'Measure throughput and latency of HTTP endpoints at increasing concurrency'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('urls', nargs='+', help='URLs to benchmark (GET)')
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            nargs='+',
+            default=[1, 10, 50],
+            help='Numbers of concurrent clients to test',
+        )
+        parser.add_argument(
+            '--duration',
+            type=float,
+            default=10.0,
+            help='Seconds each measurement runs',
+        )
+        parser.add_argument(
+            '--header',
+            action='append',
+            default=[],
+            help='Extra request header as "Name: value" (can be repeated)',
+        )
+    
+    def handle(self, *args, **options):
+        headers = dict(h.split(':', 1) for h in options['header'])
+        headers = {name.strip(): value.strip() for name, value in headers.items()}
+        
+        for url in options['urls']:
+            self.stdout.write(self.style.MIGRATE_HEADING(url))
+            self.stdout.write(f'{"clients":>8} {"req/s":>10} {"p50 ms":>9} {"p99 ms":>9} {"errors":>7}')
+            for concurrency in options['concurrency']:
+                latencies, errors, elapsed = self.run(url, headers, concurrency, options['duration'])
+                if latencies:
+                    latencies.sort()
+                    p50 = statistics.median(latencies) * 1000
+                    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+                else:
+                    p50 = p99 = 0
+                self.stdout.write(
+                    f'{concurrency:>8} {len(latencies) / elapsed:>10.1f} {p50:>9.1f} {p99:>9.1f} {errors:>7}'
+                )
+    
+    def run(self, url, headers, concurrency, duration):
+        """Hammer ``url`` with ``concurrency`` keep-alive clients for ``duration`` seconds."""
+        parts = urlsplit(url)
+        path = parts.path + (f'?{parts.query}' if parts.query else '')
+        connection_class = http.client.HTTPSConnection if parts.scheme == 'https' else http.client.HTTPConnection
+        deadline = time.perf_counter() + duration
+        lock = threading.Lock()
+        latencies, errors = [], [0]
+        
+        def client():
+            connection = connection_class(parts.netloc, timeout=30)
+            local = []
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                try:
+                    connection.request('GET', path, headers=headers)
+                    response = connection.getresponse()
+                    response.read()
+                    if response.status >= 400:
+                        raise http.client.HTTPException(response.status)
+                    local.append(time.perf_counter() - started)
+                except (OSError, http.client.HTTPException):
+                    with lock:
+                        errors[0] += 1
+                    connection.close()
+                    connection = connection_class(parts.netloc, timeout=30)
+            connection.close()
+            with lock:
+                latencies.extend(local)
+        
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            for _ in range(concurrency):
+                pool.submit(client)
+        return latencies, errors[0], time.perf_counter() - started
@@ -0,0 +1,88 @@
+import time
+import uuid
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.orders.models import Order, generate_order_number
+
+
+def legacy_order_number():
+    """The previous random order number (32 random bits)."""
+    return f'ORD-{uuid.uuid4().hex[:8].upper()}'
+
+
+GENERATORS = {
+    'random': legacy_order_number,
+    'snowflake': generate_order_number,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare order number generators: generation rate and insert throughput into the orders '
+        'unique index. Inserted rows are rolled back; run against PostgreSQL with a large orders '
+        'table to see the effect of random keys on the index.'
+    )
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--orders', type=int, default=20000, help='Number of orders inserted per generator')
+        parser.add_argument('--batch-size', type=int, default=500, help='Orders per INSERT')
+        parser.add_argument(
+            '--generator',
+            action='append',
+            choices=sorted(GENERATORS),
+            help='Generator to measure (can be repeated)',
+        )
+    
+    def handle(self, *args, **options):
+        names = options['generator'] or list(GENERATORS)
+        count = options['orders']
+        batch_size = options['batch_size']
+        
+        self.stdout.write(self.style.MIGRATE_HEADING(f'{count} order numbers'))
+        for name in names:
+            generate = GENERATORS[name]
+            
+            started = time.perf_counter()
+            numbers = [generate() for _ in range(count)]
+            generate_s = time.perf_counter() - started
+            
+            duplicates = count - len(set(numbers))
+            insert_s = self.insert(numbers, batch_size)
+            
+            self.stdout.write(
+                f'{name:<10} generate {count / generate_s:12,.0f}/s  '
+                f'insert {count / insert_s:10,.0f} rows/s  duplicates {duplicates}'
+            )
+    
+    def insert(self, numbers, batch_size):
+        """Insert orders with the given numbers and return the elapsed seconds (rolled back)."""
+        with transaction.atomic():
+            user = get_user_model().objects.create_user(
+                email=f'benchmark-{uuid.uuid4().hex}@example.com', password=None, first_name='Benchmark'
+            )
+            orders = [
+                Order(
+                    order_number=number,
+                    user=user,
+                    shipping_address='1 Main Street',
+                    shipping_city='Springfield',
+                    shipping_state='IL',
+                    shipping_zip_code='62701',
+                    shipping_country='US',
+                    phone_number='+15555550100',
+                    subtotal=Decimal('10.00'),
+                    total=Decimal('10.00'),
+                )
+                for number in dict.fromkeys(numbers)
+            ]
+            
+            started = time.perf_counter()
+            Order.objects.bulk_create(orders, batch_size=batch_size)
+            elapsed = time.perf_counter() - started
+            
+            transaction.set_rollback(True)
+        return elapsed
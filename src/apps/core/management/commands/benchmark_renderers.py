@@ -0,0 +1,138 @@
+import time
+import uuid
+from io import BytesIO
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from rest_framework.parsers import JSONParser
+
+from apps.core.renderers import ORJSONParser, ORJSONRenderer
+from apps.products.models import Category, Product
+from apps.products.serializers import ProductListSerializer
+
+
+def order_payload(count):
+    """An order list shaped like ``OrderSerializer`` output, with raw Decimals and datetimes."""
+    now = timezone.now()
+    return [
+        {
+            'id': i,
+            'order_number': f'ORD-{uuid.uuid4().hex[:12].upper()}',
+            'user': i % 97,
+            'user_email': f'customer{i % 97}@example.com',
+            'status': 'processing',
+            'shipping_address': f'{i} Main Street',
+            'shipping_city': 'Springfield',
+            'shipping_state': 'IL',
+            'shipping_zip_code': '62701',
+            'shipping_country': 'US',
+            'phone_number': '+15555550100',
+            'subtotal': Decimal('89.97'),
+            'shipping_cost': Decimal('10.00'),
+            'tax': Decimal('9.00'),
+            'total': Decimal('108.97'),
+            'notes': '',
+            'items': [
+                {
+                    'id': i * 3 + n,
+                    'product': n + 1,
+                    'product_name': f'Product {n + 1}',
+                    'product_price': Decimal('29.99'),
+                    'quantity': 1,
+                    'subtotal': Decimal('29.99'),
+                }
+                for n in range(3)
+            ],
+            'created_at': now - timedelta(minutes=i),
+            'updated_at': now,
+        }
+        for i in range(count)
+    ]
+
+
+def product_payload(count):
+    """A product list rendered by ``ProductListSerializer`` from unsaved products."""
+    category = Category(id=1, name='Electronics', slug='electronics')
+    products = []
+    for i in range(count):
+        name = f'products/product-{i}.jpg'
+        products.append(Product(
+            id=i,
+            name=f'Product {i}',
+            slug=f'product-{i}',
+            price=Decimal('19.99') + i,
+            stock=i % 50,
+            category=category,
+            image=name,
+            image_variants={
+                'source': name,
+                'card': {
+                    'width': 400,
+                    'height': 400,
+                    'webp': f'/media/products/variants/product-{i}-card.webp',
+                    'jpeg': f'/media/products/variants/product-{i}-card.jpeg',
+                },
+            },
+            is_active=True,
+            is_featured=i % 10 == 0,
+        ))
+    return ProductListSerializer(products, many=True).data
+
+
+def renderer_parser(renderer):
+    """Return the parser matching a renderer, if there is one."""
+    if isinstance(renderer, ORJSONRenderer):
+        return ORJSONParser()
+    if renderer.media_type == 'application/json':
+        return JSONParser()
+    return None
+
+
+class Command(BaseCommand):
+    help = 'Compare JSON renderers and parsers on large order and product lists'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--items', type=int, default=1000, help='Number of orders/products per payload')
+        parser.add_argument('--repeat', type=int, default=50, help='Number of renders per measurement')
+        parser.add_argument(
+            '--renderer',
+            action='append',
+            help='Dotted path of a renderer class to compare (can be repeated)',
+        )
+    
+    def handle(self, *args, **options):
+        renderer_paths = options['renderer'] or [
+            'rest_framework.renderers.JSONRenderer',
+            'apps.core.renderers.ORJSONRenderer',
+        ]
+        payloads = {
+            'orders': order_payload(options['items']),
+            'products': product_payload(options['items']),
+        }
+        repeat = options['repeat']
+        
+        for name, data in payloads.items():
+            self.stdout.write(self.style.MIGRATE_HEADING(f'{options["items"]} {name}'))
+            for path in renderer_paths:
+                renderer = import_string(path)()
+                parser = renderer_parser(renderer)
+                
+                started = time.perf_counter()
+                for _ in range(repeat):
+                    body = renderer.render(data, 'application/json')
+                render_ms = (time.perf_counter() - started) * 1000 / repeat
+                
+                parse_ms = None
+                if parser is not None:
+                    started = time.perf_counter()
+                    for _ in range(repeat):
+                        parser.parse(BytesIO(body))
+                    parse_ms = (time.perf_counter() - started) * 1000 / repeat
+                
+                parse = f'{parse_ms:8.2f} ms' if parse_ms is not None else '       n/a'
+                self.stdout.write(
+                    f'{path:<42} {len(body) / 1024:6.0f} KiB  render {render_ms:8.2f} ms  parse {parse}'
+                )
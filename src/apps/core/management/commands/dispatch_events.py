@@ -0,0 +1,43 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.core.events import dispatch_pending
+
+
+class Command(BaseCommand):
+    help = 'Deliver pending outbox events to subscribers'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=100,
+            help='Number of events leased per batch',
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep polling for new events instead of exiting when the outbox is empty',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=1.0,
+            help='Seconds to sleep between polls when the outbox is empty (with --loop)',
+        )
+    
+    def handle(self, *args, **options):
+        total = 0
+        
+        while True:
+            processed = dispatch_pending(batch_size=options['batch_size'])
+            total += processed
+            
+            if processed:
+                continue
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+        
+        self.stdout.write(self.style.SUCCESS(f'Dispatched {total} events'))
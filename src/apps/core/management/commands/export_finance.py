@@ -0,0 +1,52 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from apps.core.exports import FORMATS, export_chunks
+from apps.orders.exports import OrderExport
+from apps.payments.exports import PaymentExport, RefundExport
+
+EXPORTS = {export_class.name: export_class for export_class in (OrderExport, PaymentExport, RefundExport)}
+
+
+class Command(BaseCommand):
+    help = 'Stream an export of orders (with items), payments or refunds to a file or stdout'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('export', choices=sorted(EXPORTS))
+        parser.add_argument('--format', dest='file_format', choices=sorted(FORMATS), default='csv')
+        parser.add_argument('--from', dest='date_from', help='First creation date (YYYY-MM-DD)')
+        parser.add_argument('--to', dest='date_to', help='Last creation date (YYYY-MM-DD)')
+        parser.add_argument('--status', action='append', help='Only rows with this status (can be repeated)')
+        parser.add_argument('--gzip', action='store_true', help='Compress the output')
+        parser.add_argument('--chunk-size', type=int, help='Rows fetched per round trip (default: EXPORT_CHUNK_SIZE)')
+        parser.add_argument('--output', '-o', default='-', help='Output file (default: stdout)')
+    
+    def handle(self, *args, **options):
+        export_class = EXPORTS[options['export']]
+        
+        dates = {}
+        for name in ('date_from', 'date_to'):
+            if options[name]:
+                dates[name] = parse_date(options[name])
+                if dates[name] is None:
+                    raise CommandError(f'Invalid date: {options[name]}')
+        
+        statuses = options['status']
+        unknown = set(statuses or ()).difference(export_class.status_choices())
+        if unknown:
+            raise CommandError(f'Unknown status: {", ".join(sorted(unknown))}')
+        
+        export = export_class(statuses=statuses, chunk_size=options['chunk_size'], **dates)
+        chunks = export_chunks(export, options['file_format'], compress=options['gzip'])
+        
+        if options['output'] == '-':
+            for chunk in chunks:
+                sys.stdout.buffer.write(chunk)
+            sys.stdout.buffer.flush()
+            return
+        
+        with open(options['output'], 'wb') as out:
+            for chunk in chunks:
+                out.write(chunk)
@@ -0,0 +1,69 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.jobs import registered_jobs, run_due_jobs
+
+
+class Command(BaseCommand):
+    help = 'Run the periodic maintenance jobs that are due'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--job',
+            action='append',
+            help='Only run this job (can be repeated)',
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Run the selected jobs even if they are not due yet',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=4,
+            help='Number of jobs run in parallel',
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep checking for due jobs instead of exiting',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=30.0,
+            help='Seconds to sleep between checks (with --loop)',
+        )
+        parser.add_argument(
+            '--list',
+            action='store_true',
+            help='List the registered jobs and exit',
+        )
+    
+    def handle(self, *args, **options):
+        jobs = registered_jobs()
+        
+        if options['list']:
+            for name, (func, interval) in sorted(jobs.items()):
+                self.stdout.write(f'{name} (every {interval}s)')
+            return
+        
+        unknown = set(options['job'] or []) - set(jobs)
+        if unknown:
+            raise CommandError(f'Unknown job(s): {", ".join(sorted(unknown))}')
+        
+        while True:
+            results = run_due_jobs(
+                max_workers=options['workers'],
+                names=options['job'],
+                force=options['force'],
+            )
+            for name, (status, duration_ms, result) in results.items():
+                style = self.style.SUCCESS if status == 'success' else self.style.ERROR
+                self.stdout.write(style(f'{name}: {status} in {duration_ms}ms {result or ""}'))
+            
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
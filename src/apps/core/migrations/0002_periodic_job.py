@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-19 08:29
+
+import django.core.serializers.json
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PeriodicJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('interval_seconds', models.IntegerField()),
+                ('is_enabled', models.BooleanField(default=True)),
+                ('next_run_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('last_started_at', models.DateTimeField(blank=True, null=True)),
+                ('last_finished_at', models.DateTimeField(blank=True, null=True)),
+                ('last_status', models.CharField(blank=True, choices=[('success', 'Success'), ('failed', 'Failed')], max_length=20)),
+                ('last_duration_ms', models.IntegerField(default=0)),
+                ('last_result', models.JSONField(blank=True, encoder=django.core.serializers.json.DjangoJSONEncoder, null=True)),
+                ('last_error', models.TextField(blank=True)),
+                ('run_count', models.IntegerField(default=0)),
+                ('failure_count', models.IntegerField(default=0)),
+                ('total_duration_ms', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Periodic Job',
+                'verbose_name_plural': 'Periodic Jobs',
+                'db_table': 'periodic_jobs',
+                'ordering': ['name'],
+            },
+        ),
+    ]
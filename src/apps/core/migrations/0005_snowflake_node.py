@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-19 08:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_bulk_action'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SnowflakeNode',
+            fields=[
+                ('node_id', models.PositiveSmallIntegerField(primary_key=True, serialize=False)),
+                ('owner', models.CharField(max_length=255)),
+                ('leased_until', models.BigIntegerField()),
+            ],
+            options={
+                'verbose_name': 'Snowflake Node',
+                'verbose_name_plural': 'Snowflake Nodes',
+                'db_table': 'snowflake_nodes',
+            },
+        ),
+    ]
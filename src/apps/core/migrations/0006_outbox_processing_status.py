@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_snowflake_node'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='outboxevent',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('dispatched', 'Dispatched'), ('failed', 'Failed')], default='pending', max_length=20),
+        ),
+    ]
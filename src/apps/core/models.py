@@ -0,0 +1,199 @@
+from django.conf import settings
+from django.db import models
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+
+
+class OutboxEvent(models.Model):
+    """
+    Domain event written in the same transaction as the state change it describes.
+    
+    Events are delivered to subscribers by the ``dispatch_events`` command.
+    """
+    
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('processing', 'Processing'),
+        ('dispatched', 'Dispatched'),
+        ('failed', 'Failed'),
+    ]
+    
+    event_type = models.CharField(max_length=100)
+    aggregate_type = models.CharField(max_length=50)
+    aggregate_id = models.CharField(max_length=64)
+    payload = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    attempts = models.IntegerField(default=0)
+    delivered_to = models.JSONField(default=list, blank=True, help_text='Subscribers that already handled this event')
+    last_error = models.TextField(blank=True)
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    available_at = models.DateTimeField(default=timezone.now)
+    dispatched_at = models.DateTimeField(blank=True, null=True)
+    
+    class Meta:
+        db_table = 'outbox_events'
+        verbose_name = 'Outbox Event'
+        verbose_name_plural = 'Outbox Events'
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['status', 'available_at']),
+            models.Index(fields=['aggregate_type', 'aggregate_id']),
+        ]
+    
+    def __str__(self):
+        return f"{self.event_type} ({self.aggregate_type} #{self.aggregate_id}) - {self.status}"
+
+
+class PeriodicJob(models.Model):
+    """
+    Schedule and run metrics of a periodic maintenance job.
+    
+    Rows are created for every job registered with ``@periodic_job`` and
+    claimed by the ``run_jobs`` command with ``SELECT ... FOR UPDATE SKIP LOCKED``.
+    """
+    
+    STATUS_CHOICES = [
+        ('success', 'Success'),
+        ('failed', 'Failed'),
+    ]
+    
+    name = models.CharField(max_length=100, unique=True)
+    interval_seconds = models.IntegerField()
+    is_enabled = models.BooleanField(default=True)
+    next_run_at = models.DateTimeField(default=timezone.now)
+    
+    # Metrics
+    last_started_at = models.DateTimeField(blank=True, null=True)
+    last_finished_at = models.DateTimeField(blank=True, null=True)
+    last_status = models.CharField(max_length=20, choices=STATUS_CHOICES, blank=True)
+    last_duration_ms = models.IntegerField(default=0)
+    last_result = models.JSONField(blank=True, null=True, encoder=DjangoJSONEncoder)
+    last_error = models.TextField(blank=True)
+    run_count = models.IntegerField(default=0)
+    failure_count = models.IntegerField(default=0)
+    total_duration_ms = models.BigIntegerField(default=0)
+    
+    class Meta:
+        db_table = 'periodic_jobs'
+        verbose_name = 'Periodic Job'
+        verbose_name_plural = 'Periodic Jobs'
+        ordering = ['name']
+    
+    def __str__(self):
+        return self.name
+    
+    @property
+    def average_duration_ms(self):
+        """Average run time in milliseconds."""
+        if not self.run_count:
+            return 0
+        return self.total_duration_ms // self.run_count
+
+
+class IdempotencyKey(models.Model):
+    """
+    Stored response of a POST request sent with an ``Idempotency-Key`` header.
+    
+    Retries with the same key and user replay the stored response instead of
+    running the request again. Rows expire after ``IDEMPOTENCY_KEY_TTL_HOURS``.
+    """
+    
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='idempotency_keys')
+    key = models.CharField(max_length=255)
+    request_method = models.CharField(max_length=10)
+    request_path = models.CharField(max_length=255)
+    fingerprint = models.CharField(max_length=64)
+    
+    response_status = models.IntegerField(blank=True, null=True)
+    response_body = models.JSONField(blank=True, null=True, encoder=DjangoJSONEncoder)
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(db_index=True)
+    
+    class Meta:
+        db_table = 'idempotency_keys'
+        verbose_name = 'Idempotency Key'
+        verbose_name_plural = 'Idempotency Keys'
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'key'], name='unique_idempotency_key_per_user'),
+        ]
+    
+    def __str__(self):
+        return f"{self.request_method} {self.request_path} ({self.key})"
+    
+    def is_expired(self):
+        """Check if the stored response may no longer be replayed."""
+        return timezone.now() >= self.expires_at
+
+
+class BulkAction(models.Model):
+    """
+    Admin action over a large selection, processed in the background in batches.
+    
+    ``processed`` is advanced in the same transaction as each batch, so an
+    interrupted run resumes where it stopped.
+    """
+    
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+    ]
+    
+    name = models.CharField(max_length=100)
+    object_ids = models.JSONField(default=list)
+    total = models.IntegerField(default=0)
+    processed = models.IntegerField(default=0)
+    affected = models.IntegerField(default=0, help_text='Rows actually changed by the action')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    error = models.TextField(blank=True)
+    
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, blank=True, null=True, related_name='bulk_actions'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    started_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+    
+    class Meta:
+        db_table = 'bulk_actions'
+        verbose_name = 'Bulk Action'
+        verbose_name_plural = 'Bulk Actions'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'updated_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.name} #{self.pk} - {self.status}"
+    
+    @property
+    def percent(self):
+        """Share of the selection processed so far."""
+        if not self.total:
+            return 100
+        return self.processed * 100 // self.total
+
+
+class SnowflakeNode(models.Model):
+    """
+    Lease of a Snowflake node id by a running process.
+    
+    Times are milliseconds since the Unix epoch, like the ids' timestamps.
+    """
+    
+    node_id = models.PositiveSmallIntegerField(primary_key=True)
+    owner = models.CharField(max_length=255)
+    leased_until = models.BigIntegerField()
+    
+    class Meta:
+        db_table = 'snowflake_nodes'
+        verbose_name = 'Snowflake Node'
+        verbose_name_plural = 'Snowflake Nodes'
+    
+    def __str__(self):
+        return f"Node {self.node_id} ({self.owner})"
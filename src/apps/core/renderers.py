@@ -0,0 +1,69 @@
+"""
+JSON renderer and parser backed by ``orjson``.
+
+Drop-in replacements for DRF's ``JSONRenderer`` and ``JSONParser``. orjson
+serializes datetimes, dates, UUIDs and dict/list subclasses natively;
+``Decimal`` follows ``COERCE_DECIMAL_TO_STRING`` like DRF's decimal fields,
+and anything else is handed to DRF's encoder. If orjson is not installed,
+both classes fall back to the stdlib implementation.
+"""
+import decimal
+
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+_fallback_encoder = JSONEncoder()
+
+
+def _default(obj):
+    """Serialize the types orjson doesn't handle itself."""
+    if isinstance(obj, decimal.Decimal):
+        return str(obj) if api_settings.COERCE_DECIMAL_TO_STRING else float(obj)
+    return _fallback_encoder.default(obj)
+
+
+def dumps(data, indent=False):
+    """Serialize ``data`` to JSON bytes."""
+    option = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+    if indent:
+        option |= orjson.OPT_INDENT_2
+    return orjson.dumps(data, default=_default, option=option)
+
+
+class ORJSONRenderer(JSONRenderer):
+    """Render responses with orjson."""
+    
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        
+        if data is None:
+            return b''
+        
+        renderer_context = renderer_context or {}
+        indent = self.get_indent(accepted_media_type, renderer_context)
+        return dumps(data, indent=bool(indent))
+
+
+class ORJSONParser(JSONParser):
+    """Parse JSON request bodies with orjson."""
+    
+    renderer_class = ORJSONRenderer
+    
+    def parse(self, stream, media_type=None, parser_context=None):
+        if orjson is None:
+            return super().parse(stream, media_type, parser_context)
+        
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f'JSON parse error - {exc}')
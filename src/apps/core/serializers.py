@@ -0,0 +1,441 @@
+"""
+Compiled read-only serialization for hot list endpoints.
+
+A ``ModelSerializer`` builds a model instance per row and then walks its
+fields, resolving each source attribute by attribute. For read-only lists
+``CompiledSerializerMixin`` instead compiles the serializer once into a plan
+of ``values()`` lookups and per-field converters: the page is fetched as
+plain rows, and each row is mapped to a dict by a flat loop over the plan.
+
+Converters reuse the serializer's own field instances (``to_representation``),
+so the output is identical to the regular serializer. Fields whose source is
+not a plain column path (properties, methods, ``source='*'``) must be
+described in ``Meta.compiled_sources``::
+
+    compiled_sources = {
+        # field name: (lookups, function of the looked-up values)
+        'in_stock': (('stock',), lambda stock: stock > 0),
+    }
+
+``Meta.compiled_annotations`` adds query annotations (e.g. counts) that
+``compiled_sources`` can refer to. Fields may also implement
+``compile_source(prefix)`` returning ``(lookups, function)``; the result of
+that function is used as is.
+
+Clients can ask for a sparse fieldset with ``?fields=id,name`` or
+``?exclude=description``. ``SparseFieldsetMixin`` drops the other fields from
+a serializer, compiled lists only fetch the columns behind the kept fields,
+and ``SparseFieldsetViewMixin`` narrows a view's queryset with ``only()``,
+keeping only the ``select_related`` joins the kept fields traverse.
+``DeferTextFieldsMixin`` uses the same field sources to defer the large text
+columns a list serializer never outputs.
+"""
+from functools import lru_cache
+
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from django.db.models import Manager, QuerySet, TextField
+from rest_framework.exceptions import ValidationError
+from rest_framework.fields import FileField, SerializerMethodField
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.relations import PrimaryKeyRelatedField
+from rest_framework.response import Response
+from rest_framework.serializers import ListSerializer
+
+FIELDS_PARAM = 'fields'
+EXCLUDE_PARAM = 'exclude'
+
+
+def _split_param(value):
+    return {name.strip() for name in value.split(',') if name.strip()} if value else set()
+
+
+def select_fields(names, request):
+    """
+    Return the field names kept by the request's ``fields`` / ``exclude`` parameters.
+    
+    Returns ``None`` when the request doesn't ask for a sparse fieldset. Only
+    read requests are narrowed, so writes always validate every field.
+    """
+    if request is None or request.method not in SAFE_METHODS:
+        return None
+    
+    params = getattr(request, 'query_params', request.GET)
+    fields = _split_param(params.get(FIELDS_PARAM))
+    exclude = _split_param(params.get(EXCLUDE_PARAM))
+    if not fields and not exclude:
+        return None
+    
+    unknown = (fields | exclude).difference(names)
+    if unknown:
+        raise ValidationError({
+            FIELDS_PARAM: [f'Unknown fields: {", ".join(sorted(unknown))}. Available: {", ".join(names)}.']
+        })
+    
+    return tuple(name for name in names if (not fields or name in fields) and name not in exclude)
+
+
+def prune_queryset(queryset, lookups):
+    """
+    Narrow ``queryset`` to the columns behind ``lookups`` with ``only()``.
+    
+    Forward relations the lookups traverse are joined with ``select_related``
+    and every other join is dropped; reverse relations (nested lists) are left
+    to their own queries. The queryset is returned unchanged if a lookup is
+    not a model field path.
+    """
+    model = queryset.model
+    columns = {model._meta.pk.name}
+    joins = set()
+    
+    for lookup in lookups:
+        current, path = model, []
+        for part in lookup.split('__'):
+            try:
+                field = current._meta.get_field(part)
+            except FieldDoesNotExist:
+                if current is model and part in queryset.query.annotations:
+                    break
+                return queryset
+            if field.is_relation and (field.many_to_many or not field.concrete):
+                break
+            
+            if path:
+                joins.add('__'.join(path))
+            path.append(part)
+            columns.add('__'.join(path))
+            if not field.is_relation:
+                break
+            current = field.related_model
+    
+    queryset = queryset.select_related(None)
+    if joins:
+        queryset = queryset.select_related(*joins)
+    return queryset.only(*columns)
+
+
+def field_source(name, field, sources):
+    """
+    Return ``(lookups, compute function or source prefix, kind)`` for a serializer field.
+    
+    Returns ``None`` when the field's columns can't be known (e.g. a
+    ``SerializerMethodField`` without an entry in ``sources``).
+    """
+    if name in sources:
+        lookups, func = sources[name]
+        return tuple(lookups), func, 'computed'
+    if hasattr(field, 'compile_source'):
+        prefix = '' if field.source == '*' else '__'.join(field.source_attrs) + '__'
+        lookups, _ = field.compile_source(prefix)
+        return tuple(lookups), prefix, 'field'
+    if field.source != '*':
+        return ('__'.join(field.source_attrs),), None, 'column'
+    return None
+
+
+@lru_cache(maxsize=None)
+def serializer_lookups(serializer_class):
+    """
+    Return the lookups read by a serializer's output fields.
+    
+    ``None`` stands for a field that may read any column of the model.
+    """
+    sources = getattr(serializer_class.Meta, 'compiled_sources', {})
+    lookups = []
+    for name, field in serializer_class().fields.items():
+        if field.write_only:
+            continue
+        source = field_source(name, field, sources)
+        if source is None:
+            lookups.append(None)
+        elif source[2] == 'column' and isinstance(field, PrimaryKeyRelatedField):
+            # Only the foreign key column is read, not the related row
+            lookups.append(f'{source[0][0]}_id')
+        else:
+            lookups.extend(source[0])
+    return tuple(lookups)
+
+
+def _loaded_relations(select_related, prefix=''):
+    """Yield the relation paths of a ``query.select_related`` tree."""
+    if not isinstance(select_related, dict):
+        return
+    for name, children in select_related.items():
+        path = f'{prefix}__{name}' if prefix else name
+        yield path
+        yield from _loaded_relations(children, path)
+
+
+def defer_unused_text_fields(queryset, lookups):
+    """
+    Defer the ``TextField`` columns no lookup reads.
+    
+    Covers the queryset's model and the models joined with
+    ``select_related``. Models a lookup can't see into (a ``None`` lookup for
+    the base model, or a method or property on a relation) are left whole.
+    """
+    model = queryset.model
+    used = set()
+    opaque = set()
+    
+    for lookup in lookups:
+        if lookup is None:
+            opaque.add('')
+            continue
+        
+        current, path = model, []
+        for part in lookup.split('__'):
+            try:
+                field = current._meta.get_field(part)
+            except FieldDoesNotExist:
+                if current is model and part in queryset.query.annotations:
+                    break
+                opaque.add('__'.join(path))
+                break
+            if field.is_relation and (field.many_to_many or not field.concrete):
+                break
+            
+            path.append(part)
+            used.add('__'.join(path))
+            if not field.is_relation or part == field.attname:
+                break
+            current = field.related_model
+        else:
+            if path and current is not model:
+                # The lookup reads a whole related object (e.g. a nested serializer)
+                opaque.add('__'.join(path))
+    
+    deferred = []
+    relations = [('', model)]
+    for path in _loaded_relations(queryset.query.select_related):
+        related_model = model
+        for part in path.split('__'):
+            related_model = related_model._meta.get_field(part).related_model
+        relations.append((path, related_model))
+    
+    for prefix, related_model in relations:
+        if prefix in opaque:
+            continue
+        for field in related_model._meta.concrete_fields:
+            column = f'{prefix}__{field.name}' if prefix else field.name
+            if isinstance(field, TextField) and column not in used:
+                deferred.append(column)
+    
+    return queryset.defer(*deferred) if deferred else queryset
+
+
+class CompiledPlan:
+    """Column lookups and converters compiled from a serializer class."""
+    
+    def __init__(self, serializer_class, fields=None):
+        self.serializer_class = serializer_class
+        meta = serializer_class.Meta
+        self.model = meta.model
+        sources = getattr(meta, 'compiled_sources', {})
+        
+        # (field name, lookups, compute function or source prefix, kind)
+        self.entries = []
+        lookups = {}
+        for name, field in serializer_class().fields.items():
+            if field.write_only or (fields is not None and name not in fields):
+                continue
+            
+            source = field_source(name, field, sources)
+            if source is None:
+                raise ImproperlyConfigured(
+                    f'{serializer_class.__name__}.{name} needs an entry in Meta.compiled_sources.'
+                )
+            
+            field_lookups, func, kind = source
+            lookups.update(dict.fromkeys(field_lookups))
+            self.entries.append((name, tuple(field_lookups), func, kind))
+        
+        self.lookups = tuple(lookups)
+        self.names = tuple(entry[0] for entry in self.entries)
+        self.annotations = {
+            name: annotation
+            for name, annotation in getattr(meta, 'compiled_annotations', {}).items()
+            if name in lookups
+        }
+    
+    def _model_field(self, lookup):
+        """Resolve a ``values()`` lookup path to its model field."""
+        model = self.model
+        *relations, name = lookup.split('__')
+        for relation in relations:
+            model = model._meta.get_field(relation).related_model
+        return model._meta.get_field(name)
+    
+    def values(self, queryset):
+        """Return ``queryset`` reduced to the columns the serializer needs."""
+        if not self.annotations:
+            return queryset.values(*self.lookups)
+        
+        if not queryset.query.order_by and queryset.query.default_ordering:
+            # Meta.ordering is not applied to GROUP BY queries
+            queryset = queryset.order_by(*self.model._meta.ordering)
+        # values() first, so the query groups by the fetched columns only
+        columns = [lookup for lookup in self.lookups if lookup not in self.annotations]
+        return queryset.values(*columns).annotate(**self.annotations)
+    
+    def _converter(self, field, lookups, func, kind):
+        if kind == 'field':
+            # Let the request-bound field build its own function (e.g. to make absolute URLs)
+            _, func = field.compile_source(func)
+            if len(lookups) == 1:
+                return lambda row, key=lookups[0]: func(row[key])
+            return lambda row: func(*(row[key] for key in lookups))
+        
+        to_representation = self._to_representation(field, lookups)
+        
+        if kind == 'computed':
+            def convert(row):
+                value = func(*(row[key] for key in lookups))
+                return None if value is None else to_representation(value)
+            return convert
+        
+        key = lookups[0]
+        
+        def convert(row):
+            value = row[key]
+            return None if value is None else to_representation(value)
+        return convert
+    
+    def _to_representation(self, field, lookups):
+        if isinstance(field, SerializerMethodField) or (
+            isinstance(field, PrimaryKeyRelatedField) and field.pk_field is None
+        ):
+            # The compiled value (or the primary key from values()) is the representation
+            return lambda value: value
+        
+        if isinstance(field, FileField):
+            # Rebuild the FieldFile from the stored name so the field can build its URL
+            model_field = self._model_field(lookups[0])
+            attr_class = model_field.attr_class
+            return lambda name: field.to_representation(attr_class(None, model_field, name))
+        
+        return field.to_representation
+    
+    def bind(self, context):
+        """Return a row -> dict function using the field instances of a serializer bound to ``context``."""
+        fields = self.serializer_class(context=context).fields
+        converters = tuple(
+            (name, self._converter(fields[name], lookups, func, kind))
+            for name, lookups, func, kind in self.entries
+        )
+        
+        def render(row):
+            return {name: convert(row) for name, convert in converters}
+        return render
+
+
+@lru_cache(maxsize=256)
+def get_plan(serializer_class, fields=None):
+    """Return the compiled plan of a serializer (restricted to ``fields``), compiled once per fieldset."""
+    return CompiledPlan(serializer_class, fields)
+
+
+class SparseFieldsetMixin:
+    """Drops the fields not selected by the request's ``fields`` / ``exclude`` parameters."""
+    
+    def get_fields(self):
+        fields = super().get_fields()
+        
+        # Only the top-level serializer (or each item of a top-level list) is narrowed
+        parent = self.parent
+        if isinstance(parent, ListSerializer):
+            parent = parent.parent
+        if parent is not None:
+            return fields
+        
+        names = select_fields(tuple(fields), self.context.get('request'))
+        if names is None:
+            return fields
+        return {name: fields[name] for name in names}
+
+
+class CompiledSerializerMixin(SparseFieldsetMixin):
+    """Adds a compiled read-only serialization mode to a ``ModelSerializer``."""
+    
+    @classmethod
+    def get_compiled_plan(cls, fields=None):
+        return get_plan(cls, fields)
+    
+    @classmethod
+    def compiled_data(cls, rows, context=None, fields=None):
+        """Serialize ``values()`` rows fetched through the compiled plan."""
+        render = cls.get_compiled_plan(fields).bind(context or {})
+        return [render(row) for row in rows]
+
+
+class CompiledListSerializer(ListSerializer):
+    """
+    ``many=True`` serializer using the child's compiled plan for querysets.
+    
+    Set as ``Meta.list_serializer_class`` so nested lists (e.g. ``cart.items``)
+    are fetched as rows; lists of instances are serialized as usual.
+    """
+    
+    def to_representation(self, data):
+        if isinstance(data, (Manager, QuerySet)):
+            child = type(self.child)
+            fields = tuple(self.child.fields)
+            rows = child.get_compiled_plan(fields).values(data.all())
+            return child.compiled_data(rows, self.context, fields)
+        return super().to_representation(data)
+
+
+class CompiledListMixin:
+    """
+    List view mixin serving ``list()`` through the serializer's compiled plan.
+    
+    Filtering, ordering and pagination run on the queryset as usual; only the
+    page's columns (of the requested fields) are fetched.
+    """
+    
+    def list(self, request, *args, **kwargs):
+        serializer_class = self.get_serializer_class()
+        fields = select_fields(serializer_class.get_compiled_plan().names, request)
+        plan = serializer_class.get_compiled_plan(fields)
+        queryset = plan.values(self.filter_queryset(self.get_queryset()))
+        context = self.get_serializer_context()
+        
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(serializer_class.compiled_data(page, context, fields))
+        
+        return Response(serializer_class.compiled_data(queryset, context, fields))
+
+
+class DeferTextFieldsMixin:
+    """
+    Generic view mixin deferring the ``TextField`` columns the serializer doesn't output.
+    
+    Applies to read requests, so descriptions and notes are only fetched by the
+    endpoints that show them.
+    """
+    
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.request.method not in SAFE_METHODS:
+            return queryset
+        return defer_unused_text_fields(queryset, serializer_lookups(self.get_serializer_class()))
+
+
+class SparseFieldsetViewMixin:
+    """
+    Generic view mixin loading only the columns of the requested fields.
+    
+    Use with a ``SparseFieldsetMixin`` serializer; the field sources come from
+    the serializer's compiled plan (see ``Meta.compiled_sources``).
+    """
+    
+    def get_sparse_fields(self):
+        """Return the requested field names, or ``None`` for the full representation."""
+        return select_fields(get_plan(self.get_serializer_class()).names, self.request)
+    
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        fields = self.get_sparse_fields()
+        if fields is None:
+            return queryset
+        return prune_queryset(queryset, get_plan(self.get_serializer_class(), fields).lookups)
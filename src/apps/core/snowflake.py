@@ -0,0 +1,182 @@
+"""
+Time-ordered unique ids (Snowflake layout).
+
+An id is a 63-bit integer made of 41 bits of milliseconds since ``EPOCH_MS``,
+10 bits of node id and 12 bits of sequence. A process generates up to 4096
+ids per millisecond without a database round trip, and ids (and their fixed
+width base32 form) sort by creation time, so inserts into a unique index
+append to its right edge instead of landing on random pages.
+
+Ids are unique as long as no two processes use the same node id at the same
+time. ``SNOWFLAKE_NODE_ID`` pins the node id, leaving uniqueness to the
+deployment. Otherwise, on PostgreSQL, each process leases a free node id from
+the ``snowflake_nodes`` table for ``SNOWFLAKE_LEASE_SECONDS`` and renews it
+when half of the lease is over. A process stops using its node id
+``SNOWFLAKE_LEASE_MARGIN_SECONDS`` before the lease ends and other processes
+only take a lease over once it has ended, so two processes never share a
+node id within the same millisecond (as long as host clocks are within the
+margin of each other). Leases are written on a dedicated autocommit
+connection, so rolling back the caller's transaction never undoes them.
+
+Other databases (SQLite in development) use node id 0.
+"""
+import logging
+import os
+import random
+import socket
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from .models import SnowflakeNode
+
+logger = logging.getLogger(__name__)
+
+
+# 2024-01-01T00:00:00Z; 41 bits of milliseconds last until 2093
+EPOCH_MS = 1704067200000
+
+NODE_BITS = 10
+SEQUENCE_BITS = 12
+MAX_NODE_ID = (1 << NODE_BITS) - 1
+MAX_SEQUENCE = (1 << SEQUENCE_BITS) - 1
+
+# Crockford's base32 alphabet is in ASCII order, so encoded ids sort like the integers
+BASE32_ALPHABET = '0123456789ABCDEFGHJKMNPQRSTVWXYZ'
+BASE32_LENGTH = 13
+
+
+def encode_base32(value):
+    """Encode an id as a fixed width Crockford base32 string."""
+    chars = []
+    for _ in range(BASE32_LENGTH):
+        value, digit = divmod(value, 32)
+        chars.append(BASE32_ALPHABET[digit])
+    return ''.join(reversed(chars))
+
+
+def id_timestamp_ms(value):
+    """Return the Unix time in milliseconds at which an id was generated."""
+    return (value >> (NODE_BITS + SEQUENCE_BITS)) + EPOCH_MS
+
+
+def _now_ms():
+    return time.time_ns() // 1_000_000
+
+
+class SnowflakeGenerator:
+    """Thread-safe generator of Snowflake ids for one process."""
+    
+    def __init__(self, using=DEFAULT_DB_ALIAS):
+        self.using = using
+        self.reset()
+    
+    def reset(self):
+        """Forget the node id and sequence, e.g. in a forked child process."""
+        self._lock = threading.Lock()
+        self.owner = f'{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}'
+        self.node_id = None
+        # Lease end and renewal time in ms; None for a pinned node id
+        self.lease_until = None
+        self.renew_at = None
+        self.last_ms = -1
+        self.sequence = 0
+    
+    def next_id(self):
+        """Return a new id."""
+        with self._lock:
+            now = _now_ms()
+            self._ensure_node(now)
+            
+            if now < self.last_ms:
+                # The clock went back: keep counting in the last millisecond
+                now = self.last_ms
+            if now == self.last_ms:
+                self.sequence = (self.sequence + 1) & MAX_SEQUENCE
+                if self.sequence == 0:
+                    # 4096 ids this millisecond already, wait for the next one
+                    while now <= self.last_ms:
+                        time.sleep(0)
+                        now = _now_ms()
+            else:
+                self.sequence = 0
+            self.last_ms = now
+            
+            return ((now - EPOCH_MS) << (NODE_BITS + SEQUENCE_BITS)) | (self.node_id << SEQUENCE_BITS) | self.sequence
+    
+    def _ensure_node(self, now):
+        if self.node_id is None:
+            pinned = settings.SNOWFLAKE_NODE_ID
+            if pinned is not None:
+                if not 0 <= pinned <= MAX_NODE_ID:
+                    raise ImproperlyConfigured(f'SNOWFLAKE_NODE_ID must be between 0 and {MAX_NODE_ID}.')
+                self.node_id = pinned
+                return
+            if connections[self.using].vendor != 'postgresql':
+                self.node_id = 0
+                return
+        elif self.lease_until is None or now < self.renew_at:
+            return
+        
+        self._lease(now)
+    
+    def _lease(self, now):
+        """Renew the current lease if it is still ours, otherwise lease a free node id."""
+        lease_ms = settings.SNOWFLAKE_LEASE_SECONDS * 1000
+        until = now + lease_ms
+        table = connections[self.using].ops.quote_name(SnowflakeNode._meta.db_table)
+        
+        connection = connections.create_connection(self.using)
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(f'SELECT node_id FROM {table} WHERE leased_until >= %s', [now])
+                taken = {row[0] for row in cursor.fetchall()}
+                candidates = [node_id for node_id in range(MAX_NODE_ID + 1) if node_id not in taken]
+                random.shuffle(candidates)
+                if self.node_id is not None:
+                    candidates.insert(0, self.node_id)
+                
+                for node_id in candidates:
+                    cursor.execute(
+                        f'INSERT INTO {table} (node_id, owner, leased_until) VALUES (%s, %s, %s) '
+                        f'ON CONFLICT (node_id) DO UPDATE '
+                        f'SET owner = EXCLUDED.owner, leased_until = EXCLUDED.leased_until '
+                        f'WHERE {table}.owner = EXCLUDED.owner OR {table}.leased_until < %s '
+                        f'RETURNING node_id',
+                        [node_id, self.owner, until, now]
+                    )
+                    if cursor.fetchone() is not None:
+                        break
+                else:
+                    raise RuntimeError(f'All {MAX_NODE_ID + 1} Snowflake node ids are leased.')
+        except Exception:
+            # Without a renewed lease the node id must not outlive its current one
+            if self.lease_until is not None and now < self.lease_until - settings.SNOWFLAKE_LEASE_MARGIN_SECONDS * 1000:
+                logger.exception('Could not renew the lease of Snowflake node %s', self.node_id)
+                self.renew_at = now + 5000
+                return
+            self.node_id = None
+            raise
+        finally:
+            connection.close()
+        
+        if node_id != self.node_id:
+            logger.info('Leased Snowflake node %s as %s', node_id, self.owner)
+        self.node_id = node_id
+        self.lease_until = until
+        self.renew_at = now + lease_ms // 2
+
+
+_generator = SnowflakeGenerator()
+
+# A forked child must not keep generating with its parent's node id
+os.register_at_fork(after_in_child=_generator.reset)
+
+
+def next_id():
+    """Return a new id from the process-wide generator."""
+    return _generator.next_id()
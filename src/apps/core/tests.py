@@ -0,0 +1,401 @@
+import csv
+import gzip
+import io
+import json
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from apps.orders.exports import OrderExport
+from apps.orders.models import Order, OrderItem
+from apps.payments.models import Payment
+from apps.products.models import Category, Product
+from . import bulk, events, jobs
+from .models import BulkAction, IdempotencyKey, OutboxEvent, PeriodicJob
+from .throttling import TokenBucketThrottle
+
+ADDRESS = {
+    'shipping_address': '1 Main Street',
+    'shipping_city': 'Springfield',
+    'shipping_state': 'IL',
+    'shipping_zip_code': '62701',
+    'shipping_country': 'US',
+    'phone_number': '+15555550100',
+}
+
+
+@override_settings(SNOWFLAKE_NODE_ID=7)
+class IdempotencyTests(TestCase):
+    """POSTs with an Idempotency-Key run once and replay their successful response."""
+    
+    def setUp(self):
+        self.user = get_user_model().objects.create_user('buyer@example.com', None, is_verified=True)
+        category = Category.objects.create(name='Books')
+        self.product = Product.objects.create(
+            name='Book', description='', price=10, stock=5, category=category, created_by=self.user
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.addCleanup(cache.clear)
+    
+    def add_to_cart(self, quantity=1):
+        response = self.client.post('/api/v1/cart/add/', {'product_id': self.product.pk, 'quantity': quantity}, format='json')
+        self.assertEqual(response.status_code, 200)
+    
+    def create_order(self, key, **data):
+        return self.client.post('/api/v1/orders/create/', {**ADDRESS, **data}, format='json', HTTP_IDEMPOTENCY_KEY=key)
+    
+    def test_retry_replays_the_response(self):
+        self.add_to_cart()
+        first = self.create_order('order-1')
+        second = self.create_order('order-1')
+        
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(second.status_code, 201)
+        self.assertEqual(second['Idempotent-Replayed'], 'true')
+        self.assertEqual(second.json(), first.json())
+        self.assertEqual(Order.objects.count(), 1)
+    
+    def test_replay_from_database_without_cache(self):
+        self.add_to_cart()
+        first = self.create_order('order-1')
+        cache.clear()
+        second = self.create_order('order-1')
+        
+        self.assertEqual(second['Idempotent-Replayed'], 'true')
+        self.assertEqual(second.json(), first.json())
+        self.assertEqual(Order.objects.count(), 1)
+    
+    def test_key_reused_with_another_request(self):
+        self.add_to_cart()
+        self.create_order('order-1')
+        response = self.create_order('order-1', notes='Leave at the door')
+        
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(Order.objects.count(), 1)
+    
+    def test_errors_are_not_stored(self):
+        # The cart is empty: the retry runs again once it isn't
+        self.assertEqual(self.create_order('order-1').status_code, 400)
+        self.assertFalse(IdempotencyKey.objects.exists())
+        
+        self.add_to_cart()
+        response = self.create_order('order-1')
+        self.assertEqual(response.status_code, 201)
+        self.assertNotIn('Idempotent-Replayed', response)
+    
+    def test_keys_are_per_user(self):
+        self.add_to_cart()
+        self.create_order('order-1')
+        
+        other = get_user_model().objects.create_user('other@example.com', None, is_verified=True)
+        self.client.force_authenticate(other)
+        self.assertEqual(self.create_order('order-1').status_code, 400)
+
+
+TEST_EVENT = 'test.happened'
+delivered = []
+
+
+@events.subscriber(TEST_EVENT)
+def record_event(event):
+    if event.payload.get('fail'):
+        raise ValueError('Subscriber failed')
+    delivered.append(event.pk)
+
+
+def external_backend(event):
+    delivered.append(('external', event.pk))
+
+
+@override_settings(EVENT_BUS_BACKEND='apps.core.tests.external_backend', EVENT_BUS_MAX_ATTEMPTS=2)
+class OutboxTests(TestCase):
+    """Events are leased in batches, delivered to every handler once and retried on failure."""
+    
+    def setUp(self):
+        self.user = get_user_model().objects.create_user('buyer@example.com', None)
+        delivered.clear()
+    
+    def test_dispatch(self):
+        event = events.publish(TEST_EVENT, self.user, amount=1)
+        
+        self.assertEqual(events.dispatch_pending(), 1)
+        self.assertEqual(delivered, [event.pk, ('external', event.pk)])
+        
+        event.refresh_from_db()
+        self.assertEqual(event.status, 'dispatched')
+        self.assertEqual(event.delivered_to, [events._subscriber_name(record_event), events.EXTERNAL_SUBSCRIBER])
+        self.assertEqual(events.dispatch_pending(), 0)
+    
+    def test_failed_subscriber_is_retried_alone(self):
+        event = events.publish(TEST_EVENT, self.user, fail=True)
+        
+        with self.assertLogs('apps.core.events', 'ERROR'):
+            events.dispatch_pending()
+        event.refresh_from_db()
+        self.assertEqual((event.status, event.attempts), ('pending', 1))
+        self.assertIn('Subscriber failed', event.last_error)
+        self.assertGreater(event.available_at, timezone.now())
+        
+        # The external backend got it on the first attempt and isn't called again
+        OutboxEvent.objects.filter(pk=event.pk).update(available_at=timezone.now())
+        with self.assertLogs('apps.core.events', 'ERROR'):
+            events.dispatch_pending()
+        event.refresh_from_db()
+        self.assertEqual((event.status, event.attempts), ('failed', 2))
+        self.assertEqual(delivered, [('external', event.pk)])
+    
+    def test_leased_events_are_skipped_until_the_lease_ends(self):
+        event = events.publish(TEST_EVENT, self.user)
+        self.assertEqual(events._claim(10, timezone.now()), [event])
+        
+        # Another dispatcher leaves the leased event alone
+        self.assertEqual(events.dispatch_pending(), 0)
+        
+        # ... and takes it over once the lease has run out
+        OutboxEvent.objects.filter(pk=event.pk).update(available_at=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(events.dispatch_pending(), 1)
+        self.assertEqual(OutboxEvent.objects.get(pk=event.pk).status, 'dispatched')
+
+
+class LoginView:
+    # The login scope: a burst of 10, then 30 an hour (one token every 120s)
+    throttle_scope = 'login'
+
+
+class TokenBucketThrottleTests(TestCase):
+    """Clients get a burst of requests, then the sustained rate as the bucket refills."""
+    
+    def setUp(self):
+        self.now = 1_000_000.0
+        timer = mock.patch.object(TokenBucketThrottle, 'timer', side_effect=lambda: self.now)
+        timer.start()
+        self.addCleanup(timer.stop)
+        self.addCleanup(cache.clear)
+    
+    def request(self, ip='10.0.0.1'):
+        throttle = TokenBucketThrottle()
+        allowed = throttle.allow_request(Request(APIRequestFactory().get('/', REMOTE_ADDR=ip)), LoginView())
+        return allowed, throttle.wait()
+    
+    def test_burst(self):
+        for _ in range(10):
+            self.assertEqual(self.request(), (True, None))
+        
+        self.assertEqual(self.request(), (False, 120))
+        # Buckets are per client
+        self.assertTrue(self.request(ip='10.0.0.2')[0])
+    
+    def test_refill(self):
+        for _ in range(10):
+            self.request()
+        
+        self.now += 60
+        allowed, wait = self.request()
+        self.assertFalse(allowed)
+        self.assertAlmostEqual(wait, 60)
+        
+        self.now += 60
+        self.assertTrue(self.request()[0])
+        self.assertFalse(self.request()[0])
+    
+    def test_refill_stops_at_the_burst_size(self):
+        self.request()
+        self.now += 86400
+        
+        allowed = [self.request()[0] for _ in range(11)]
+        self.assertEqual(allowed, [True] * 10 + [False])
+    
+    def test_busy_bucket(self):
+        # A concurrent request of the same client holds the bucket
+        cache.add('throttle:login:ip:10.0.0.1:lock', 1)
+        with mock.patch('apps.core.throttling.time.sleep'):
+            self.assertEqual(self.request(), (False, 1))
+
+
+def failing_job():
+    raise ValueError('Job failed')
+
+
+class PeriodicJobTests(TestCase):
+    """Due jobs are claimed once per interval and their runs recorded."""
+    
+    def setUp(self):
+        registry = mock.patch.dict(jobs._registry, clear=True)
+        registry.start()
+        self.addCleanup(registry.stop)
+        jobs.periodic_job(interval=timedelta(minutes=5), name='test.ok')(lambda: {'done': 1})
+        jobs.periodic_job(interval=60, name='test.failing')(failing_job)
+        jobs.sync_jobs()
+    
+    def test_due_jobs_are_claimed_once(self):
+        self.assertEqual(sorted(jobs.claim_due_jobs()), ['test.failing', 'test.ok'])
+        self.assertEqual(jobs.claim_due_jobs(), [])
+        self.assertEqual(jobs.claim_due_jobs(names=['test.ok'], force=True), ['test.ok'])
+        
+        job = PeriodicJob.objects.get(name='test.ok')
+        self.assertEqual(job.next_run_at - job.last_started_at, timedelta(minutes=5))
+    
+    def test_interval_changes_are_synced(self):
+        jobs.periodic_job(interval=120, name='test.failing')(failing_job)
+        jobs.sync_jobs()
+        self.assertEqual(PeriodicJob.objects.get(name='test.failing').interval_seconds, 120)
+    
+    def test_run_metrics(self):
+        status, _, result = jobs.run_job('test.ok')
+        self.assertEqual((status, result), ('success', {'done': 1}))
+        with self.assertLogs('apps.core.jobs', 'ERROR'):
+            self.assertEqual(jobs.run_job('test.failing')[0], 'failed')
+        
+        failing, ok = PeriodicJob.objects.order_by('name')
+        self.assertEqual((ok.run_count, ok.failure_count, ok.last_result), (1, 0, {'done': 1}))
+        self.assertEqual((failing.last_status, failing.failure_count, failing.last_error), ('failed', 1, 'Job failed'))
+    
+    def test_delete_in_batches_is_bounded(self):
+        user = get_user_model().objects.create_user('buyer@example.com', None)
+        for _ in range(5):
+            events.publish(TEST_EVENT, user)
+        
+        self.assertEqual(jobs.delete_in_batches(OutboxEvent.objects.all(), batch_size=2, max_batches=2), 4)
+        self.assertEqual(jobs.delete_in_batches(OutboxEvent.objects.all(), batch_size=2, max_batches=2), 1)
+        self.assertFalse(OutboxEvent.objects.exists())
+
+
+def deactivate_users(ids, user):
+    if user.pk in ids:
+        raise ValueError('Cannot deactivate yourself')
+    return get_user_model().objects.filter(pk__in=ids, is_active=True).update(is_active=False)
+
+
+@override_settings(ADMIN_BULK_ACTION_INLINE_LIMIT=2, JOBS_BATCH_SIZE=2)
+class BulkActionTests(TestCase):
+    """Small selections run inline; large ones are queued and processed in resumable batches."""
+    
+    def setUp(self):
+        registry = mock.patch.dict(bulk._registry, {'test.deactivate': deactivate_users})
+        registry.start()
+        self.addCleanup(registry.stop)
+        
+        User = get_user_model()
+        self.admin = User.objects.create_user('admin@example.com', None, is_staff=True)
+        for n in range(5):
+            User.objects.create_user(f'user{n}@example.com', None)
+        self.users = User.objects.exclude(pk=self.admin.pk)
+    
+    def queue(self, queryset):
+        with self.captureOnCommitCallbacks() as callbacks:
+            affected, task = bulk.run_bulk_action('test.deactivate', queryset, self.admin)
+        self.assertIsNone(affected)
+        self.assertEqual(len(callbacks), 1)
+        return task
+    
+    def test_small_selection_runs_inline(self):
+        selection = self.users.filter(pk__in=list(self.users.values_list('pk', flat=True)[:2]))
+        affected, task = bulk.run_bulk_action('test.deactivate', selection, self.admin)
+        
+        self.assertEqual((affected, task), (2, None))
+        self.assertEqual(self.users.filter(is_active=False).count(), 2)
+    
+    def test_large_selection_is_processed_in_batches(self):
+        task = self.queue(self.users)
+        self.assertEqual((task.status, task.total), ('pending', 5))
+        self.assertFalse(self.users.filter(is_active=False).exists())
+        
+        bulk.process_bulk_action(task.pk)
+        task.refresh_from_db()
+        self.assertEqual((task.status, task.processed, task.affected), ('completed', 5, 5))
+        self.assertFalse(self.users.filter(is_active=True).exists())
+        
+        # A processed action isn't claimed again
+        bulk.process_bulk_action(task.pk)
+        self.assertEqual(BulkAction.objects.get(pk=task.pk).affected, 5)
+    
+    def test_failed_batch_keeps_earlier_batches(self):
+        task = self.queue(get_user_model().objects.all())
+        
+        with self.assertLogs('apps.core.bulk', 'ERROR'):
+            bulk.process_bulk_action(task.pk)
+        task.refresh_from_db()
+        # The admin is in the first batch: nothing was changed
+        self.assertEqual((task.status, task.processed, task.error), ('failed', 0, 'Cannot deactivate yourself'))
+        self.assertFalse(get_user_model().objects.filter(is_active=False).exists())
+    
+    def test_stale_actions_are_resumed(self):
+        task = self.queue(self.users)
+        BulkAction.objects.filter(pk=task.pk).update(
+            status='running', processed=2, updated_at=timezone.now() - timedelta(hours=1)
+        )
+        
+        self.assertEqual(bulk.resume_bulk_actions(), {'resumed': 1, 'processed': 0})
+        BulkAction.objects.filter(pk=task.pk).update(updated_at=timezone.now() - timedelta(minutes=2))
+        self.assertEqual(bulk.resume_bulk_actions(), {'resumed': 0, 'processed': 1})
+        
+        # The first batch was taken as done
+        task.refresh_from_db()
+        self.assertEqual((task.status, task.affected), ('completed', 3))
+        self.assertEqual(self.users.filter(is_active=True).count(), 2)
+
+
+@override_settings(SNOWFLAKE_NODE_ID=7)
+class ExportTests(TestCase):
+    """Staff download orders and payments as streamed CSV or NDJSON, optionally gzipped."""
+    
+    def setUp(self):
+        User = get_user_model()
+        self.buyer = User.objects.create_user('buyer@example.com', None)
+        category = Category.objects.create(name='Books')
+        product = Product.objects.create(name='Book', description='', price=10, stock=5, category=category, created_by=self.buyer)
+        
+        self.order = Order.objects.create(user=self.buyer, subtotal=30, total=30, **ADDRESS)
+        for quantity in (1, 2):
+            OrderItem.objects.create(order=self.order, product=product, product_name='Book', product_price=10, quantity=quantity)
+        self.empty_order = Order.objects.create(user=self.buyer, status='cancelled', subtotal=0, total=0, **ADDRESS)
+        
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user('admin@example.com', None, is_staff=True))
+    
+    def download(self, path):
+        response = self.client.get(f'/api/v1/exports/{path}')
+        self.assertEqual(response.status_code, 200)
+        return b''.join(response.streaming_content)
+    
+    def test_orders_csv_has_a_line_per_item(self):
+        rows = list(csv.DictReader(io.StringIO(self.download('orders.csv').decode())))
+        
+        self.assertEqual([(row['id'], row['item_quantity']) for row in rows], [
+            (str(self.order.pk), '1'), (str(self.order.pk), '2'), (str(self.empty_order.pk), ''),
+        ])
+    
+    def test_orders_ndjson_nests_items(self):
+        records = [json.loads(line) for line in gzip.decompress(self.download('orders.ndjson.gz')).splitlines()]
+        
+        self.assertEqual([len(record['items']) for record in records], [2, 0])
+        self.assertEqual(records[0]['order_number'], self.order.order_number)
+    
+    def test_items_are_loaded_per_chunk_of_orders(self):
+        records = list(OrderExport(chunk_size=1).records())
+        self.assertEqual([len(record['items']) for record in records], [2, 0])
+    
+    def test_filters(self):
+        rows = self.download('orders.ndjson?status=cancelled').splitlines()
+        self.assertEqual([json.loads(row)['id'] for row in rows], [self.empty_order.pk])
+        
+        tomorrow = timezone.localdate() + timedelta(days=1)
+        self.assertEqual(self.download(f'orders.ndjson?date_from={tomorrow}'), b'')
+        self.assertEqual(self.client.get('/api/v1/exports/orders.csv?status=lost').status_code, 400)
+    
+    def test_payments_of_archived_orders_are_kept(self):
+        Payment.objects.create(order=None, user=self.buyer, payment_method='stripe', amount=30)
+        
+        [record] = [json.loads(line) for line in self.download('payments.ndjson').splitlines()]
+        self.assertEqual((record['order_id'], record['order_number'], record['amount']), (None, None, '30.00'))
+    
+    def test_staff_only(self):
+        self.client.force_authenticate(self.buyer)
+        self.assertEqual(self.client.get('/api/v1/exports/orders.csv').status_code, 403)
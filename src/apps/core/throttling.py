@@ -0,0 +1,111 @@
+"""
+Token-bucket request throttling.
+
+Each view opts in with a ``throttle_scope``; the scope's limits live in
+``TOKEN_BUCKET_RATES``::
+    
+    TOKEN_BUCKET_RATES = {
+        'login': {'burst': 10, 'sustained': '30/hour'},
+    }
+
+``burst`` is the bucket size (requests allowed back to back) and
+``sustained`` the refill rate. Buckets are kept per scope and per user (or
+client IP for anonymous requests) in the shared cache.
+
+A bucket is stored as ``(tokens, updated)``: on each request it is refilled
+for the time elapsed since ``updated`` (never above ``burst``) and a request
+passes if it can take a whole token. The read-refill-write runs under a short
+per-bucket lock taken with ``cache.add``, which is atomic on shared caches,
+so concurrent requests can't read the same level and all pass. The bucket
+expires once it would have refilled completely, which is the same as full.
+"""
+import math
+import time
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+# A bucket's lock is held for a few cache round trips; it expires after
+# LOCK_TIMEOUT seconds should its holder die
+LOCK_TIMEOUT = 1
+LOCK_ATTEMPTS = 20
+LOCK_RETRY_DELAY = 0.005
+
+
+@lru_cache(maxsize=None)
+def parse_rate(scope):
+    """Return ``(capacity, tokens_per_second)`` for a scope, or ``None`` if it is not limited."""
+    config = settings.TOKEN_BUCKET_RATES.get(scope)
+    if not config:
+        return None
+    num, period = config['sustained'].split('/')
+    refill = int(num) / PERIODS[period[0]]
+    return int(config.get('burst', num)), refill
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """Throttle requests to views with a ``throttle_scope`` using a token bucket."""
+    
+    cache = caches[getattr(settings, 'THROTTLE_CACHE', 'default')]
+    timer = time.time
+    
+    def get_scope(self, request, view):
+        return getattr(view, 'throttle_scope', None)
+    
+    def get_cache_key(self, request, scope):
+        if request.user and request.user.is_authenticated:
+            ident = f'user:{request.user.pk}'
+        else:
+            ident = f'ip:{self.get_ident(request)}'
+        return f'throttle:{scope}:{ident}'
+    
+    def allow_request(self, request, view):
+        scope = self.get_scope(request, view)
+        rate = parse_rate(scope) if scope else None
+        if rate is None:
+            return True
+        
+        capacity, refill = rate
+        key = self.get_cache_key(request, scope)
+        if not self.acquire(key):
+            self._wait = LOCK_TIMEOUT
+            return False
+        try:
+            now = self.timer()
+            tokens, updated = self.cache.get(key, (capacity, now))
+            tokens = min(capacity, tokens + max(0, now - updated) * refill)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            else:
+                # Until the missing part of a token has dripped in
+                self._wait = (1 - tokens) / refill
+            self.cache.set(key, (tokens, now), timeout=math.ceil((capacity - tokens) / refill) + 1)
+        finally:
+            self.cache.delete(f'{key}:lock')
+        return allowed
+    
+    def acquire(self, key):
+        """Take the bucket's lock, waiting for a concurrent request of the same client to release it."""
+        for _ in range(LOCK_ATTEMPTS):
+            if self.cache.add(f'{key}:lock', 1, timeout=LOCK_TIMEOUT):
+                return True
+            time.sleep(LOCK_RETRY_DELAY)
+        return False
+    
+    def wait(self):
+        return getattr(self, '_wait', None)
+
+
+class SearchThrottle(TokenBucketThrottle):
+    """Throttle full-text ``?search=`` requests on views with ``search_fields`` under the ``search`` scope."""
+    
+    def get_scope(self, request, view):
+        if getattr(view, 'search_fields', None) and request.query_params.get(api_settings.SEARCH_PARAM):
+            return 'search'
+        return None
@@ -1,5 +1,6 @@
 from django.contrib import admin
-from .models import Order, OrderItem
+from .models import Order, OrderArchive, OrderItem, ShippingZone, TaxRule
+from apps.core.paginator import EstimatedCountPaginator
 
 
 class OrderItemInline(admin.TabularInline):
@@ -8,6 +9,9 @@ class OrderItemInline(admin.TabularInline):
     extra = 0
     readonly_fields = ('product', 'product_name', 'product_price', 'quantity', 'subtotal')
     can_delete = False
+    
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('product')
 
 
 @admin.register(Order)
@@ -18,8 +22,12 @@ class OrderAdmin(admin.ModelAdmin):
     list_filter = ('status', 'created_at')
     search_fields = ('order_number', 'user__email', 'user__first_name', 'user__last_name')
     list_editable = ('status',)
+    list_select_related = ('user',)
+    autocomplete_fields = ('user',)
     readonly_fields = ('order_number', 'subtotal', 'tax', 'total', 'created_at', 'updated_at')
     ordering = ('-created_at',)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     inlines = [OrderItemInline]
     
     fieldsets = (
@@ -47,4 +55,39 @@ class OrderItemAdmin(admin.ModelAdmin):
     list_display = ('order', 'product_name', 'product_price', 'quantity', 'subtotal')
     list_filter = ('created_at',)
     search_fields = ('order__order_number', 'product_name')
-    readonly_fields = ('order', 'product', 'product_name', 'product_price', 'quantity', 'subtotal', 'created_at')
\ No newline at end of file
+    list_select_related = ('order',)
+    readonly_fields = ('order', 'product', 'product_name', 'product_price', 'quantity', 'subtotal', 'created_at')
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+
+@admin.register(OrderArchive)
+class OrderArchiveAdmin(admin.ModelAdmin):
+    """Admin configuration for OrderArchive model."""
+    
+    list_display = ('month', 'order_count', 'item_count', 'min_order_id', 'max_order_id', 'file_name', 'created_at')
+    readonly_fields = ('month', 'file_name', 'order_count', 'item_count', 'min_order_id', 'max_order_id', 'created_at')
+    ordering = ('-month',)
+    
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(TaxRule)
+class TaxRuleAdmin(admin.ModelAdmin):
+    """Admin configuration for TaxRule model."""
+    
+    list_display = ('country', 'state', 'rate', 'applies_to_shipping', 'is_active', 'updated_at')
+    list_filter = ('is_active', 'applies_to_shipping', 'country')
+    search_fields = ('country', 'state')
+    ordering = ('country', 'state')
+
+
+@admin.register(ShippingZone)
+class ShippingZoneAdmin(admin.ModelAdmin):
+    """Admin configuration for ShippingZone model."""
+    
+    list_display = ('name', 'country', 'zip_prefix', 'cost', 'free_over', 'is_active', 'updated_at')
+    list_filter = ('is_active', 'country')
+    search_fields = ('name', 'country', 'zip_prefix')
+    ordering = ('country', 'zip_prefix')
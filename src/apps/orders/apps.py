@@ -4,4 +4,7 @@ from django.apps import AppConfig
 class OrdersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.orders'
-    verbose_name = 'Orders'
\ No newline at end of file
+    verbose_name = 'Orders'
+
+    def ready(self):
+        from . import signals  # noqa: F401
\ No newline at end of file
@@ -0,0 +1,143 @@
+"""
+Cold storage of old order months.
+
+``archive_month`` writes every order of a month to a gzip-compressed file
+in ``ORDER_ARCHIVE_ROOT``, records an ``OrderArchive`` and drops the month's
+partitions. ``find_archived_order`` reads an order back on demand, so
+``OrderDetailView`` keeps serving archived orders.
+
+Each line is ``<order id>\t<JSON>``, the JSON holding the order (with its
+items) in ``OrderSerializer`` form and its payment (with its refunds) in
+``PaymentSerializer`` form. Items are partitioned by their order's month,
+so the partitions dropped hold exactly the items exported. Payments and
+refunds stay in the database (webhooks, refunds and reconciliation look
+them up by their Stripe ids) and, like reviews, just lose their ``order``.
+"""
+import gzip
+import json
+import os
+import tempfile
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import Max, Min
+from django.utils.functional import LazyObject
+
+from apps.core.renderers import ORJSONRenderer
+
+from . import partitions
+from .models import Order, OrderArchive, OrderItem
+from .serializers import OrderSerializer
+from apps.payments.models import Payment
+from apps.payments.serializers import PaymentSerializer, RefundSerializer
+from apps.reviews.models import Review
+
+ARCHIVED_ORDER_KEY = 'orders:archived:{}'
+
+
+class ArchiveStorage(LazyObject):
+    def _setup(self):
+        self._wrapped = FileSystemStorage(location=settings.ORDER_ARCHIVE_ROOT)
+
+
+archive_storage = ArchiveStorage()
+
+
+def archive_file_name(month):
+    return f'orders-{month:%Y-%m}.jsonl.gz'
+
+
+def _payment_data(payment):
+    if payment is None:
+        return None
+    return {**PaymentSerializer(payment).data, 'refunds': RefundSerializer(payment.refunds.all(), many=True).data}
+
+
+def archive_month(month, using=DEFAULT_DB_ALIAS):
+    """
+    Move the orders created in ``month`` to a compressed file.
+    
+    The file is fully written before the partitions are dropped; running it
+    again for the same month replaces the file.
+    """
+    start, end = partitions.month_bounds(month)
+    orders = (
+        Order.objects.using(using)
+        .filter(created_at__gte=start, created_at__lt=end)
+        .select_related('user', 'payment__user')
+        .prefetch_related('items', 'payment__refunds')
+        .order_by('id')
+    )
+    renderer = ORJSONRenderer()
+    
+    order_count = 0
+    with tempfile.NamedTemporaryFile(suffix='.jsonl.gz', delete=False) as tmp:
+        try:
+            with gzip.open(tmp, 'wb') as out:
+                for order in orders.iterator(chunk_size=settings.JOBS_BATCH_SIZE):
+                    record = {
+                        'order': OrderSerializer(order).data,
+                        'payment': _payment_data(getattr(order, 'payment', None)),
+                    }
+                    out.write(b'%d\t' % order.pk + renderer.render(record) + b'\n')
+                    order_count += 1
+            
+            tmp.seek(0)
+            name = archive_file_name(month)
+            archive_storage.delete(name)
+            name = archive_storage.save(name, File(tmp))
+        finally:
+            tmp.close()
+            os.unlink(tmp.name)
+    
+    ids = orders.aggregate(min_id=Min('id'), max_id=Max('id'))
+    item_count = OrderItem.objects.using(using).filter(order_created_at__gte=start, order_created_at__lt=end).count()
+    
+    with transaction.atomic(using=using):
+        # Payments and reviews outlive their order
+        for model in (Payment, Review):
+            model.objects.using(using).filter(
+                order__created_at__gte=start, order__created_at__lt=end
+            ).update(order=None)
+        archive, _ = OrderArchive.objects.using(using).update_or_create(month=month, defaults={
+            'file_name': name,
+            'order_count': order_count,
+            'item_count': item_count,
+            'min_order_id': ids['min_id'],
+            'max_order_id': ids['max_id'],
+        })
+        partitions.drop_partitions(month, using)
+    return archive
+
+
+def _read_order(file_name, pk):
+    # Lines start with the order id, so only the matching line is parsed
+    prefix = b'%d\t' % pk
+    with archive_storage.open(file_name, 'rb') as f, gzip.open(f) as lines:
+        for line in lines:
+            if line.startswith(prefix):
+                return json.loads(line[len(prefix):])['order']
+            if line.startswith(b'{'):
+                # Archives written before the id prefix hold the bare order
+                order = json.loads(line)
+                if order['id'] == pk:
+                    return order
+    return None
+
+
+def find_archived_order(pk):
+    """Return the archived representation of an order, or ``None``."""
+    key = ARCHIVED_ORDER_KEY.format(pk)
+    data = cache.get(key)
+    if data is not None:
+        return data
+    
+    for archive in OrderArchive.objects.filter(min_order_id__lte=pk, max_order_id__gte=pk):
+        data = _read_order(archive.file_name, pk)
+        if data is not None:
+            cache.set(key, data, settings.ORDER_ARCHIVE_CACHE_SECONDS)
+            return data
+    return None
@@ -0,0 +1,52 @@
+from itertools import islice
+
+from apps.core.exports import Export
+
+from .models import Order, OrderItem
+
+
+class OrderExport(Export):
+    """Orders with their items: nested in NDJSON, one line per item in CSV."""
+    
+    name = 'orders'
+    model = Order
+    fields = (
+        'id', 'order_number', 'user_id', 'user__email', 'status',
+        'shipping_address', 'shipping_city', 'shipping_state',
+        'shipping_zip_code', 'shipping_country', 'phone_number',
+        'subtotal', 'shipping_cost', 'tax', 'total', 'created_at', 'updated_at'
+    )
+    item_fields = ('id', 'product_id', 'product_name', 'product_price', 'quantity', 'subtotal')
+    
+    def records(self):
+        orders = super().records()
+        while True:
+            # Items are loaded per chunk of orders, so memory stays bounded
+            chunk = list(islice(orders, self.chunk_size))
+            if not chunk:
+                return
+            
+            items = {record['id']: [] for record in chunk}
+            rows = (
+                OrderItem.objects.filter(order_id__in=list(items))
+                .order_by('order_id', 'id')
+                .values_list('order_id', *self.item_fields)
+            )
+            for order_id, *values in rows:
+                items[order_id].append(dict(zip(self.item_fields, values)))
+            
+            for record in chunk:
+                record['items'] = items[record['id']]
+                yield record
+    
+    def header(self):
+        return list(self.fields) + [f'item_{name}' for name in self.item_fields]
+    
+    def csv_rows(self):
+        empty_item = [None] * len(self.item_fields)
+        for record in self.records():
+            order = [record[name] for name in self.fields]
+            if not record['items']:
+                yield order + empty_item
+            for item in record['items']:
+                yield order + [item[name] for name in self.item_fields]
@@ -0,0 +1,11 @@
+from datetime import timedelta
+
+from apps.core.jobs import periodic_job
+
+from . import partitions
+
+
+@periodic_job(interval=timedelta(days=1))
+def create_order_partitions():
+    """Create the order partitions of the next ``ORDER_PARTITION_MONTHS_AHEAD`` months."""
+    return {'created': partitions.ensure_partitions()}
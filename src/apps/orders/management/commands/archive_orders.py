@@ -0,0 +1,47 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.orders import partitions
+from apps.orders.archive import archive_month
+
+
+class Command(BaseCommand):
+    help = 'Move order months older than the hot window to compressed archive files and drop their partitions'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--keep-months',
+            type=int,
+            help='Number of past months kept in the database (default: ORDER_HOT_MONTHS)',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='List the months that would be archived',
+        )
+    
+    def handle(self, *args, **options):
+        if not partitions.is_partitioned():
+            raise CommandError('The orders table is not partitioned (partitioning needs PostgreSQL).')
+        
+        keep_months = options['keep_months']
+        if keep_months is None:
+            keep_months = settings.ORDER_HOT_MONTHS
+        if keep_months < 1:
+            raise CommandError('--keep-months must be at least 1.')
+        
+        cutoff = partitions.add_months(partitions.month_start(timezone.now()), -keep_months)
+        months = [month for month in partitions.partition_months() if month < cutoff]
+        
+        for month in months:
+            if options['dry_run']:
+                self.stdout.write(f'Would archive {month:%Y-%m}')
+                continue
+            archive = archive_month(month)
+            self.stdout.write(
+                f'Archived {month:%Y-%m}: {archive.order_count} order(s), {archive.item_count} item(s) '
+                f'to {archive.file_name}'
+            )
+        
+        self.stdout.write(self.style.SUCCESS(f'{len(months)} month(s) {"to archive" if options["dry_run"] else "archived"}.'))
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.orders import partitions
+
+
+class Command(BaseCommand):
+    help = 'Create the monthly partitions of orders and order_items for the coming months'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--months-ahead',
+            type=int,
+            help='Number of months after the current one (default: ORDER_PARTITION_MONTHS_AHEAD)',
+        )
+    
+    def handle(self, *args, **options):
+        if not partitions.is_partitioned():
+            raise CommandError('The orders table is not partitioned (partitioning needs PostgreSQL).')
+        
+        created = partitions.ensure_partitions(options['months_ahead'])
+        for name in created:
+            self.stdout.write(f'Created {name}')
+        self.stdout.write(self.style.SUCCESS(f'{len(created)} partition(s) created.'))
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:02
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrderArchive',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(unique=True)),
+                ('file_name', models.CharField(max_length=255)),
+                ('order_count', models.PositiveIntegerField(default=0)),
+                ('item_count', models.PositiveIntegerField(default=0)),
+                ('min_order_id', models.BigIntegerField(blank=True, null=True)),
+                ('max_order_id', models.BigIntegerField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Order Archive',
+                'verbose_name_plural': 'Order Archives',
+                'db_table': 'order_archives',
+                'ordering': ['-month'],
+            },
+        ),
+        migrations.AlterField(
+            model_name='orderitem',
+            name='order',
+            field=models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.CASCADE, related_name='items', to='orders.order'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['user', '-created_at'], name='orders_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='orderarchive',
+            index=models.Index(fields=['min_order_id', 'max_order_id'], name='order_archives_id_range_idx'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+"""
+Partition orders and order_items by created_at month on PostgreSQL.
+
+Each table is renamed, recreated as a partitioned table with the same
+columns, check constraints, indexes (unique ones become plain indexes) and
+outgoing foreign keys, filled from the old table and given a
+``(id, created_at)`` primary key. The copy runs in the migration's
+transaction; on large tables, run it in a maintenance window.
+
+Other databases are left unchanged. See ``apps.orders.partitions``.
+"""
+from django.db import migrations
+
+from apps.orders.partitions import partition_table
+
+
+def partition_tables(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for model_name in ('Order', 'OrderItem'):
+        partition_table(schema_editor, apps.get_model('orders', model_name)._meta.db_table, 'created_at')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0002_order_archive'),
+        ('payments', '0002_unconstrained_order'),
+        ('reviews', '0002_unconstrained_order'),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_tables, elidable=False),
+    ]
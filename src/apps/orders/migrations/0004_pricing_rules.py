@@ -0,0 +1,55 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:40
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0003_partition_orders'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ShippingZone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('country', models.CharField(max_length=100)),
+                ('zip_prefix', models.CharField(blank=True, help_text='Leave blank to cover the whole country; the longest matching prefix wins.', max_length=20)),
+                ('cost', models.DecimalField(decimal_places=2, max_digits=10, validators=[django.core.validators.MinValueValidator(0)])),
+                ('free_over', models.DecimalField(blank=True, decimal_places=2, help_text='Order subtotal from which shipping is free.', max_digits=10, null=True, validators=[django.core.validators.MinValueValidator(0)])),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Shipping Zone',
+                'verbose_name_plural': 'Shipping Zones',
+                'db_table': 'shipping_zones',
+                'ordering': ['country', 'zip_prefix'],
+                'constraints': [models.UniqueConstraint(fields=('country', 'zip_prefix'), name='shipping_zones_country_prefix_uniq')],
+            },
+        ),
+        migrations.CreateModel(
+            name='TaxRule',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('country', models.CharField(max_length=100)),
+                ('state', models.CharField(blank=True, help_text='Leave blank to apply to the whole country.', max_length=100)),
+                ('rate', models.DecimalField(decimal_places=3, help_text='Percent of the order subtotal, e.g. 8.875.', max_digits=6, validators=[django.core.validators.MinValueValidator(0), django.core.validators.MaxValueValidator(100)])),
+                ('applies_to_shipping', models.BooleanField(default=False, help_text='Also tax the shipping cost.')),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Tax Rule',
+                'verbose_name_plural': 'Tax Rules',
+                'db_table': 'tax_rules',
+                'ordering': ['country', 'state'],
+                'constraints': [models.UniqueConstraint(fields=('country', 'state'), name='tax_rules_country_state_uniq')],
+            },
+        ),
+    ]
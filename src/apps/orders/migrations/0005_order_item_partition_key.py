@@ -0,0 +1,52 @@
+"""
+Partition order_items by the month of their order on PostgreSQL.
+
+Items were partitioned on their own ``created_at``, so an item created just
+after midnight at the end of a month sat in the next month's partition and
+was dropped without being archived. ``order_created_at`` copies the order's
+``created_at``; the table is then recreated partitioned on it (see
+``apps.orders.partitions.partition_table``).
+"""
+from django.db import migrations, models
+
+from apps.orders.partitions import partition_table
+
+
+def copy_order_created_at(apps, schema_editor):
+    quote_name = schema_editor.quote_name
+    items = quote_name(apps.get_model('orders', 'OrderItem')._meta.db_table)
+    orders = quote_name(apps.get_model('orders', 'Order')._meta.db_table)
+    with schema_editor.connection.cursor() as cursor:
+        # Items whose order is already archived keep their own time
+        cursor.execute(
+            f'UPDATE {items} SET order_created_at = COALESCE('
+            f'(SELECT {orders}.created_at FROM {orders} WHERE {orders}.id = {items}.order_id), {items}.created_at)'
+        )
+
+
+def partition_items(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    partition_table(schema_editor, apps.get_model('orders', 'OrderItem')._meta.db_table, 'order_created_at')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0004_pricing_rules'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='orderitem',
+            name='order_created_at',
+            field=models.DateTimeField(editable=False, null=True),
+        ),
+        migrations.RunPython(copy_order_created_at, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='orderitem',
+            name='order_created_at',
+            field=models.DateTimeField(editable=False),
+        ),
+        migrations.RunPython(partition_items, elidable=False),
+    ]
@@ -0,0 +1,44 @@
+"""
+Make ``order_number`` a plain index in the migration state as well.
+
+Migration 0003 turned its unique constraint into a plain index on
+PostgreSQL, since a unique constraint on a partitioned table has to include
+the partition key. Other databases get the same plain index, so the schema
+matches the state everywhere; ``Order.save`` checks for duplicates instead.
+"""
+from django.db import migrations, models
+
+from apps.orders.partitions import is_partitioned
+
+
+def drop_unique(apps, schema_editor):
+    if is_partitioned('orders', schema_editor.connection.alias):
+        return
+    Order = apps.get_model('orders', 'Order')
+    old_field = Order._meta.get_field('order_number')
+    new_field = models.CharField(max_length=100, db_index=True, editable=False)
+    new_field.set_attributes_from_name('order_number')
+    new_field.model = Order
+    schema_editor.alter_field(Order, old_field, new_field)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0005_order_item_partition_key'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunPython(drop_unique, elidable=False),
+            ],
+            state_operations=[
+                migrations.AlterField(
+                    model_name='order',
+                    name='order_number',
+                    field=models.CharField(db_index=True, editable=False, max_length=100),
+                ),
+            ],
+        ),
+    ]
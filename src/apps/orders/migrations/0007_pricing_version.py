@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:59
+
+from django.db import migrations, models
+
+
+def create_version(apps, schema_editor):
+    apps.get_model('orders', 'PricingVersion').objects.get_or_create(pk=1)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0006_order_number_not_unique'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PricingVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Pricing Version',
+                'verbose_name_plural': 'Pricing Version',
+                'db_table': 'pricing_version',
+            },
+        ),
+        migrations.RunPython(create_version, migrations.RunPython.noop),
+    ]
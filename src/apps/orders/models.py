@@ -1,8 +1,13 @@
-from django.db import models
+from django.db import IntegrityError, models
 from django.conf import settings
-from django.core.validators import MinValueValidator
+from django.core.validators import MaxValueValidator, MinValueValidator
 from apps.products.models import Product
-import uuid
+from apps.core import events, snowflake
+
+
+def generate_order_number():
+    """Return a new time-ordered order number, e.g. ``ORD-0A923Z1AW0000``."""
+    return f"ORD-{snowflake.encode_base32(snowflake.next_id())}"
 
 
 class Order(models.Model):
@@ -16,7 +21,9 @@ class Order(models.Model):
         ('cancelled', 'Cancelled'),
     ]
     
-    order_number = models.CharField(max_length=100, unique=True, editable=False)
+    # Not unique in the database, which can't enforce it on partitioned orders
+    # (see partitions.py): save() checks for duplicates instead
+    order_number = models.CharField(max_length=100, db_index=True, editable=False)
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='orders')
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
     
@@ -44,21 +51,42 @@ class Order(models.Model):
         verbose_name = 'Order'
         verbose_name_plural = 'Orders'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', '-created_at'], name='orders_user_created_idx'),
+        ]
     
     def __str__(self):
         return f"Order {self.order_number}"
     
     def save(self, *args, **kwargs):
-        """Generate order number if not exists."""
-        if not self.order_number:
-            self.order_number = f"ORD-{uuid.uuid4().hex[:8].upper()}"
+        """Generate order number if not exists, and refuse duplicate order numbers."""
+        generated = not self.order_number
+        if generated:
+            self.order_number = generate_order_number()
+        if self._state.adding:
+            while Order.objects.filter(order_number=self.order_number).exists():
+                if not generated:
+                    raise IntegrityError(f"Order number {self.order_number} already exists.")
+                self.order_number = generate_order_number()
         super().save(*args, **kwargs)
+    
+    def update_status(self, status):
+        """Change the order status and publish an ``order.status_changed`` event."""
+        old_status = self.status
+        self.status = status
+        self.save()
+        events.publish(
+            events.ORDER_STATUS_CHANGED, self,
+            old_status=old_status,
+            new_status=status,
+        )
 
 
 class OrderItem(models.Model):
     """Order item model."""
     
-    order = models.ForeignKey(Order, on_delete=models.CASCADE, related_name='items')
+    # No database constraint: orders is partitioned (see partitions.py)
+    order = models.ForeignKey(Order, on_delete=models.CASCADE, related_name='items', db_constraint=False)
     product = models.ForeignKey(Product, on_delete=models.PROTECT)
     product_name = models.CharField(max_length=200)
     product_price = models.DecimalField(max_digits=10, decimal_places=2)
@@ -66,6 +94,8 @@ class OrderItem(models.Model):
     subtotal = models.DecimalField(max_digits=10, decimal_places=2)
     
     created_at = models.DateTimeField(auto_now_add=True)
+    # Partition key (see partitions.py): items are stored and archived with their order's month
+    order_created_at = models.DateTimeField(editable=False)
     
     class Meta:
         db_table = 'order_items'
@@ -76,6 +106,116 @@ class OrderItem(models.Model):
         return f"{self.quantity}x {self.product_name} (Order: {self.order.order_number})"
     
     def save(self, *args, **kwargs):
-        """Calculate subtotal before saving."""
+        """Calculate subtotal and copy the order's creation time before saving."""
         self.subtotal = self.product_price * self.quantity
-        super().save(*args, **kwargs)
\ No newline at end of file
+        if self.order_created_at is None:
+            self.order_created_at = self.order.created_at
+        super().save(*args, **kwargs)
+
+
+class OrderArchive(models.Model):
+    """
+    A month of orders moved out of the database into a compressed file.
+    
+    The file holds one ``OrderSerializer`` representation per line, so
+    archived orders can still be shown (see ``archive.find_archived_order``).
+    """
+    
+    month = models.DateField(unique=True)
+    file_name = models.CharField(max_length=255)
+    order_count = models.PositiveIntegerField(default=0)
+    item_count = models.PositiveIntegerField(default=0)
+    min_order_id = models.BigIntegerField(null=True, blank=True)
+    max_order_id = models.BigIntegerField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'order_archives'
+        verbose_name = 'Order Archive'
+        verbose_name_plural = 'Order Archives'
+        ordering = ['-month']
+        indexes = [
+            models.Index(fields=['min_order_id', 'max_order_id'], name='order_archives_id_range_idx'),
+        ]
+    
+    def __str__(self):
+        return f"Orders of {self.month:%Y-%m} ({self.order_count})"
+
+
+class TaxRule(models.Model):
+    """Sales tax rate of a shipping country, or of one of its states."""
+    
+    country = models.CharField(max_length=100)
+    state = models.CharField(max_length=100, blank=True, help_text='Leave blank to apply to the whole country.')
+    rate = models.DecimalField(
+        max_digits=6, decimal_places=3,
+        validators=[MinValueValidator(0), MaxValueValidator(100)],
+        help_text='Percent of the order subtotal, e.g. 8.875.'
+    )
+    applies_to_shipping = models.BooleanField(default=False, help_text='Also tax the shipping cost.')
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'tax_rules'
+        verbose_name = 'Tax Rule'
+        verbose_name_plural = 'Tax Rules'
+        ordering = ['country', 'state']
+        constraints = [
+            models.UniqueConstraint(fields=['country', 'state'], name='tax_rules_country_state_uniq'),
+        ]
+    
+    def __str__(self):
+        region = f"{self.country} / {self.state}" if self.state else self.country
+        return f"{region}: {self.rate}%"
+
+
+class ShippingZone(models.Model):
+    """Shipping cost to the zip codes of a country starting with a prefix."""
+    
+    name = models.CharField(max_length=100)
+    country = models.CharField(max_length=100)
+    zip_prefix = models.CharField(
+        max_length=20, blank=True,
+        help_text='Leave blank to cover the whole country; the longest matching prefix wins.'
+    )
+    cost = models.DecimalField(max_digits=10, decimal_places=2, validators=[MinValueValidator(0)])
+    free_over = models.DecimalField(
+        max_digits=10, decimal_places=2, null=True, blank=True, validators=[MinValueValidator(0)],
+        help_text='Order subtotal from which shipping is free.'
+    )
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'shipping_zones'
+        verbose_name = 'Shipping Zone'
+        verbose_name_plural = 'Shipping Zones'
+        ordering = ['country', 'zip_prefix']
+        constraints = [
+            models.UniqueConstraint(fields=['country', 'zip_prefix'], name='shipping_zones_country_prefix_uniq'),
+        ]
+    
+    def __str__(self):
+        return f"{self.name} ({self.country} {self.zip_prefix or '*'})"
+
+
+class PricingVersion(models.Model):
+    """
+    Version of the tax rules and shipping zones, a single row.
+    
+    Bumped in the transaction of every rule change, so each process can tell
+    when its pricing index is stale (see ``pricing.py``).
+    """
+    
+    version = models.BigIntegerField(default=0)
+    
+    class Meta:
+        db_table = 'pricing_version'
+        verbose_name = 'Pricing Version'
+        verbose_name_plural = 'Pricing Version'
+    
+    def __str__(self):
+        return f"Pricing rules v{self.version}"
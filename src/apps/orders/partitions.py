@@ -0,0 +1,207 @@
+"""
+Monthly range partitions of ``orders`` and ``order_items`` (PostgreSQL).
+
+Migrations 0003 and 0005 turn both tables into tables partitioned by the
+month of their order's creation (``orders_p2025_01``,
+``order_items_p2025_01``, ...), so indexes and vacuum work stay proportional
+to the months kept in the database. Items are partitioned on
+``order_created_at``, a copy of their order's ``created_at``, so a month's
+items always sit in the same month as their order and are archived with it.
+Partitioned tables only allow primary keys and unique constraints that
+include the partition key, so:
+
+- the primary keys are ``(id, <partition key>)``;
+- ``order_number`` is indexed but not unique in the database (Snowflake
+  order numbers are unique by construction, and ``Order.save`` refuses
+  duplicates);
+- foreign keys to ``orders`` have no database constraint.
+
+Rows can only be inserted into existing partitions: the
+``create_order_partitions`` job keeps the partitions of the next
+``ORDER_PARTITION_MONTHS_AHEAD`` months ready. Months older than
+``ORDER_HOT_MONTHS`` are moved to compressed files by the ``archive_orders``
+command (see ``archive.py``), which then drops their partitions.
+
+Month boundaries are in UTC. On other databases the tables stay plain and
+these functions do nothing.
+"""
+import re
+from datetime import date, datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils import timezone
+
+PARTITIONED_TABLES = ('orders', 'order_items')
+
+
+def month_start(value):
+    """Return the first day of the month of a date or datetime."""
+    return date(value.year, value.month, 1)
+
+
+def add_months(month, count):
+    """Return the first day of the month ``count`` months after ``month``."""
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def month_bounds(month):
+    """Return the UTC datetimes starting and ending a month."""
+    start = datetime(month.year, month.month, 1, tzinfo=dt_timezone.utc)
+    end = add_months(month, 1)
+    return start, datetime(end.year, end.month, 1, tzinfo=dt_timezone.utc)
+
+
+def partition_name(table, month):
+    return f'{table}_p{month:%Y_%m}'
+
+
+def is_partitioned(table='orders', using=DEFAULT_DB_ALIAS):
+    """Return whether ``table`` is a partitioned PostgreSQL table."""
+    connection = connections[using]
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s)', [table])
+        return cursor.fetchone() is not None
+
+
+def create_partition(cursor, table, month):
+    """Create the partition of ``table`` holding ``month``, unless it exists."""
+    quote_name = cursor.db.ops.quote_name
+    start, end = month_bounds(month)
+    cursor.execute(
+        f'CREATE TABLE IF NOT EXISTS {quote_name(partition_name(table, month))} '
+        f'PARTITION OF {quote_name(table)} FOR VALUES FROM (%s) TO (%s)',
+        [start.isoformat(), end.isoformat()]
+    )
+
+
+def partition_months(table='orders', using=DEFAULT_DB_ALIAS):
+    """Return the months that have a partition of ``table``, oldest first."""
+    if not is_partitioned(table, using):
+        return []
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            'SELECT child.relname FROM pg_inherits '
+            'JOIN pg_class child ON child.oid = pg_inherits.inhrelid '
+            'WHERE pg_inherits.inhparent = to_regclass(%s)',
+            [table]
+        )
+        names = [row[0] for row in cursor.fetchall()]
+    
+    prefix = f'{table}_p'
+    months = []
+    for name in names:
+        try:
+            months.append(datetime.strptime(name[len(prefix):], '%Y_%m').date())
+        except ValueError:
+            continue
+    return sorted(months)
+
+
+def ensure_partitions(months_ahead=None, using=DEFAULT_DB_ALIAS):
+    """
+    Create the partitions of the current month and the next ``months_ahead``.
+    
+    Returns the names of the partitions that didn't exist yet.
+    """
+    if not is_partitioned(using=using):
+        return []
+    if months_ahead is None:
+        months_ahead = settings.ORDER_PARTITION_MONTHS_AHEAD
+    
+    current = month_start(timezone.now())
+    months = [add_months(current, offset) for offset in range(months_ahead + 1)]
+    created = []
+    with connections[using].cursor() as cursor:
+        for table in PARTITIONED_TABLES:
+            existing = set(partition_months(table, using))
+            for month in months:
+                if month not in existing:
+                    create_partition(cursor, table, month)
+                    created.append(partition_name(table, month))
+    return created
+
+
+def drop_partitions(month, using=DEFAULT_DB_ALIAS):
+    """Detach and drop the partitions of ``month`` of every partitioned table."""
+    connection = connections[using]
+    quote_name = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        for table in PARTITIONED_TABLES:
+            name = partition_name(table, month)
+            if month not in partition_months(table, using):
+                continue
+            cursor.execute(f'ALTER TABLE {quote_name(table)} DETACH PARTITION {quote_name(name)}')
+            cursor.execute(f'DROP TABLE {quote_name(name)}')
+
+
+def partition_table(schema_editor, table, key):
+    """
+    Recreate ``table`` as a table partitioned by the month of ``key``, keeping its rows.
+    
+    The new table gets the same columns, check constraints, indexes (unique
+    ones become plain indexes) and outgoing foreign keys, and a
+    ``(id, key)`` primary key. ``table`` may already be partitioned (on
+    another key). The copy runs in the caller's transaction.
+    """
+    quote_name = schema_editor.quote_name
+    old = f'{table}_unpartitioned'
+    sequence = f'{table}_id_partitioned_seq'
+    
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(f'ALTER TABLE {quote_name(table)} RENAME TO {quote_name(old)}')
+        # Free the partition names of an already partitioned table
+        cursor.execute(
+            'SELECT child.relname FROM pg_inherits JOIN pg_class child ON child.oid = pg_inherits.inhrelid '
+            'WHERE pg_inherits.inhparent = %s::regclass',
+            [old]
+        )
+        for (child,) in cursor.fetchall():
+            cursor.execute(f'ALTER TABLE {quote_name(child)} RENAME TO {quote_name(f"{child}_old")}')
+        
+        cursor.execute(
+            "SELECT indexdef FROM pg_indexes WHERE schemaname = current_schema() AND tablename = %s "
+            "AND indexname NOT IN (SELECT conname FROM pg_constraint WHERE conrelid = %s::regclass AND contype = 'p')",
+            [old, old]
+        )
+        indexes = [
+            re.sub(r' ON (ONLY )?\S+ USING ', f' ON {quote_name(table)} USING ', row[0].replace('CREATE UNIQUE INDEX', 'CREATE INDEX'), count=1)
+            for row in cursor.fetchall()
+        ]
+        cursor.execute(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint WHERE conrelid = %s::regclass AND contype = 'f'",
+            [old]
+        )
+        foreign_keys = cursor.fetchall()
+        cursor.execute(f'SELECT min({quote_name(key)}), max(id) FROM {quote_name(old)}')
+        first, max_id = cursor.fetchone()
+        
+        cursor.execute(
+            f'CREATE TABLE {quote_name(table)} (LIKE {quote_name(old)} INCLUDING DEFAULTS INCLUDING CONSTRAINTS) '
+            f'PARTITION BY RANGE ({quote_name(key)})'
+        )
+        # Identity columns aren't supported on partitioned tables before PostgreSQL 17
+        cursor.execute(f'CREATE SEQUENCE {quote_name(sequence)}')
+        cursor.execute('SELECT setval(%s, %s, false)', [sequence, (max_id or 0) + 1])
+        cursor.execute(f"ALTER TABLE {quote_name(table)} ALTER COLUMN id SET DEFAULT nextval('{sequence}')")
+        
+        month = month_start(first or timezone.now())
+        last = add_months(month_start(timezone.now()), settings.ORDER_PARTITION_MONTHS_AHEAD)
+        while month <= last:
+            create_partition(cursor, table, month)
+            month = add_months(month, 1)
+        
+        cursor.execute(f'INSERT INTO {quote_name(table)} SELECT * FROM {quote_name(old)}')
+        cursor.execute(f'DROP TABLE {quote_name(old)}')
+        
+        # Constraint and index names are free again now
+        cursor.execute(f'ALTER TABLE {quote_name(table)} ADD PRIMARY KEY (id, {quote_name(key)})')
+        for index in indexes:
+            cursor.execute(index)
+        for name, definition in foreign_keys:
+            cursor.execute(f'ALTER TABLE {quote_name(table)} ADD CONSTRAINT {quote_name(name)} {definition}')
+        cursor.execute(f'ALTER SEQUENCE {quote_name(sequence)} RENAME TO {quote_name(f"{table}_id_seq")}')
+        cursor.execute(f'ALTER SEQUENCE {quote_name(f"{table}_id_seq")} OWNED BY {quote_name(table)}.id')
@@ -0,0 +1,190 @@
+"""
+Order pricing: subtotal, shipping and tax.
+
+Tax rules (by shipping country and state) and shipping zones (by shipping
+country and zip code prefix) are loaded into an immutable ``PricingIndex``
+the first time an order is priced. Tax rates are found with one dict lookup
+and shipping zones by walking the zip code down a trie, so pricing costs the
+same however many rules are configured. Destinations without a rule use
+``ORDER_DEFAULT_TAX_RATE`` and ``ORDER_DEFAULT_SHIPPING_COST``.
+
+Saving or deleting a rule bumps ``PricingVersion`` in the same transaction
+(see ``signals.py``); each process reads the version (one primary key
+lookup) before pricing and rebuilds its index when it sees a new one.
+
+Amounts are computed in integer cents; tax is rounded half up once per
+order.
+"""
+import threading
+from collections import namedtuple
+from decimal import ROUND_HALF_UP, Decimal
+
+from django.conf import settings
+from django.db.models import F
+
+from .models import PricingVersion, ShippingZone, TaxRule
+
+# Tax rates are kept in thousandths of a percent
+RATE_SCALE = 100 * 1000
+
+
+def to_cents(amount):
+    return int((Decimal(amount) * 100).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+def from_cents(cents):
+    return Decimal(cents).scaleb(-2)
+
+
+def _region(value):
+    return ' '.join(str(value or '').upper().split())
+
+
+def _zip_code(value):
+    return ''.join(char for char in str(value or '').upper() if char.isalnum())
+
+
+def destination_key(country, state, zip_code):
+    """Return the part of a shipping destination that pricing depends on, normalized."""
+    return f'{_region(country)}|{_region(state)}|{_zip_code(zip_code)}'
+
+
+TaxRate = namedtuple('TaxRate', 'rule_id rate applies_to_shipping', defaults=(False,))
+ShippingRate = namedtuple('ShippingRate', 'zone_id cost free_over', defaults=(None,))
+
+
+class ZipTrie:
+    """Longest-prefix lookup of zip codes; not changed after it is built."""
+    
+    __slots__ = ('_root',)
+    
+    def __init__(self, items):
+        root = {}
+        for prefix, value in items:
+            node = root
+            for char in prefix:
+                node = node.setdefault(char, {})
+            # Characters of zip codes are never None, so the value shares the node dict
+            node[None] = value
+        self._root = root
+    
+    def lookup(self, zip_code):
+        node = self._root
+        found = node.get(None)
+        for char in zip_code:
+            node = node.get(char)
+            if node is None:
+                break
+            found = node.get(None, found)
+        return found
+
+
+class PricingIndex:
+    """Tax rates and shipping zones of one version of the rules."""
+    
+    def __init__(self, version, tax_rates, shipping_zones):
+        self.version = version
+        self._tax_rates = tax_rates
+        self._shipping_zones = shipping_zones
+        self._default_tax = TaxRate(None, int(Decimal(settings.ORDER_DEFAULT_TAX_RATE) * 1000))
+        self._default_shipping = ShippingRate(None, to_cents(settings.ORDER_DEFAULT_SHIPPING_COST))
+    
+    @classmethod
+    def load(cls, version=None):
+        tax_rates = {
+            (_region(rule.country), _region(rule.state)): TaxRate(
+                rule.pk, int(rule.rate * 1000), rule.applies_to_shipping
+            )
+            for rule in TaxRule.objects.filter(is_active=True)
+        }
+        
+        zones = {}
+        for zone in ShippingZone.objects.filter(is_active=True):
+            rate = ShippingRate(
+                zone.pk, to_cents(zone.cost), None if zone.free_over is None else to_cents(zone.free_over)
+            )
+            zones.setdefault(_region(zone.country), []).append((_zip_code(zone.zip_prefix), rate))
+        shipping_zones = {country: ZipTrie(items) for country, items in zones.items()}
+        
+        return cls(version, tax_rates, shipping_zones)
+    
+    def tax_rate(self, country, state):
+        country, state = _region(country), _region(state)
+        return (
+            self._tax_rates.get((country, state))
+            or self._tax_rates.get((country, ''))
+            or self._default_tax
+        )
+    
+    def shipping_rate(self, country, zip_code):
+        zones = self._shipping_zones.get(_region(country))
+        rate = zones.lookup(_zip_code(zip_code)) if zones else None
+        return rate or self._default_shipping
+
+
+class Pricing(namedtuple('Pricing', 'subtotal shipping tax tax_rate shipping_rate')):
+    """Totals of an order, in cents, and the rates they come from."""
+    
+    __slots__ = ()
+    
+    @property
+    def total(self):
+        return self.subtotal + self.shipping + self.tax
+    
+    def amounts(self):
+        """Return the totals as ``Order`` field values."""
+        return {
+            'subtotal': from_cents(self.subtotal),
+            'shipping_cost': from_cents(self.shipping),
+            'tax': from_cents(self.tax),
+            'total': from_cents(self.total),
+        }
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_pricing_version():
+    """Return the current version of the pricing rules."""
+    return PricingVersion.objects.filter(pk=1).values_list('version', flat=True).first() or 0
+
+
+def get_index():
+    """Return the index of the current rules, rebuilding it after they changed."""
+    global _index
+    version = get_pricing_version()
+    index = _index
+    if index is None or index.version != version:
+        with _index_lock:
+            if _index is None or _index.version != version:
+                _index = PricingIndex.load(version)
+            index = _index
+    return index
+
+
+def bump_pricing_version():
+    """Make every process reload the rules on its next pricing, once the current transaction commits."""
+    if not PricingVersion.objects.filter(pk=1).update(version=F('version') + 1):
+        PricingVersion.objects.get_or_create(pk=1, defaults={'version': 1})
+
+
+def price_order(lines, country, state, zip_code, index=None):
+    """
+    Price order lines (``(unit_price, quantity)`` pairs) shipped to a destination.
+    
+    Returns a ``Pricing``.
+    """
+    index = index or get_index()
+    subtotal = sum(to_cents(price) * quantity for price, quantity in lines)
+    
+    shipping_rate = index.shipping_rate(country, zip_code)
+    shipping = shipping_rate.cost
+    if shipping_rate.free_over is not None and subtotal >= shipping_rate.free_over:
+        shipping = 0
+    
+    tax_rate = index.tax_rate(country, state)
+    taxable = subtotal + shipping if tax_rate.applies_to_shipping else subtotal
+    tax = (taxable * tax_rate.rate + RATE_SCALE // 2) // RATE_SCALE
+    
+    return Pricing(subtotal, shipping, tax, tax_rate, shipping_rate)
@@ -0,0 +1,94 @@
+"""
+Checkout quotes.
+
+``OrderQuoteView`` prices the user's cart for a shipping destination
+without writing anything and returns the totals with a signed ``quote``
+token. ``OrderCreateView`` reuses the quoted totals instead of pricing the
+cart again when it gets a token for the same user, cart version,
+destination and pricing rules, younger than ``ORDER_QUOTE_TTL_SECONDS``;
+otherwise it prices the cart as usual.
+
+The cart version is a digest of the cart's products, quantities and unit
+prices, so changing the cart or a price makes older quotes stale. Quotes
+are cached per user, cart version, destination and rules version for half
+their lifetime, so a cached token always has at least half of it left.
+"""
+import hashlib
+from datetime import timedelta
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from django.utils import timezone
+
+from .pricing import Pricing, ShippingRate, TaxRate, destination_key, get_index, price_order, to_cents
+
+QUOTE_SALT = 'apps.orders.quotes'
+QUOTE_CACHE_KEY = 'orders:quote:{}:{}'
+
+
+def cart_lines(items):
+    """Return ``(product_id, unit_price, quantity)`` of cart items, in product order."""
+    return sorted((item.product_id, item.product.price, item.quantity) for item in items)
+
+
+def cart_version(lines):
+    digest = hashlib.sha256(
+        ';'.join(f'{product_id}:{to_cents(price)}:{quantity}' for product_id, price, quantity in lines).encode()
+    )
+    return digest.hexdigest()[:32]
+
+
+def _price(lines, country, state, zip_code, index):
+    return price_order([(price, quantity) for product_id, price, quantity in lines], country, state, zip_code, index)
+
+
+def quote(user, lines, country, state, zip_code):
+    """Return the totals of ``lines`` shipped to a destination, with a signed token."""
+    index = get_index()
+    version = cart_version(lines)
+    destination = destination_key(country, state, zip_code)
+    key = QUOTE_CACHE_KEY.format(
+        user.pk, hashlib.sha256(f'{version}:{destination}:{index.version}'.encode()).hexdigest()
+    )
+    data = cache.get(key)
+    if data is not None:
+        return data
+    
+    pricing = _price(lines, country, state, zip_code, index)
+    token = signing.dumps(
+        {'u': user.pk, 'c': version, 'd': destination, 'v': index.version, 'p': pricing},
+        salt=QUOTE_SALT, compress=True
+    )
+    data = {
+        **pricing.amounts(),
+        'quote': token,
+        'expires_at': timezone.now() + timedelta(seconds=settings.ORDER_QUOTE_TTL_SECONDS),
+    }
+    cache.set(key, data, settings.ORDER_QUOTE_TTL_SECONDS // 2)
+    return data
+
+
+def _quoted_pricing(token, user, lines, destination, index):
+    try:
+        payload = signing.loads(token, salt=QUOTE_SALT, max_age=settings.ORDER_QUOTE_TTL_SECONDS)
+    except signing.BadSignature:
+        return None
+    if (payload['u'], payload['c'], payload['d'], payload['v']) != (user.pk, cart_version(lines), destination, index.version):
+        return None
+    subtotal, shipping, tax, tax_rate, shipping_rate = payload['p']
+    return Pricing(subtotal, shipping, tax, TaxRate(*tax_rate), ShippingRate(*shipping_rate))
+
+
+def price_checkout(user, lines, country, state, zip_code, token=None):
+    """
+    Price a checkout, from its quote when ``token`` is still valid for it.
+    
+    Returns a ``Pricing``.
+    """
+    index = get_index()
+    if token:
+        pricing = _quoted_pricing(token, user, lines, destination_key(country, state, zip_code), index)
+        if pricing is not None:
+            return pricing
+    return _price(lines, country, state, zip_code, index)
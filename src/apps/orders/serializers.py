@@ -1,5 +1,7 @@
+from django.db.models import Count
 from rest_framework import serializers
 from .models import Order, OrderItem
+from apps.core.serializers import CompiledSerializerMixin, SparseFieldsetMixin
 
 
 class OrderItemSerializer(serializers.ModelSerializer):
@@ -11,7 +13,7 @@ class OrderItemSerializer(serializers.ModelSerializer):
         read_only_fields = ('id', 'product_name', 'product_price', 'subtotal')
 
 
-class OrderSerializer(serializers.ModelSerializer):
+class OrderSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for orders."""
     
     items = OrderItemSerializer(many=True, read_only=True)
@@ -32,11 +34,13 @@ class OrderSerializer(serializers.ModelSerializer):
 class OrderCreateSerializer(serializers.ModelSerializer):
     """Serializer for creating orders."""
     
+    quote = serializers.CharField(required=False, write_only=True, help_text='Token from the quote endpoint.')
+    
     class Meta:
         model = Order
         fields = (
             'shipping_address', 'shipping_city', 'shipping_state',
-            'shipping_zip_code', 'shipping_country', 'phone_number', 'notes'
+            'shipping_zip_code', 'shipping_country', 'phone_number', 'notes', 'quote'
         )
     
     def validate(self, attrs):
@@ -50,7 +54,15 @@ class OrderCreateSerializer(serializers.ModelSerializer):
         return attrs
 
 
-class OrderListSerializer(serializers.ModelSerializer):
+class OrderQuoteSerializer(serializers.ModelSerializer):
+    """Shipping destination of a checkout quote."""
+    
+    class Meta:
+        model = Order
+        fields = ('shipping_state', 'shipping_zip_code', 'shipping_country')
+
+
+class OrderListSerializer(CompiledSerializerMixin, serializers.ModelSerializer):
     """Lightweight serializer for order list."""
     
     item_count = serializers.SerializerMethodField()
@@ -58,6 +70,10 @@ class OrderListSerializer(serializers.ModelSerializer):
     class Meta:
         model = Order
         fields = ('id', 'order_number', 'status', 'total', 'item_count', 'created_at')
+        compiled_annotations = {'compiled_item_count': Count('items')}
+        compiled_sources = {
+            'item_count': (('compiled_item_count',), lambda count: count),
+        }
     
     def get_item_count(self, obj):
         """Return total number of items in order."""
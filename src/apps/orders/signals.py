@@ -0,0 +1,13 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import ShippingZone, TaxRule
+from .pricing import bump_pricing_version
+
+
+@receiver(post_save, sender=TaxRule)
+@receiver(post_delete, sender=TaxRule)
+@receiver(post_save, sender=ShippingZone)
+@receiver(post_delete, sender=ShippingZone)
+def invalidate_pricing_index(sender, **kwargs):
+    """Bump the pricing version in the transaction of the change."""
+    bump_pricing_version()
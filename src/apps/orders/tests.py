@@ -1,3 +1,343 @@
-from django.test import TestCase
+import gzip
+import json
+import tempfile
+import threading
+from datetime import date, datetime, timezone as dt_timezone
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.db import IntegrityError
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework.test import APIClient
+
+from apps.core import snowflake
+from apps.cart.models import Cart, CartItem
+from apps.core.snowflake import SnowflakeGenerator
+from apps.payments.models import Payment, Refund
+from apps.products.models import Category, Product, StockMovement
+from . import archive, quotes
+from .models import Order, OrderArchive, OrderItem, TaxRule, generate_order_number
+from .pricing import PricingIndex, ShippingRate, TaxRate, ZipTrie, get_index, price_order
+
+
+@override_settings(SNOWFLAKE_NODE_ID=7)
+class SnowflakeGeneratorTests(SimpleTestCase):
+    """Order numbers are unique and sort by creation time."""
+    
+    def test_ids_increase(self):
+        generator = SnowflakeGenerator()
+        ids = [generator.next_id() for _ in range(20000)]
+        self.assertEqual(ids, sorted(set(ids)))
+    
+    def test_layout(self):
+        generator = SnowflakeGenerator()
+        with mock.patch.object(snowflake, '_now_ms', return_value=snowflake.EPOCH_MS + 1234):
+            first, second = generator.next_id(), generator.next_id()
+        self.assertEqual(snowflake.id_timestamp_ms(first), snowflake.EPOCH_MS + 1234)
+        self.assertEqual((first >> snowflake.SEQUENCE_BITS) & snowflake.MAX_NODE_ID, 7)
+        self.assertEqual(second - first, 1)
+    
+    def test_clock_going_back_keeps_order(self):
+        generator = SnowflakeGenerator()
+        with mock.patch.object(snowflake, '_now_ms', return_value=snowflake.EPOCH_MS + 5000):
+            first = generator.next_id()
+        with mock.patch.object(snowflake, '_now_ms', return_value=snowflake.EPOCH_MS + 4000):
+            second = generator.next_id()
+        self.assertGreater(second, first)
+    
+    def test_unique_across_threads(self):
+        generator = SnowflakeGenerator()
+        results = [[] for _ in range(8)]
+        
+        def generate(out):
+            out.extend(generator.next_id() for _ in range(5000))
+        
+        threads = [threading.Thread(target=generate, args=(out,)) for out in results]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        ids = [value for out in results for value in out]
+        self.assertEqual(len(set(ids)), len(ids))
+    
+    def test_order_numbers_sort_like_ids(self):
+        numbers = [generate_order_number() for _ in range(1000)]
+        self.assertEqual(numbers, sorted(numbers))
+        self.assertTrue(all(len(number) == 17 for number in numbers))
+    
+    @override_settings(SNOWFLAKE_NODE_ID=1024)
+    def test_invalid_node_id(self):
+        with self.assertRaises(ImproperlyConfigured):
+            SnowflakeGenerator().next_id()
+
+
+ADDRESS = {
+    'shipping_address': '1 Main Street',
+    'shipping_city': 'Springfield',
+    'shipping_state': 'IL',
+    'shipping_zip_code': '62701',
+    'shipping_country': 'US',
+    'phone_number': '+15555550100',
+}
+
+
+@override_settings(SNOWFLAKE_NODE_ID=7)
+class OrderNumberTests(TestCase):
+    """Order.save keeps order numbers unique without a database constraint."""
+    
+    def setUp(self):
+        self.user = get_user_model().objects.create_user('buyer@example.com', None)
+    
+    def test_duplicate_generated_number_is_replaced(self):
+        first = Order.objects.create(user=self.user, subtotal=0, total=0, **ADDRESS)
+        with mock.patch('apps.orders.models.generate_order_number', side_effect=[first.order_number, 'ORD-NEXT']):
+            second = Order.objects.create(user=self.user, subtotal=0, total=0, **ADDRESS)
+        self.assertEqual(second.order_number, 'ORD-NEXT')
+    
+    def test_duplicate_given_number_is_refused(self):
+        first = Order.objects.create(user=self.user, subtotal=0, total=0, **ADDRESS)
+        with self.assertRaises(IntegrityError):
+            Order.objects.create(user=self.user, order_number=first.order_number, subtotal=0, total=0, **ADDRESS)
+        
+        # Saving an existing order doesn't count itself as a duplicate
+        first.status = 'processing'
+        first.save()
+
+
+@override_settings(SNOWFLAKE_NODE_ID=7)
+class CancelOrderTests(TestCase):
+    """Cancelling an order gives its stock back once."""
+    
+    def setUp(self):
+        self.user = get_user_model().objects.create_user('buyer@example.com', None, is_verified=True)
+        category = Category.objects.create(name='Books')
+        self.product = Product.objects.create(name='Book', description='', price=10, stock=3, category=category, created_by=self.user)
+        self.order = Order.objects.create(user=self.user, subtotal=20, total=20, **ADDRESS)
+        OrderItem.objects.create(order=self.order, product=self.product, product_name='Book', product_price=10, quantity=2)
+        
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.addCleanup(cache.clear)
+    
+    def cancel(self):
+        return self.client.post(f'/api/v1/orders/{self.order.pk}/cancel/')
+    
+    def test_cancel(self):
+        self.assertEqual(self.cancel().status_code, 200)
+        self.assertEqual(self.cancel().status_code, 400)
+        
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.stock, 5)
+        movement = StockMovement.objects.get()
+        self.assertEqual((movement.quantity, movement.reason, movement.order_id), (2, 'cancellation', self.order.pk))
+    
+    def test_other_users_orders(self):
+        other = get_user_model().objects.create_user('other@example.com', None, is_verified=True)
+        self.client.force_authenticate(other)
+        
+        self.assertEqual(self.cancel().status_code, 404)
+        self.assertEqual(Order.objects.get(pk=self.order.pk).status, 'pending')
+
+
+@override_settings(SNOWFLAKE_NODE_ID=7)
+class ArchiveTests(TestCase):
+    """Old months are written to a file and read back; payments stay in the database."""
+    
+    def setUp(self):
+        self.user = get_user_model().objects.create_user('buyer@example.com', None)
+        category = Category.objects.create(name='Books')
+        product = Product.objects.create(name='Book', description='', price=10, stock=5, category=category, created_by=self.user)
+        
+        self.order = Order.objects.create(user=self.user, subtotal=20, total=20, **ADDRESS)
+        created_at = datetime(2020, 1, 31, 23, 59, tzinfo=dt_timezone.utc)
+        Order.objects.filter(pk=self.order.pk).update(created_at=created_at)
+        self.order.refresh_from_db()
+        OrderItem.objects.create(order=self.order, product=product, product_name='Book', product_price=10, quantity=2)
+        
+        self.payment = Payment.objects.create(
+            order=self.order, user=self.user, payment_method='stripe', status='completed', amount=20,
+            stripe_payment_intent_id='pi_1',
+        )
+        Refund.objects.create(payment=self.payment, amount=5, reason='Damaged', status='completed')
+        
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        patcher = mock.patch.object(archive, 'archive_storage', FileSystemStorage(location=directory.name))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(cache.clear)
+    
+    def test_archive_month(self):
+        record = archive.archive_month(date(2020, 1, 1))
+        
+        self.assertEqual((record.order_count, record.item_count), (1, 1))
+        self.assertEqual((record.min_order_id, record.max_order_id), (self.order.pk, self.order.pk))
+        
+        # The payment and its refund are kept, detached from the archived order
+        payment = Payment.objects.get(pk=self.payment.pk)
+        self.assertIsNone(payment.order_id)
+        self.assertEqual(payment.refunds.count(), 1)
+        
+        data = archive.find_archived_order(self.order.pk)
+        self.assertEqual(data['order_number'], self.order.order_number)
+        self.assertEqual(len(data['items']), 1)
+        self.assertIsNone(archive.find_archived_order(self.order.pk + 1))
+    
+    def test_other_months_are_left_alone(self):
+        record = archive.archive_month(date(2020, 2, 1))
+        
+        self.assertEqual(record.order_count, 0)
+        self.assertEqual(Payment.objects.get(pk=self.payment.pk).order_id, self.order.pk)
+    
+    def test_read_archive_without_id_prefix(self):
+        # Archives written before the id prefix hold one bare order per line
+        content = gzip.compress(json.dumps({'id': 41, 'order_number': 'ORD-OLD'}).encode() + b'\n')
+        name = archive.archive_storage.save('orders-2019-12.jsonl.gz', ContentFile(content))
+        OrderArchive.objects.create(month=date(2019, 12, 1), file_name=name, min_order_id=41, max_order_id=41)
+        
+        self.assertEqual(archive.find_archived_order(41)['order_number'], 'ORD-OLD')
+
+
+@override_settings(ORDER_DEFAULT_TAX_RATE='10', ORDER_DEFAULT_SHIPPING_COST='10.00')
+class PricingTests(SimpleTestCase):
+    """Orders are priced in cents from the most specific matching rules."""
+    
+    def setUp(self):
+        self.index = PricingIndex(
+            version=1,
+            tax_rates={
+                ('US', ''): TaxRate(1, 5000),
+                ('US', 'NY'): TaxRate(2, 8875, applies_to_shipping=True),
+            },
+            shipping_zones={
+                'US': ZipTrie([
+                    ('', ShippingRate(1, 999)),
+                    ('100', ShippingRate(2, 500, free_over=5000)),
+                    ('1001', ShippingRate(3, 300)),
+                ]),
+            },
+        )
+    
+    def test_longest_zip_prefix_wins(self):
+        self.assertEqual(self.index.shipping_rate('us', '10012').zone_id, 3)
+        self.assertEqual(self.index.shipping_rate('US', '10099').zone_id, 2)
+        self.assertEqual(self.index.shipping_rate('US', '94103').zone_id, 1)
+        self.assertIsNone(self.index.shipping_rate('FR', '75001').zone_id)
+    
+    def test_state_rule_overrides_country_rule(self):
+        self.assertEqual(self.index.tax_rate('US', 'ny').rule_id, 2)
+        self.assertEqual(self.index.tax_rate('US', 'TX').rule_id, 1)
+        self.assertIsNone(self.index.tax_rate('FR', '').rule_id)
+    
+    def test_totals_in_cents(self):
+        pricing = price_order([(Decimal('19.99'), 3), (Decimal('0.10'), 1)], 'US', 'NY', '10099', self.index)
+        # 60.07 is over the free shipping threshold; 8.875% of 60.07 is 5.331...
+        self.assertEqual((pricing.subtotal, pricing.shipping, pricing.tax, pricing.total), (6007, 0, 533, 6540))
+        self.assertEqual(pricing.amounts()['total'], Decimal('65.40'))
+        
+        pricing = price_order([(Decimal('33.33'), 1)], 'FR', '', '75001', self.index)
+        self.assertEqual(pricing.amounts(), {
+            'subtotal': Decimal('33.33'),
+            'shipping_cost': Decimal('10.00'),
+            'tax': Decimal('3.33'),
+            'total': Decimal('46.66'),
+        })
+
+
+class PricingVersionTests(TestCase):
+    """Rule changes bump the version in the database, so every process reloads its index."""
+    
+    def test_rule_changes_reload_the_index(self):
+        before = get_index()
+        self.assertIsNone(before.tax_rate('US', 'CA').rule_id)
+        self.assertIs(get_index(), before)
+        
+        rule = TaxRule.objects.create(country='US', state='CA', rate=Decimal('7.25'))
+        after = get_index()
+        self.assertGreater(after.version, before.version)
+        self.assertEqual(after.tax_rate('US', 'CA').rule_id, rule.pk)
+        
+        rule.delete()
+        self.assertIsNone(get_index().tax_rate('US', 'CA').rule_id)
+
+
+@override_settings(SNOWFLAKE_NODE_ID=7, ORDER_DEFAULT_TAX_RATE='10', ORDER_DEFAULT_SHIPPING_COST='5.00')
+class QuoteTests(TestCase):
+    """Checkout reuses the totals of a quote while its cart, destination and rules are unchanged."""
+    
+    def setUp(self):
+        self.user = get_user_model().objects.create_user('buyer@example.com', None, is_verified=True)
+        category = Category.objects.create(name='Books')
+        self.product = Product.objects.create(name='Book', description='', price=10, stock=5, category=category, created_by=self.user)
+        CartItem.objects.create(cart=Cart.objects.create(user=self.user), product=self.product, quantity=2)
+        
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.addCleanup(cache.clear)
+    
+    def quote(self):
+        response = self.client.get('/api/v1/orders/quote/', {
+            'shipping_country': 'US', 'shipping_state': 'IL', 'shipping_zip_code': '62701',
+        })
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+    
+    def create_order(self, token):
+        with mock.patch.object(quotes, 'price_order', wraps=quotes.price_order) as price_order:
+            response = self.client.post('/api/v1/orders/create/', {**ADDRESS, 'quote': token}, format='json')
+        self.assertEqual(response.status_code, 201)
+        return Order.objects.get(), price_order.called
+    
+    def test_quote_is_reused(self):
+        data = self.quote()
+        self.assertEqual((data['subtotal'], data['shipping_cost'], data['tax'], data['total']), ('20.00', '5.00', '2.00', '27.00'))
+        # Quotes are cached until the cart changes
+        self.assertEqual(self.quote()['quote'], data['quote'])
+        
+        order, priced = self.create_order(data['quote'])
+        self.assertFalse(priced)
+        self.assertEqual(order.total, Decimal('27.00'))
+    
+    def test_price_change_makes_the_quote_stale(self):
+        token = self.quote()['quote']
+        Product.objects.filter(pk=self.product.pk).update(price=12)
+        
+        order, priced = self.create_order(token)
+        self.assertTrue(priced)
+        self.assertEqual(order.subtotal, Decimal('24.00'))
+    
+    def test_rule_change_makes_the_quote_stale(self):
+        token = self.quote()['quote']
+        TaxRule.objects.create(country='US', state='IL', rate=Decimal('5'))
+        
+        order, priced = self.create_order(token)
+        self.assertTrue(priced)
+        self.assertEqual(order.tax, Decimal('1.00'))
+    
+    def test_tampered_or_expired_tokens_are_ignored(self):
+        token = self.quote()['quote']
+        self.assertTrue(self.create_order(token[:-2] + 'xx')[1])
+        
+        Order.objects.all().delete()
+        CartItem.objects.create(cart=self.user.cart, product=self.product, quantity=2)
+        with override_settings(ORDER_QUOTE_TTL_SECONDS=-1):
+            self.assertTrue(self.create_order(token)[1])
+    
+    def test_other_users_quote(self):
+        token = self.quote()['quote']
+        other = get_user_model().objects.create_user('other@example.com', None, is_verified=True)
+        CartItem.objects.create(cart=Cart.objects.create(user=other), product=self.product, quantity=2)
+        
+        self.client.force_authenticate(other)
+        self.assertTrue(self.create_order(token)[1])
+    
+    def test_empty_cart(self):
+        CartItem.objects.all().delete()
+        response = self.client.get('/api/v1/orders/quote/', {'shipping_country': 'US', 'shipping_zip_code': '62701'})
+        self.assertEqual(response.status_code, 400)
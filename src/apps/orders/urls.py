@@ -3,6 +3,7 @@ from .views import (
     OrderListView,
     OrderDetailView,
     OrderCreateView,
+    OrderQuoteView,
     UpdateOrderStatusView,
     CancelOrderView
 )
@@ -11,6 +12,7 @@ app_name = 'orders'
 
 urlpatterns = [
     path('', OrderListView.as_view(), name='order_list'),
+    path('quote/', OrderQuoteView.as_view(), name='order_quote'),
     path('create/', OrderCreateView.as_view(), name='order_create'),
     path('<int:pk>/', OrderDetailView.as_view(), name='order_detail'),
     path('<int:pk>/status/', UpdateOrderStatusView.as_view(), name='update_order_status'),
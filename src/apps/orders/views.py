@@ -3,18 +3,27 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django.shortcuts import get_object_or_404
+from django.http import Http404
 from django.db import transaction
+from .archive import find_archived_order
 from .models import Order, OrderItem
-from apps.cart.models import Cart
+from .quotes import cart_lines, price_checkout, quote
+from apps.cart.models import Cart, CartItem
+from apps.core import events
+from apps.core.idempotency import idempotent
+from apps.core.serializers import CompiledListMixin, SparseFieldsetViewMixin, select_fields
+from apps.products.ledger import StockLedger
+from apps.products.stock import InsufficientStock, return_stock, take_stock
 from .serializers import (
     OrderSerializer,
     OrderCreateSerializer,
     OrderListSerializer,
+    OrderQuoteSerializer,
     UpdateOrderStatusSerializer
 )
 
 
-class OrderListView(generics.ListAPIView):
+class OrderListView(CompiledListMixin, generics.ListAPIView):
     """API endpoint to list user's orders."""
     
     serializer_class = OrderListSerializer
@@ -25,7 +34,7 @@ class OrderListView(generics.ListAPIView):
         return Order.objects.filter(user=self.request.user)
 
 
-class OrderDetailView(generics.RetrieveAPIView):
+class OrderDetailView(SparseFieldsetViewMixin, generics.RetrieveAPIView):
     """API endpoint to retrieve order details."""
     
     serializer_class = OrderSerializer
@@ -34,6 +43,50 @@ class OrderDetailView(generics.RetrieveAPIView):
     def get_queryset(self):
         """Return orders for current user."""
         return Order.objects.filter(user=self.request.user)
+    
+    def retrieve(self, request, *args, **kwargs):
+        try:
+            return super().retrieve(request, *args, **kwargs)
+        except Http404:
+            # Orders of archived months are read from their archive file
+            data = find_archived_order(int(kwargs['pk']))
+            if data is None or data['user'] != request.user.pk:
+                raise
+        
+        fields = select_fields(tuple(data), request)
+        if fields is not None:
+            data = {name: data[name] for name in fields}
+        return Response(data)
+
+
+class OrderQuoteView(APIView):
+    """
+    API endpoint to price the user's cart for a shipping destination.
+    
+    Nothing is written; the returned ``quote`` token can be passed to order
+    creation to reuse these totals.
+    """
+    
+    permission_classes = (IsAuthenticated,)
+    throttle_scope = 'quotes'
+    
+    def get(self, request):
+        serializer = OrderQuoteSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        
+        items = CartItem.objects.filter(cart__user=request.user).select_related('product')
+        lines = cart_lines(items)
+        if not lines:
+            return Response(
+                {'error': 'Cart is empty.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        return Response(quote(
+            request.user, lines,
+            data['shipping_country'], data['shipping_state'], data['shipping_zip_code']
+        ))
 
 
 class OrderCreateView(APIView):
@@ -41,6 +94,7 @@ class OrderCreateView(APIView):
     
     permission_classes = (IsAuthenticated,)
     
+    @idempotent
     @transaction.atomic
     def post(self, request):
         serializer = OrderCreateSerializer(data=request.data)
@@ -57,39 +111,44 @@ class OrderCreateView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Check if cart has items
-        if not cart.items.exists():
+        # Check if cart has items (in product id order, so that concurrent
+        # checkouts lock stock rows in the same order)
+        items = list(cart.items.select_related('product').order_by('product_id'))
+        if not items:
             return Response(
                 {'error': 'Cart is empty.'},
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Validate stock availability
-        for item in cart.items.all():
-            if item.quantity > item.product.stock:
+        # Take the stock; it is given back on rollback if any product falls short
+        ledger = StockLedger('order', request.user)
+        for item in items:
+            try:
+                take_stock(item.product, item.quantity, ledger)
+            except InsufficientStock as e:
+                transaction.set_rollback(True)
                 return Response(
-                    {'error': f'Insufficient stock for {item.product.name}. Only {item.product.stock} available.'},
+                    {'error': f'Insufficient stock for {item.product.name}. Only {e.available} available.'},
                     status=status.HTTP_400_BAD_REQUEST
                 )
         
-        # Calculate order totals
-        subtotal = cart.total_price
-        shipping_cost = 10.00  # Fixed shipping cost for now
-        tax = subtotal * 0.10  # 10% tax
-        total = subtotal + shipping_cost + tax
+        # Calculate order totals, or take them from a still valid quote
+        data = serializer.validated_data
+        token = data.pop('quote', None)
+        pricing = price_checkout(
+            request.user, cart_lines(items),
+            data['shipping_country'], data['shipping_state'], data['shipping_zip_code'], token
+        )
         
         # Create order
         order = Order.objects.create(
             user=request.user,
-            subtotal=subtotal,
-            shipping_cost=shipping_cost,
-            tax=tax,
-            total=total,
-            **serializer.validated_data
+            **pricing.amounts(),
+            **data
         )
         
-        # Create order items and update product stock
-        for cart_item in cart.items.all():
+        # Create order items
+        for cart_item in items:
             OrderItem.objects.create(
                 order=order,
                 product=cart_item.product,
@@ -97,15 +156,17 @@ class OrderCreateView(APIView):
                 product_price=cart_item.product.price,
                 quantity=cart_item.quantity
             )
-            
-            # Update product stock
-            product = cart_item.product
-            product.stock -= cart_item.quantity
-            product.save()
+        ledger.write(order_id=order.pk)
         
         # Clear cart
         cart.items.all().delete()
         
+        events.publish(
+            events.ORDER_CREATED, order,
+            user_id=request.user.id,
+            total=order.total,
+        )
+        
         return Response(
             {
                 'message': 'Order created successfully.',
@@ -136,8 +197,8 @@ class UpdateOrderStatusView(APIView):
         )
         
         if serializer.is_valid():
-            order.status = serializer.validated_data['status']
-            order.save()
+            with transaction.atomic():
+                order.update_status(serializer.validated_data['status'])
             
             return Response(
                 {
@@ -157,7 +218,8 @@ class CancelOrderView(APIView):
     
     @transaction.atomic
     def post(self, request, pk):
-        order = get_object_or_404(Order, pk=pk, user=request.user)
+        # Lock the order so concurrent cancels of it give its stock back once
+        order = get_object_or_404(Order.objects.select_for_update(), pk=pk, user=request.user)
         
         # Check if order can be cancelled
         if order.status not in ['pending', 'processing']:
@@ -167,14 +229,13 @@ class CancelOrderView(APIView):
             )
         
         # Restore product stock
-        for item in order.items.all():
-            product = item.product
-            product.stock += item.quantity
-            product.save()
+        ledger = StockLedger('cancellation', request.user)
+        for item in order.items.select_related('product').order_by('product_id'):
+            return_stock(item.product, item.quantity, ledger)
+        ledger.write(order_id=order.pk)
         
         # Update order status
-        order.status = 'cancelled'
-        order.save()
+        order.update_status('cancelled')
         
         return Response(
             {
@@ -1,5 +1,6 @@
 from django.contrib import admin
 from .models import Payment, Refund
+from apps.core.paginator import EstimatedCountPaginator
 
 
 class RefundInline(admin.TabularInline):
@@ -30,8 +31,11 @@ class PaymentAdmin(admin.ModelAdmin):
         'created_at', 'updated_at', 'paid_at', 'is_successful'
     )
     list_editable = ('status',)
+    list_select_related = ('order', 'user')
     ordering = ('-created_at',)
     inlines = [RefundInline]
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     
     fieldsets = (
         ('Payment Information', {
@@ -76,7 +80,11 @@ class RefundAdmin(admin.ModelAdmin):
         'created_at', 'updated_at', 'processed_at'
     )
     list_editable = ('status',)
+    # Payment.__str__ shows the order number
+    list_select_related = ('payment__order',)
     ordering = ('-created_at',)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     
     fieldsets = (
         ('Refund Information', {
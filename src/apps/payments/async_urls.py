@@ -0,0 +1,14 @@
+from django.urls import path
+from .async_views import (
+    AsyncCreatePaymentIntentView,
+    AsyncConfirmPaymentView,
+    AsyncStripeWebhookView,
+)
+
+app_name = 'payments_async'
+
+urlpatterns = [
+    path('create-intent/', AsyncCreatePaymentIntentView.as_view(), name='create_payment_intent'),
+    path('confirm/', AsyncConfirmPaymentView.as_view(), name='confirm_payment'),
+    path('webhook/', AsyncStripeWebhookView.as_view(), name='stripe_webhook'),
+]
@@ -0,0 +1,106 @@
+"""Async (ASGI) variants of the Stripe payment endpoints."""
+import stripe
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from rest_framework import status
+
+from apps.core.async_views import AsyncAPIView
+from apps.core.idempotency import idempotent
+from apps.orders.models import Order
+from .serializers import CreatePaymentIntentSerializer, ConfirmPaymentSerializer, PaymentSerializer
+from .services import StripePaymentService
+
+
+class AsyncCreatePaymentIntentView(AsyncAPIView):
+    """API endpoint to create a payment intent."""
+    
+    @idempotent
+    async def post(self, request):
+        serializer = await self.validate(CreatePaymentIntentSerializer, request)
+        
+        if serializer.errors:
+            return self.respond(serializer.errors, status.HTTP_400_BAD_REQUEST)
+        
+        payment_method = serializer.validated_data['payment_method']
+        if payment_method == 'cash':
+            return self.respond(
+                {'error': 'Use cash-on-delivery endpoint for this payment method.'},
+                status.HTTP_400_BAD_REQUEST
+            )
+        if payment_method != 'stripe':
+            return self.respond(
+                {'error': 'Payment method not supported yet.'},
+                status.HTTP_400_BAD_REQUEST
+            )
+        
+        order = await Order.objects.filter(
+            id=serializer.validated_data['order_id'],
+            user=request.user
+        ).afirst()
+        if order is None:
+            return self.respond({'detail': 'Not found.'}, status.HTTP_404_NOT_FOUND)
+        
+        if order.status not in ['pending']:
+            return self.respond(
+                {'error': 'Order cannot be paid at this stage.'},
+                status.HTTP_400_BAD_REQUEST
+            )
+        
+        result = await sync_to_async(StripePaymentService.create_payment_intent)(order, request.user)
+        
+        if not result['success']:
+            return self.respond({'error': result['error']}, status.HTTP_400_BAD_REQUEST)
+        
+        return self.respond({
+            'message': 'Payment intent created successfully.',
+            'payment_id': result['payment_id'],
+            'client_secret': result['client_secret'],
+            'payment_intent_id': result['payment_intent_id'],
+        }, status.HTTP_201_CREATED)
+
+
+class AsyncConfirmPaymentView(AsyncAPIView):
+    """API endpoint to confirm payment."""
+    
+    async def post(self, request):
+        serializer = await self.validate(ConfirmPaymentSerializer, request)
+        
+        if serializer.errors:
+            return self.respond(serializer.errors, status.HTTP_400_BAD_REQUEST)
+        
+        result = await StripePaymentService.aconfirm_payment(serializer.validated_data['payment_intent_id'])
+        
+        if not result['success']:
+            return self.respond({'error': result['error']}, status.HTTP_400_BAD_REQUEST)
+        
+        payment_data = await sync_to_async(lambda: PaymentSerializer(result['payment']).data)()
+        return self.respond({
+            'message': 'Payment confirmed successfully.',
+            'payment': payment_data,
+            'status': result['status'],
+        })
+
+
+class AsyncStripeWebhookView(AsyncAPIView):
+    """API endpoint to handle Stripe webhooks."""
+    
+    authentication_required = False
+    
+    async def post(self, request):
+        try:
+            # Verify webhook signature
+            event = stripe.Webhook.construct_event(
+                request.body,
+                request.META.get('HTTP_STRIPE_SIGNATURE'),
+                getattr(settings, 'STRIPE_WEBHOOK_SECRET', '')
+            )
+        except ValueError:
+            return self.respond({'error': 'Invalid payload'}, status.HTTP_400_BAD_REQUEST)
+        except stripe.error.SignatureVerificationError:
+            return self.respond({'error': 'Invalid signature'}, status.HTTP_400_BAD_REQUEST)
+        
+        result = await sync_to_async(StripePaymentService.handle_webhook)(event['type'], event)
+        
+        if result['success']:
+            return self.respond({'status': 'success'})
+        return self.respond({'error': result.get('error', 'Unknown error')}, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,32 @@
+from django.db.models import OuterRef, Subquery
+
+from apps.core.exports import Export
+from apps.orders.models import Order
+
+from .models import Payment, Refund
+
+
+def _order_number(order_lookup):
+    # A subquery rather than a join, so rows of archived orders are kept
+    return Subquery(Order.objects.filter(pk=OuterRef(order_lookup)).values('order_number')[:1])
+
+
+class PaymentExport(Export):
+    name = 'payments'
+    model = Payment
+    annotations = {'order_number': _order_number('order_id')}
+    fields = (
+        'id', 'order_id', 'order_number', 'user_id', 'user__email', 'payment_method', 'status',
+        'amount', 'currency', 'transaction_id', 'transaction_fee', 'stripe_payment_intent_id',
+        'failure_reason', 'created_at', 'updated_at', 'paid_at'
+    )
+
+
+class RefundExport(Export):
+    name = 'refunds'
+    model = Refund
+    annotations = {'order_number': _order_number('payment__order_id')}
+    fields = (
+        'id', 'payment_id', 'payment__order_id', 'order_number', 'amount', 'reason', 'status',
+        'stripe_refund_id', 'created_at', 'updated_at', 'processed_at'
+    )
@@ -0,0 +1,20 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from apps.core.jobs import periodic_job, update_in_batches
+
+from .models import Payment
+
+
+@periodic_job(interval=timedelta(minutes=30))
+def cancel_stale_pending_payments():
+    """
+    Cancel online payments left pending for ``PAYMENT_PENDING_TIMEOUT_HOURS``.
+    
+    Cash on delivery payments stay pending until delivery and are left alone.
+    """
+    cutoff = timezone.now() - timedelta(hours=settings.PAYMENT_PENDING_TIMEOUT_HOURS)
+    stale = Payment.objects.filter(status='pending', created_at__lt=cutoff).exclude(payment_method='cash')
+    return {'cancelled': update_in_batches(stale, status='cancelled', updated_at=timezone.now())}
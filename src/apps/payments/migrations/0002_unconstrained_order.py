@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0002_order_archive'),
+        ('payments', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='payment',
+            name='order',
+            field=models.OneToOneField(db_constraint=False, on_delete=django.db.models.deletion.CASCADE, related_name='payment', to='orders.order'),
+        ),
+    ]
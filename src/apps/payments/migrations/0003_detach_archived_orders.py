@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:53
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0006_order_number_not_unique'),
+        ('payments', '0002_unconstrained_order'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='payment',
+            name='order',
+            field=models.OneToOneField(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='payment', to='orders.order'),
+        ),
+    ]
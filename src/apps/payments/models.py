@@ -22,7 +22,16 @@ class Payment(models.Model):
         ('cancelled', 'Cancelled'),
     ]
     
-    order = models.OneToOneField(Order, on_delete=models.CASCADE, related_name='payment')
+    # No database constraint: orders is partitioned (see apps.orders.partitions).
+    # Cleared when the order is archived; the payment itself is kept.
+    order = models.OneToOneField(
+        Order,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='payment',
+        db_constraint=False,
+    )
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='payments')
     
     payment_method = models.CharField(max_length=20, choices=PAYMENT_METHOD_CHOICES)
@@ -59,6 +68,8 @@ class Payment(models.Model):
         ordering = ['-created_at']
     
     def __str__(self):
+        if self.order_id is None:
+            return f"Payment {self.pk} (archived order) - {self.status}"
         return f"Payment for Order {self.order.order_number} - {self.status}"
     
     @property
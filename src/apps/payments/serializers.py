@@ -5,7 +5,7 @@ from .models import Payment, Refund
 class PaymentSerializer(serializers.ModelSerializer):
     """Serializer for payment details."""
     
-    order_number = serializers.CharField(source='order.order_number', read_only=True)
+    order_number = serializers.CharField(source='order.order_number', read_only=True, allow_null=True)
     user_email = serializers.EmailField(source='user.email', read_only=True)
     is_successful = serializers.BooleanField(read_only=True)
     
@@ -21,6 +21,10 @@ class PaymentSerializer(serializers.ModelSerializer):
             'id', 'user', 'transaction_id', 'transaction_fee',
             'created_at', 'updated_at', 'paid_at'
         )
+        # Columns behind the computed fields, used to defer unused text columns
+        compiled_sources = {
+            'is_successful': (('status',), lambda status: status == 'completed'),
+        }
 
 
 class CreatePaymentIntentSerializer(serializers.Serializer):
@@ -82,7 +86,7 @@ class CashOnDeliverySerializer(serializers.Serializer):
 class RefundSerializer(serializers.ModelSerializer):
     """Serializer for refund details."""
     
-    payment_order_number = serializers.CharField(source='payment.order.order_number', read_only=True)
+    payment_order_number = serializers.CharField(source='payment.order.order_number', read_only=True, allow_null=True)
     
     class Meta:
         model = Refund
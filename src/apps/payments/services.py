@@ -1,8 +1,11 @@
 import stripe
+from asgiref.sync import sync_to_async
 from django.conf import settings
+from django.db import transaction
 from django.utils import timezone
 from decimal import Decimal
 from .models import Payment, Refund
+from apps.core import events
 
 # Initialize Stripe with API key
 stripe.api_key = getattr(settings, 'STRIPE_SECRET_KEY', '')
@@ -63,46 +66,91 @@ class StripePaymentService:
         """Confirm and retrieve payment intent from Stripe."""
         try:
             intent = stripe.PaymentIntent.retrieve(payment_intent_id)
-            
-            # Get payment record
-            payment = Payment.objects.get(stripe_payment_intent_id=payment_intent_id)
-            
-            if intent.status == 'succeeded':
-                payment.status = 'completed'
-                payment.paid_at = timezone.now()
-                payment.transaction_id = intent.id
-                
-                # Update order status
-                payment.order.status = 'processing'
-                payment.order.save()
-            elif intent.status == 'processing':
-                payment.status = 'processing'
-            elif intent.status in ['canceled', 'failed']:
-                payment.status = 'failed'
-                payment.failure_reason = intent.last_payment_error.message if intent.last_payment_error else 'Payment failed'
-            
-            payment.save()
-            
+        except stripe.error.StripeError as e:
             return {
-                'success': True,
-                'payment': payment,
-                'status': intent.status,
+                'success': False,
+                'error': str(e),
             }
         
+        return StripePaymentService._apply_intent(payment_intent_id, intent)
+    
+    @staticmethod
+    async def aconfirm_payment(payment_intent_id):
+        """Async version of ``confirm_payment`` using Stripe's async client."""
+        try:
+            intent = await stripe.PaymentIntent.retrieve_async(payment_intent_id)
         except stripe.error.StripeError as e:
             return {
                 'success': False,
                 'error': str(e),
             }
+        
+        return await sync_to_async(StripePaymentService._apply_intent)(payment_intent_id, intent)
+    
+    @staticmethod
+    @transaction.atomic
+    def _apply_intent(payment_intent_id, intent):
+        """Update the payment record from a retrieved payment intent."""
+        try:
+            # Get payment record
+            payment = Payment.objects.select_for_update().get(stripe_payment_intent_id=payment_intent_id)
         except Payment.DoesNotExist:
             return {
                 'success': False,
                 'error': 'Payment not found',
             }
+        
+        if intent.status == 'succeeded':
+            # Confirmation and the webhook may both report the same intent
+            newly_completed = payment.status != 'completed'
+            
+            payment.status = 'completed'
+            payment.paid_at = timezone.now()
+            payment.transaction_id = intent.id
+            
+            if newly_completed:
+                # Payments of archived orders have no order left to update
+                if payment.order_id is not None:
+                    payment.order.update_status('processing')
+                events.publish(events.PAYMENT_COMPLETED, payment, order_id=payment.order_id, amount=payment.amount)
+        elif intent.status == 'processing':
+            payment.status = 'processing'
+        elif intent.status in ['canceled', 'failed'] or (
+            # A declined attempt puts the intent back to requires_payment_method
+            intent.status == 'requires_payment_method' and intent.last_payment_error
+        ):
+            newly_failed = payment.status != 'failed'
+            
+            payment.status = 'failed'
+            payment.failure_reason = intent.last_payment_error.message if intent.last_payment_error else 'Payment failed'
+            
+            if newly_failed:
+                events.publish(events.PAYMENT_FAILED, payment, order_id=payment.order_id)
+        
+        payment.save()
+        
+        return {
+            'success': True,
+            'payment': payment,
+            'status': intent.status,
+        }
     
     @staticmethod
     def create_refund(payment, amount, reason):
-        """Create a refund for a payment."""
+        """
+        Create a refund for a payment.
+        
+        The refund is saved as ``pending`` before Stripe is called, and no
+        transaction is held open during the call, so a refund made at Stripe
+        always has a local row. The row id is the Stripe idempotency key.
+        """
+        refund_obj = Refund.objects.create(
+            payment=payment,
+            amount=amount,
+            reason=reason,
+            status='pending',
+        )
+        
         try:
             # Convert amount to cents
             amount_cents = int(amount * 100)
@@ -113,44 +161,48 @@ class StripePaymentService:
                 amount=amount_cents,
                 reason='requested_by_customer',
                 metadata={
-                    'order_id': payment.order.id,
+                    'order_id': payment.order_id,
                     'refund_reason': reason,
-                }
-            )
-            
-            # Create refund record
-            refund_obj = Refund.objects.create(
-                payment=payment,
-                amount=amount,
-                reason=reason,
-                status='processing',
-                stripe_refund_id=refund.id,
+                },
+                idempotency_key=f'refund-{refund_obj.pk}',
             )
+        except stripe.error.StripeError as e:
+            # After a connection error the refund may exist at Stripe: it stays pending
+            if not isinstance(e, stripe.error.APIConnectionError):
+                refund_obj.status = 'failed'
+                refund_obj.save(update_fields=['status', 'updated_at'])
+            return {
+                'success': False,
+                'error': str(e),
+            }
+        
+        with transaction.atomic():
+            refund_obj.status = 'processing'
+            refund_obj.stripe_refund_id = refund.id
             
             # Update status if refund succeeded immediately
             if refund.status == 'succeeded':
                 refund_obj.status = 'completed'
                 refund_obj.processed_at = timezone.now()
-                refund_obj.save()
                 
-                # Update payment status if fully refunded
+                events.publish(events.REFUND_COMPLETED, refund_obj, payment_id=payment.id, amount=refund_obj.amount)
+            
+            refund_obj.save()
+            
+            if refund_obj.status == 'completed':
+                # Update payment status if fully refunded (locked, so concurrent refunds see each other)
+                payment = Payment.objects.select_for_update().get(pk=payment.pk)
                 total_refunded = sum(
                     r.amount for r in payment.refunds.filter(status='completed')
                 )
                 if total_refunded >= payment.amount:
                     payment.status = 'refunded'
                     payment.save()
-            
-            return {
-                'success': True,
-                'refund': refund_obj,
-            }
         
-        except stripe.error.StripeError as e:
-            return {
-                'success': False,
-                'error': str(e),
-            }
+        return {
+            'success': True,
+            'refund': refund_obj,
+        }
     
     @staticmethod
     def _get_or_create_customer(user):
@@ -182,25 +234,15 @@ class StripePaymentService:
     def handle_webhook(event_type, payload):
         """Handle Stripe webhook events."""
         try:
-            if event_type == 'payment_intent.succeeded':
+            if event_type in ('payment_intent.succeeded', 'payment_intent.payment_failed'):
                 payment_intent = payload.get('data', {}).get('object', {})
                 payment_intent_id = payment_intent.get('id')
                 
+                # Both outcomes go through confirm_payment, which locks the
+                # payment, applies the intent's current state and publishes the event
                 if payment_intent_id:
                     return StripePaymentService.confirm_payment(payment_intent_id)
             
-            elif event_type == 'payment_intent.payment_failed':
-                payment_intent = payload.get('data', {}).get('object', {})
-                payment_intent_id = payment_intent.get('id')
-                
-                try:
-                    payment = Payment.objects.get(stripe_payment_intent_id=payment_intent_id)
-                    payment.status = 'failed'
-                    payment.failure_reason = payment_intent.get('last_payment_error', {}).get('message', 'Payment failed')
-                    payment.save()
-                except Payment.DoesNotExist:
-                    pass
-            
             return {'success': True}
         
         except Exception as e:
@@ -1,3 +1,111 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+import stripe
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+
+from apps.core import events
+from apps.core.models import OutboxEvent
+from apps.orders.models import Order
+from .models import Payment, Refund
+from .services import StripePaymentService
+
+ADDRESS = {
+    'shipping_address': '1 Main Street',
+    'shipping_city': 'Springfield',
+    'shipping_state': 'IL',
+    'shipping_zip_code': '62701',
+    'shipping_country': 'US',
+    'phone_number': '+15555550100',
+}
+
+
+def payment_intent(**data):
+    return stripe.PaymentIntent.construct_from({'id': 'pi_1', 'last_payment_error': None, **data}, 'sk_test')
+
+
+@override_settings(SNOWFLAKE_NODE_ID=7)
+class WebhookTests(TestCase):
+    """Stripe webhooks update the payment and publish its outcome."""
+    
+    def setUp(self):
+        user = get_user_model().objects.create_user('buyer@example.com', None)
+        self.order = Order.objects.create(user=user, subtotal=20, total=20, **ADDRESS)
+        self.payment = Payment.objects.create(
+            order=self.order, user=user, payment_method='stripe', amount=20, stripe_payment_intent_id='pi_1',
+        )
+    
+    def handle(self, event_type, intent):
+        with mock.patch.object(stripe.PaymentIntent, 'retrieve', return_value=intent):
+            return StripePaymentService.handle_webhook(event_type, {'data': {'object': {'id': intent.id}}})
+    
+    def published(self, event_type):
+        return OutboxEvent.objects.filter(event_type=event_type, aggregate_id=str(self.payment.pk)).count()
+    
+    def test_payment_succeeded(self):
+        for _ in range(2):
+            result = self.handle('payment_intent.succeeded', payment_intent(status='succeeded'))
+            self.assertTrue(result['success'])
+        
+        self.payment.refresh_from_db()
+        self.order.refresh_from_db()
+        self.assertEqual((self.payment.status, self.order.status), ('completed', 'processing'))
+        # A repeated webhook doesn't publish the payment again
+        self.assertEqual(self.published(events.PAYMENT_COMPLETED), 1)
+    
+    def test_payment_failed(self):
+        declined = payment_intent(status='requires_payment_method', last_payment_error={'message': 'Card declined'})
+        for _ in range(2):
+            result = self.handle('payment_intent.payment_failed', declined)
+            self.assertTrue(result['success'])
+        
+        self.payment.refresh_from_db()
+        self.assertEqual((self.payment.status, self.payment.failure_reason), ('failed', 'Card declined'))
+        self.assertEqual(self.published(events.PAYMENT_FAILED), 1)
+    
+    def test_unknown_payment(self):
+        result = self.handle('payment_intent.payment_failed', payment_intent(id='pi_2', status='canceled'))
+        self.assertFalse(result['success'])
+        self.assertEqual(self.published(events.PAYMENT_FAILED), 0)
+
+
+@override_settings(SNOWFLAKE_NODE_ID=7)
+class RefundTests(TestCase):
+    """Refunds are saved before Stripe is called and completed after it answers."""
+    
+    def setUp(self):
+        user = get_user_model().objects.create_user('buyer@example.com', None)
+        order = Order.objects.create(user=user, subtotal=20, total=20, **ADDRESS)
+        self.payment = Payment.objects.create(
+            order=order, user=user, payment_method='stripe', status='completed', amount=20,
+            stripe_payment_intent_id='pi_1',
+        )
+    
+    def refund(self, amount, **stripe_result):
+        with mock.patch.object(stripe.Refund, 'create', **stripe_result) as create:
+            result = StripePaymentService.create_refund(self.payment, amount, 'Damaged')
+        return result, create
+    
+    def test_full_refund(self):
+        refunded = stripe.Refund.construct_from({'id': 're_1', 'status': 'succeeded'}, 'sk_test')
+        result, create = self.refund(20, return_value=refunded)
+        
+        self.assertTrue(result['success'])
+        refund = Refund.objects.get()
+        self.assertEqual((refund.status, refund.stripe_refund_id), ('completed', 're_1'))
+        self.assertEqual(create.call_args.kwargs['idempotency_key'], f'refund-{refund.pk}')
+        self.assertEqual(Payment.objects.get(pk=self.payment.pk).status, 'refunded')
+        self.assertTrue(OutboxEvent.objects.filter(event_type=events.REFUND_COMPLETED, aggregate_id=str(refund.pk)).exists())
+    
+    def test_declined_refund(self):
+        result, _ = self.refund(5, side_effect=stripe.error.InvalidRequestError('Amount too large', 'amount'))
+        
+        self.assertFalse(result['success'])
+        self.assertEqual(Refund.objects.get().status, 'failed')
+        self.assertEqual(Payment.objects.get(pk=self.payment.pk).status, 'completed')
+    
+    def test_connection_error_keeps_refund_pending(self):
+        result, _ = self.refund(5, side_effect=stripe.error.APIConnectionError('Timed out'))
+        
+        self.assertFalse(result['success'])
+        self.assertEqual(Refund.objects.get().status, 'pending')
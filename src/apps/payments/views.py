@@ -5,11 +5,14 @@ from rest_framework.permissions import IsAuthenticated, AllowAny
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from django.conf import settings
+from django.db import transaction
 import stripe
 import json
 
 from .models import Payment, Refund
 from apps.orders.models import Order
+from apps.core.idempotency import idempotent
+from apps.core.serializers import DeferTextFieldsMixin
 from .serializers import (
     PaymentSerializer,
     CreatePaymentIntentSerializer,
@@ -21,7 +24,7 @@ from .serializers import (
 from .services import StripePaymentService
 
 
-class PaymentListView(generics.ListAPIView):
+class PaymentListView(DeferTextFieldsMixin, generics.ListAPIView):
     """API endpoint to list user's payments."""
     
     serializer_class = PaymentSerializer
@@ -29,7 +32,7 @@ class PaymentListView(generics.ListAPIView):
     
     def get_queryset(self):
         """Return payments for current user."""
-        return Payment.objects.filter(user=self.request.user)
+        return Payment.objects.filter(user=self.request.user).select_related('order', 'user')
 
 
 class PaymentDetailView(generics.RetrieveAPIView):
@@ -48,6 +51,7 @@ class CreatePaymentIntentView(APIView):
     
     permission_classes = (IsAuthenticated,)
     
+    @idempotent
     def post(self, request):
         serializer = CreatePaymentIntentSerializer(data=request.data)
         
@@ -132,6 +136,8 @@ class CashOnDeliveryView(APIView):
     
     permission_classes = (IsAuthenticated,)
     
+    @idempotent
+    @transaction.atomic
     def post(self, request):
         serializer = CashOnDeliverySerializer(data=request.data)
         
@@ -161,8 +167,7 @@ class CashOnDeliveryView(APIView):
         )
         
         # Update order status
-        order.status = 'processing'
-        order.save()
+        order.update_status('processing')
         
         return Response({
             'message': 'Order confirmed with cash on delivery.',
@@ -175,6 +180,7 @@ class CreateRefundView(APIView):
     
     permission_classes = (IsAuthenticated,)
     
+    @idempotent
     def post(self, request):
         serializer = CreateRefundSerializer(data=request.data)
         
@@ -254,7 +260,7 @@ class StripeWebhookView(APIView):
             return Response({'error': result.get('error', 'Unknown error')}, status=status.HTTP_400_BAD_REQUEST)
 
 
-class RefundListView(generics.ListAPIView):
+class RefundListView(DeferTextFieldsMixin, generics.ListAPIView):
     """API endpoint to list refunds."""
     
     serializer_class = RefundSerializer
@@ -262,4 +268,4 @@ class RefundListView(generics.ListAPIView):
     
     def get_queryset(self):
         """Return refunds for current user's payments."""
-        return Refund.objects.filter(payment__user=self.request.user)
\ No newline at end of file
+        return Refund.objects.filter(payment__user=self.request.user).select_related('payment__order')
\ No newline at end of file
@@ -1,5 +1,9 @@
 from django.contrib import admin
-from .models import Category, Product
+from django.db import transaction
+from .ledger import StockLedger
+from .models import Category, Product, StockMovement, StockSnapshot
+from .stock import set_stock
+from apps.core.paginator import EstimatedCountPaginator
 
 
 @admin.register(Category)
@@ -19,14 +23,14 @@ class ProductAdmin(admin.ModelAdmin):
     
     list_display = ('name', 'category', 'price', 'stock', 'is_active', 'is_featured', 'created_by', 'created_at')
     list_filter = ('category', 'is_active', 'is_featured', 'created_at')
-    search_fields = ('name', 'description')
+    search_fields = ('name', 'sku', 'description')
     prepopulated_fields = {'slug': ('name',)}
     list_editable = ('is_active', 'is_featured')
     ordering = ('-created_at',)
     
     fieldsets = (
         ('Basic Information', {
-            'fields': ('name', 'slug', 'description', 'category')
+            'fields': ('name', 'slug', 'sku', 'description', 'category')
         }),
         ('Pricing & Inventory', {
             'fields': ('price', 'stock')
@@ -41,4 +45,61 @@ class ProductAdmin(admin.ModelAdmin):
             'fields': ('created_by',),
             'classes': ('collapse',)
         }),
-    )
\ No newline at end of file
+    )
+    
+    def save_model(self, request, obj, form, change):
+        """Set a changed stock through ``set_stock``, so it is recorded in the ledger."""
+        with transaction.atomic():
+            if not change:
+                super().save_model(request, obj, form, change)
+                ledger = StockLedger('adjustment', request.user)
+                ledger.add(obj.pk, obj.stock)
+                ledger.write()
+                return
+            stock = obj.stock
+            obj.stock = Product.objects.select_for_update().values_list('stock', flat=True).get(pk=obj.pk)
+            super().save_model(request, obj, form, change)
+            if 'stock' in form.changed_data:
+                ledger = StockLedger('adjustment', request.user)
+                set_stock(obj.pk, stock, ledger)
+                ledger.write()
+                obj.stock = stock
+
+
+@admin.register(StockMovement)
+class StockMovementAdmin(admin.ModelAdmin):
+    """Admin configuration for StockMovement model (read-only: the ledger is append-only)."""
+    
+    # Ids only: movements outlive their product
+    list_display = ('id', 'product_id', 'quantity', 'reason', 'order_id', 'user', 'created_at')
+    list_filter = ('reason', 'created_at')
+    search_fields = ('=product__id', 'product__sku')
+    list_select_related = ('user',)
+    ordering = ('-id',)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+    
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(StockSnapshot)
+class StockSnapshotAdmin(admin.ModelAdmin):
+    """Admin configuration for StockSnapshot model."""
+    
+    list_display = ('product_id', 'stock', 'movement_id', 'taken_at')
+    ordering = ('-movement_id',)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
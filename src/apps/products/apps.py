@@ -4,4 +4,7 @@ from django.apps import AppConfig
 class ProductsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.products'
-    verbose_name = 'Products'
\ No newline at end of file
+    verbose_name = 'Products'
+
+    def ready(self):
+        from . import signals  # noqa: F401
\ No newline at end of file
@@ -0,0 +1,9 @@
+from django.urls import path
+from .async_views import AsyncCategoryDetailView, AsyncProductDetailView
+
+app_name = 'products_async'
+
+urlpatterns = [
+    path('categories/<slug:slug>/', AsyncCategoryDetailView.as_view(), name='category_detail'),
+    path('<slug:slug>/', AsyncProductDetailView.as_view(), name='product_detail'),
+]
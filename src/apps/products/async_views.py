@@ -0,0 +1,65 @@
+"""Async (ASGI) variants of the catalog read endpoints."""
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework import status
+
+from apps.core.async_views import AsyncAPIView
+from apps.core.serializers import get_plan, prune_queryset, select_fields
+from .caching import ProductValidators
+from .models import Category, Product
+from .serializers import CategorySerializer, ProductSerializer
+from .stock import current_stock
+
+
+class AsyncProductDetailView(AsyncAPIView):
+    """API endpoint to retrieve product details."""
+    
+    authentication_required = False
+    
+    async def get(self, request, slug):
+        row = await (
+            Product.objects.filter(is_active=True, slug=slug)
+            .values('id', 'category_id', 'category__cache_version', 'updated_at', 'stock', 'stock_stripes')
+            .afirst()
+        )
+        if row is None:
+            return self.respond({'detail': 'Not found.'}, status.HTTP_404_NOT_FOUND)
+        
+        striped_stock = None
+        if row['stock_stripes']:
+            striped_stock = await sync_to_async(current_stock)(row['id'], row['stock'], row['stock_stripes'])
+        fields = select_fields(get_plan(ProductSerializer).names, request)
+        validators = ProductValidators(
+            row['id'], row['category_id'], row['updated_at'], row['category__cache_version'],
+            striped_stock=striped_stock,
+            fields=fields
+        )
+        
+        if validators.is_not_modified(request):
+            return validators.apply(self.respond(status_code=status.HTTP_304_NOT_MODIFIED))
+        
+        data = await cache.aget(validators.payload_key)
+        if data is None:
+            queryset = Product.objects.select_related('category', 'created_by')
+            if fields is not None:
+                queryset = prune_queryset(queryset, get_plan(ProductSerializer, fields).lookups)
+            product = await queryset.aget(pk=row['id'])
+            data = await sync_to_async(lambda: ProductSerializer(product, context={'request': request}).data)()
+            await cache.aset(validators.payload_key, data, settings.CATALOG_CACHE_TIMEOUT)
+        
+        return validators.apply(self.respond(data))
+
+
+class AsyncCategoryDetailView(AsyncAPIView):
+    """API endpoint to retrieve a category."""
+    
+    authentication_required = False
+    
+    async def get(self, request, slug):
+        category = await Category.objects.filter(slug=slug).afirst()
+        if category is None:
+            return self.respond({'detail': 'Not found.'}, status.HTTP_404_NOT_FOUND)
+        
+        data = await sync_to_async(lambda: CategorySerializer(category, context={'request': request}).data)()
+        return self.respond(data)
@@ -0,0 +1,80 @@
+import hashlib
+import time
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.utils.http import http_date, parse_etags, parse_http_date_safe
+
+from .models import Category
+
+
+PRODUCT_PAYLOAD_KEY = 'catalog:product:{}:{}'
+
+
+def bump_category_versions(category_ids):
+    """
+    Invalidate every cached response that depends on the given categories.
+
+    The version is stored on the category row (``Category.save`` bumps it
+    too), so every process sees it. Versions are nanosecond timestamps, so
+    they double as the category's modification time.
+    """
+    Category.objects.filter(pk__in=set(category_ids)).update(cache_version=time.time_ns())
+
+
+class ProductValidators:
+    """
+    Conditional request validators (ETag / Last-Modified) for a product.
+
+    ``fields`` is the sparse fieldset of the request (see
+    ``apps.core.serializers.select_fields``): each fieldset is a separate
+    representation with its own ETag.
+    """
+
+    def __init__(self, product_id, category_id, updated_at, category_version, striped_stock=None, fields=None):
+        self.product_id = product_id
+        self.category_id = category_id
+        self.category_version = category_version
+
+        # The category version doubles as its modification time
+        category_modified = datetime.fromtimestamp(self.category_version / 1e9, tz=dt_timezone.utc)
+        self.last_modified = max(updated_at, category_modified)
+
+        # Stripe writes of hot products don't touch updated_at, so their total is part of the version
+        version = f'{product_id}:{updated_at.isoformat()}:{self.category_version}'
+        if striped_stock is not None:
+            version = f'{version}:{striped_stock}'
+        if fields is not None:
+            version = f'{version}:fields={",".join(fields)}'
+        digest = hashlib.sha1(version.encode()).hexdigest()
+        self.etag = f'"{digest[:32]}"'
+
+    @property
+    def payload_key(self):
+        """Cache key of the pre-rendered payload for this version (and fieldset)."""
+        return PRODUCT_PAYLOAD_KEY.format(self.product_id, self.etag.strip('"'))
+
+    def is_not_modified(self, request):
+        """Check the request's conditional headers against these validators."""
+        if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+        if if_none_match:
+            etags = parse_etags(if_none_match)
+            return '*' in etags or self.etag in etags
+
+        if_modified_since = request.META.get('HTTP_IF_MODIFIED_SINCE')
+        if if_modified_since:
+            since = parse_http_date_safe(if_modified_since)
+            return since is not None and int(self.last_modified.timestamp()) <= since
+
+        return False
+
+    def apply(self, response):
+        """Set caching headers on the response."""
+        response['ETag'] = self.etag
+        response['Last-Modified'] = http_date(self.last_modified.timestamp())
+        response['Cache-Control'] = (
+            f'public, max-age={settings.CATALOG_CACHE_MAX_AGE}, '
+            f's-maxage={settings.CATALOG_CACHE_S_MAXAGE}'
+        )
+        response['Surrogate-Key'] = f'products product-{self.product_id} category-{self.category_id}'
+        return response
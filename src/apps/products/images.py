@@ -0,0 +1,127 @@
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+
+# Fixed derivative sizes (bounding boxes, aspect ratio is preserved)
+IMAGE_VARIANTS = {
+    'thumbnail': (150, 150),
+    'card': (400, 400),
+    'detail': (1200, 1200),
+}
+
+# Output formats and the Pillow options used to encode them
+IMAGE_FORMATS = {
+    'webp': ('WEBP', {'quality': 80, 'method': 6}),
+    'jpeg': ('JPEG', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+VARIANTS_DIR = 'products/variants'
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    """Return the shared worker pool, creating it on first use."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.PRODUCT_IMAGE_WORKERS,
+                thread_name_prefix='product-images'
+            )
+        return _executor
+
+
+def needs_variants(product):
+    """Check if the stored derivatives are out of date for the product image."""
+    source = product.image_variants.get('source') if product.image_variants else None
+    return (product.image.name or None) != source
+
+
+def render_variants(image_name):
+    """
+    Generate every derivative of an image and return their URLs and dimensions.
+
+    The result is stored as-is in ``Product.image_variants``.
+    """
+    with default_storage.open(image_name, 'rb') as f:
+        original = Image.open(f)
+        original = ImageOps.exif_transpose(original)
+        original.load()
+
+    if original.mode not in ('RGB', 'L'):
+        original = original.convert('RGB')
+
+    stem = os.path.splitext(os.path.basename(image_name))[0]
+    variants = {'source': image_name}
+
+    for variant, size in IMAGE_VARIANTS.items():
+        image = original.copy()
+        image.thumbnail(size, Image.LANCZOS)
+
+        entry = {'width': image.width, 'height': image.height}
+        for ext, (pil_format, options) in IMAGE_FORMATS.items():
+            buffer = BytesIO()
+            image.save(buffer, pil_format, **options)
+
+            path = f'{VARIANTS_DIR}/{stem}-{variant}.{ext}'
+            if default_storage.exists(path):
+                default_storage.delete(path)
+            path = default_storage.save(path, ContentFile(buffer.getvalue()))
+            entry[ext] = default_storage.url(path)
+
+        variants[variant] = entry
+
+    return variants
+
+
+def generate_variants(product_id, force=False):
+    """
+    Build and store the derivatives of one product.
+
+    Returns True if derivatives were (re)generated.
+    """
+    from .models import Product
+
+    product = Product.objects.filter(pk=product_id).only('id', 'image', 'image_variants').first()
+    if product is None or not (force or needs_variants(product)):
+        return False
+
+    queryset = Product.objects.filter(pk=product_id)
+    if product.image:
+        variants = render_variants(product.image.name)
+        # Skip the write if the image was replaced while we were rendering
+        queryset = queryset.filter(image=product.image.name)
+    else:
+        variants = {}
+
+    # Bump updated_at so cached detail responses pick up the new URLs
+    queryset.update(image_variants=variants, updated_at=timezone.now())
+    return True
+
+
+def _generate_in_worker(product_id):
+    try:
+        generate_variants(product_id)
+    except Exception:
+        logger.exception('Failed to generate image variants for product %s', product_id)
+    finally:
+        close_old_connections()
+
+
+def schedule_variants(product_id):
+    """Generate derivatives in the worker pool once the current transaction commits."""
+    transaction.on_commit(lambda: _get_executor().submit(_generate_in_worker, product_id))
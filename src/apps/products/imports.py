@@ -0,0 +1,246 @@
+"""
+Bulk product import from CSV or JSON lines.
+
+Rows are processed in chunks of ``PRODUCT_IMPORT_CHUNK_SIZE``. Each chunk is
+validated column by column (one converter per column over every row instead
+of a serializer per row), its category names or slugs are resolved with one
+query, its slugs are assigned in one batch (see ``slugs.py``) and its valid
+rows are inserted with a single ``bulk_create``, together with their
+opening ``import`` stock movements. Invalid rows are skipped and reported
+with their line number.
+
+Columns: ``name``, ``description``, ``price``, ``category`` (name or slug),
+and optionally ``stock``, ``is_active`` and ``is_featured``.
+"""
+import csv
+import io
+import json
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+
+from .ledger import StockLedger
+from .models import Category, Product
+from .slugs import unique_slugs
+
+FORMATS = ('csv', 'jsonl')
+
+TRUE_VALUES = {'1', 'true', 'yes', 'y', 't'}
+FALSE_VALUES = {'0', 'false', 'no', 'n', 'f', ''}
+
+
+class RowError(ValueError):
+    pass
+
+
+def _text(max_length=None, required=True):
+    def convert(value):
+        value = '' if value is None else str(value).strip()
+        if required and not value:
+            raise RowError('This field is required.')
+        if max_length and len(value) > max_length:
+            raise RowError(f'Ensure this field has no more than {max_length} characters.')
+        return value
+    return convert
+
+
+def _price(value):
+    if value is None or value == '':
+        raise RowError('This field is required.')
+    try:
+        price = Decimal(str(value).strip())
+    except (InvalidOperation, TypeError):
+        raise RowError('A valid number is required.')
+    if not price.is_finite() or price <= 0:
+        raise RowError('Price must be greater than 0.')
+    price = price.quantize(Decimal('0.01'))
+    if price.adjusted() >= 8:
+        raise RowError('Ensure that there are no more than 10 digits in total.')
+    return price
+
+
+def _stock(value):
+    if value is None or value == '':
+        return 0
+    try:
+        stock = int(value)
+    except (TypeError, ValueError):
+        raise RowError('A valid integer is required.')
+    if stock < 0:
+        raise RowError('Stock cannot be negative.')
+    return stock
+
+
+def _boolean(default):
+    def convert(value):
+        if value is None:
+            return default
+        if isinstance(value, bool):
+            return value
+        value = str(value).strip().lower()
+        if value in TRUE_VALUES:
+            return True
+        if value in FALSE_VALUES:
+            return default if value == '' else False
+        raise RowError('Must be a valid boolean.')
+    return convert
+
+
+CONVERTERS = {
+    'name': _text(max_length=200),
+    'description': _text(),
+    'price': _price,
+    'stock': _stock,
+    'category': _text(),
+    'is_active': _boolean(True),
+    'is_featured': _boolean(False),
+}
+
+
+class ImportResult:
+    """Outcome of an import: rows read, products created and per-row errors."""
+    
+    def __init__(self):
+        self.total = 0
+        self.valid = 0
+        self.created = 0
+        self.errors = []
+    
+    def add_error(self, line, errors):
+        self.errors.append({'row': line, 'errors': errors})
+    
+    def as_dict(self):
+        return {
+            'total': self.total,
+            'valid': self.valid,
+            'created': self.created,
+            'failed': len(self.errors),
+            'errors': self.errors,
+        }
+
+
+def read_rows(fileobj, file_format):
+    """Yield ``(line_number, row)`` pairs from a binary CSV or JSON lines file."""
+    text = io.TextIOWrapper(fileobj, encoding='utf-8-sig', newline='')
+    if file_format == 'csv':
+        reader = csv.DictReader(text)
+        for row in reader:
+            yield reader.line_num, row
+        return
+    
+    for line_number, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            row = None
+        yield line_number, row if isinstance(row, dict) else {'__invalid__': 'Invalid JSON object.'}
+
+
+def validate_chunk(rows):
+    """
+    Convert a chunk of raw rows column by column.
+    
+    Returns the converted values per row and the errors per row index.
+    """
+    errors = {}
+    for index, row in enumerate(rows):
+        if '__invalid__' in row:
+            errors[index] = {'non_field_errors': [row['__invalid__']]}
+    invalid = set(errors)
+    
+    columns = {}
+    for field, convert in CONVERTERS.items():
+        values = []
+        for index, row in enumerate(rows):
+            if index in invalid:
+                values.append(None)
+                continue
+            try:
+                values.append(convert(row.get(field)))
+            except RowError as e:
+                values.append(None)
+                errors.setdefault(index, {})[field] = [str(e)]
+        columns[field] = values
+    
+    return [dict(zip(columns, values)) for values in zip(*columns.values())], errors
+
+
+def resolve_categories(values):
+    """Map category names and slugs to category ids with one query."""
+    values = set(values)
+    categories = Category.objects.filter(Q(name__in=values) | Q(slug__in=values)).values_list('id', 'name', 'slug')
+    mapping = {}
+    for category_id, name, slug in categories:
+        mapping[slug] = category_id
+        # Names win over slugs of other categories
+        mapping[name] = category_id
+    return mapping
+
+
+def _insert(products, user):
+    slugs = unique_slugs([product.name for product in products], Product.objects.all())
+    for product, slug in zip(products, slugs):
+        product.slug = slug
+    with transaction.atomic():
+        Product.objects.bulk_create(products)
+        ledger = StockLedger('import', user)
+        for product in products:
+            ledger.add(product.pk, product.stock)
+        ledger.write()
+
+
+def import_chunk(rows, lines, user, result, dry_run=False):
+    """Validate and insert one chunk of rows."""
+    values, errors = validate_chunk(rows)
+    categories = resolve_categories(row['category'] for row in values if row['category'])
+    
+    products = []
+    for index, row in enumerate(values):
+        if index in errors:
+            continue
+        category_id = categories.get(row['category'])
+        if category_id is None:
+            errors[index] = {'category': [f'Unknown category "{row["category"]}".']}
+            continue
+        products.append(Product(
+            name=row['name'],
+            description=row['description'],
+            price=row['price'],
+            stock=row['stock'],
+            category_id=category_id,
+            is_active=row['is_active'],
+            is_featured=row['is_featured'],
+            created_by=user,
+        ))
+    
+    for index in sorted(errors):
+        result.add_error(lines[index], errors[index])
+    result.valid += len(products)
+    if dry_run or not products:
+        return
+    
+    try:
+        _insert(products, user)
+    except IntegrityError:
+        # A concurrent writer took one of the slugs; pick them again
+        _insert(products, user)
+    result.created += len(products)
+
+
+def import_products(fileobj, file_format, user, dry_run=False, chunk_size=None):
+    """Import products from an uploaded file and return an ``ImportResult``."""
+    chunk_size = chunk_size or settings.PRODUCT_IMPORT_CHUNK_SIZE
+    result = ImportResult()
+    rows = read_rows(fileobj, file_format)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return result
+        result.total += len(chunk)
+        lines = [line for line, row in chunk]
+        import_chunk([row for line, row in chunk], lines, user, result, dry_run)
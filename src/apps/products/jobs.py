@@ -0,0 +1,17 @@
+from datetime import timedelta
+
+from apps.core.jobs import periodic_job
+
+from . import ledger, stock
+
+
+@periodic_job(interval=timedelta(minutes=1))
+def sync_striped_stock():
+    """Copy the stripe totals of striped (hot) products into ``Product.stock``."""
+    return {'updated': stock.sync_striped_stock()}
+
+
+@periodic_job(interval=timedelta(hours=1))
+def snapshot_stock():
+    """Snapshot the ledger balance of products that moved, bounding the movements ``balance`` scans."""
+    return {'snapshots': ledger.snapshot_stock()}
@@ -0,0 +1,107 @@
+"""
+Append-only stock ledger.
+
+Every change of a product's stock is also recorded as a ``StockMovement``.
+An operation (a checkout, a cancellation, a sync batch, an import chunk)
+collects its movements in a ``StockLedger`` and writes them with one
+``INSERT`` in the transaction that changes the stock.
+
+The ``snapshot_stock`` job stores the balance of every product that moved
+since the previous run as a ``StockSnapshot``, so the balance at any time is
+one snapshot plus the movements after it (``balance``). Snapshots only cover
+movements older than ``STOCK_SNAPSHOT_LAG_SECONDS``: a movement is assumed
+to be committed by then, so one whose transaction commits late isn't
+skipped.
+
+The ``reconcile_stock`` command compares ledger balances with the stock of
+products (see ``ledger_balances``).
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import F, Max, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import StockMovement, StockSnapshot
+
+
+class StockLedger:
+    """Stock movements of one operation, written together."""
+    
+    def __init__(self, reason, user=None):
+        self.reason = reason
+        self.user = user
+        self.movements = []
+    
+    def add(self, product_id, quantity):
+        if quantity:
+            self.movements.append(StockMovement(
+                product_id=product_id, quantity=quantity, reason=self.reason, user=self.user
+            ))
+    
+    def write(self, order_id=None):
+        """Insert the collected movements."""
+        for movement in self.movements:
+            movement.order_id = order_id
+        StockMovement.objects.bulk_create(self.movements, batch_size=settings.JOBS_BATCH_SIZE)
+        self.movements = []
+
+
+def balance(product_id, at=None):
+    """Return the ledger balance of a product, now or as of ``at``."""
+    snapshots = StockSnapshot.objects.filter(product_id=product_id)
+    movements = StockMovement.objects.filter(product_id=product_id)
+    if at is not None:
+        snapshots = snapshots.filter(taken_at__lte=at)
+        movements = movements.filter(created_at__lte=at)
+    
+    snapshot = snapshots.order_by('-movement_id').values('stock', 'movement_id').first()
+    if snapshot is None:
+        snapshot = {'stock': 0, 'movement_id': 0}
+    tail = movements.filter(id__gt=snapshot['movement_id']).aggregate(total=Sum('quantity'))['total']
+    return snapshot['stock'] + (tail or 0)
+
+
+def ledger_balances(products):
+    """Annotate a ``Product`` queryset with ``ledger_stock``, each product's current ledger balance."""
+    snapshots = StockSnapshot.objects.filter(product=OuterRef('pk')).order_by('-movement_id')
+    products = products.annotate(
+        snapshot_stock=Coalesce(Subquery(snapshots.values('stock')[:1]), 0),
+        snapshot_movement_id=Coalesce(Subquery(snapshots.values('movement_id')[:1]), 0),
+    )
+    tail = (
+        StockMovement.objects.filter(product=OuterRef('pk'), id__gt=OuterRef('snapshot_movement_id'))
+        .values('product')
+        .annotate(total=Sum('quantity'))
+        .values('total')
+    )
+    return products.annotate(ledger_stock=F('snapshot_stock') + Coalesce(Subquery(tail), 0))
+
+
+def snapshot_stock():
+    """
+    Snapshot the balance of the products that moved since the previous snapshots.
+    
+    Returns the number of snapshots written.
+    """
+    taken_at = timezone.now() - timedelta(seconds=settings.STOCK_SNAPSHOT_LAG_SECONDS)
+    # Each run covers every movement up to its last one, so only later movements are scanned
+    covered = StockSnapshot.objects.aggregate(last=Max('movement_id'))['last'] or 0
+    last = StockMovement.objects.filter(id__gt=covered, created_at__lte=taken_at).aggregate(last=Max('id'))['last']
+    if last is None:
+        return 0
+    
+    previous = StockSnapshot.objects.filter(product=OuterRef('product')).order_by('-movement_id')
+    tails = (
+        StockMovement.objects.filter(id__gt=covered, id__lte=last)
+        .values('product')
+        .annotate(moved=Sum('quantity'), previous=Coalesce(Subquery(previous.values('stock')[:1]), 0))
+        .values_list('product', 'previous', 'moved')
+    )
+    snapshots = [
+        StockSnapshot(product_id=product_id, stock=stock + moved, movement_id=last, taken_at=taken_at)
+        for product_id, stock, moved in tails
+    ]
+    StockSnapshot.objects.bulk_create(snapshots, batch_size=settings.JOBS_BATCH_SIZE)
+    return len(snapshots)
@@ -0,0 +1,85 @@
+import threading
+import time
+import uuid
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from apps.products.models import Category, Product
+from apps.products.stock import InsufficientStock, stripe_stock, take_stock
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure checkouts per second of a single product for several stripe counts. Each checkout '
+        'takes one unit in its own transaction and holds it open for --hold-ms, like the rest of a '
+        'checkout would. Run against PostgreSQL: SQLite serializes all writers.'
+    )
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--stripes',
+            type=int,
+            action='append',
+            help='Stripe count to measure (can be repeated; 1 = plain products row)',
+        )
+        parser.add_argument('--threads', type=int, default=16, help='Concurrent checkouts')
+        parser.add_argument('--seconds', type=float, default=5.0, help='How long each measurement runs')
+        parser.add_argument('--hold-ms', type=float, default=2.0, help='Time a checkout keeps its transaction open')
+    
+    def handle(self, *args, **options):
+        stripe_counts = options['stripes'] or [1, 2, 4, 8, 16]
+        if connection.vendor != 'postgresql':
+            self.stdout.write(self.style.WARNING(f'{connection.vendor} serializes writers; expect no scaling.'))
+        
+        vendor = get_user_model().objects.create_user(
+            email=f'benchmark-{uuid.uuid4().hex}@example.com', password=None, first_name='Benchmark', role='vendor'
+        )
+        category = Category.objects.create(name=f'Benchmark {uuid.uuid4().hex}')
+        product = Product.objects.create(
+            name='Benchmark product', description='Benchmark', price=Decimal('1.00'),
+            stock=10 ** 9, category=category, created_by=vendor
+        )
+        try:
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f'{options["threads"]} threads, {options["hold_ms"]} ms per checkout, {options["seconds"]}s per run'
+            ))
+            baseline = None
+            for stripes in stripe_counts:
+                stripe_stock(product, stripes)
+                product.refresh_from_db()
+                rate = self.measure(product, options['threads'], options['seconds'], options['hold_ms'] / 1000)
+                baseline = baseline or rate
+                self.stdout.write(f'{stripes:>4} stripe(s) {rate:10,.0f} checkouts/s  x{rate / baseline:.1f}')
+        finally:
+            product.delete()
+            category.delete()
+            vendor.delete()
+    
+    def measure(self, product, threads, seconds, hold):
+        """Return the checkouts per second achieved by ``threads`` concurrent buyers."""
+        deadline = time.perf_counter() + seconds
+        counts = [0] * threads
+        
+        def buyer(index):
+            try:
+                while time.perf_counter() < deadline:
+                    try:
+                        with transaction.atomic():
+                            take_stock(product, 1)
+                            time.sleep(hold)
+                    except InsufficientStock:
+                        break
+                    counts[index] += 1
+            finally:
+                connection.close()
+        
+        workers = [threading.Thread(target=buyer, args=(index,)) for index in range(threads)]
+        started = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        return sum(counts) / (time.perf_counter() - started)
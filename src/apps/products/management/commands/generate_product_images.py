@@ -0,0 +1,74 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import django
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from apps.products.models import Product
+from apps.products.images import generate_variants
+
+
+def _init_worker():
+    """Give every worker process its own Django setup and DB connections."""
+    django.setup()
+    connections.close_all()
+
+
+def _process_chunk(product_ids, force):
+    generated, failed = 0, []
+    for product_id in product_ids:
+        try:
+            if generate_variants(product_id, force=force):
+                generated += 1
+        except Exception as e:
+            failed.append((product_id, str(e)))
+    return generated, failed
+
+
+class Command(BaseCommand):
+    help = 'Generate image derivatives for existing products in parallel processes'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--processes',
+            type=int,
+            default=os.cpu_count() or 1,
+            help='Number of worker processes (default: CPU count)',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=100,
+            help='Number of products handed to a worker at a time',
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Regenerate derivatives even if they are up to date',
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        force = options['force']
+
+        product_ids = list(
+            Product.objects.exclude(image='').exclude(image__isnull=True)
+            .order_by('id').values_list('id', flat=True)
+        )
+        chunks = [product_ids[i:i + chunk_size] for i in range(0, len(product_ids), chunk_size)]
+        self.stdout.write(f'Processing {len(product_ids)} products in {len(chunks)} chunks...')
+
+        # Connections must not be shared with forked workers
+        connections.close_all()
+
+        generated = 0
+        with ProcessPoolExecutor(max_workers=options['processes'], initializer=_init_worker) as pool:
+            futures = [pool.submit(_process_chunk, chunk, force) for chunk in chunks]
+            for future in as_completed(futures):
+                chunk_generated, failed = future.result()
+                generated += chunk_generated
+                for product_id, error in failed:
+                    self.stderr.write(self.style.ERROR(f'Product {product_id}: {error}'))
+
+        self.stdout.write(self.style.SUCCESS(f'Generated derivatives for {generated} products'))
@@ -0,0 +1,41 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.products.imports import FORMATS, import_products
+
+
+class Command(BaseCommand):
+    help = 'Create products in bulk from a CSV or JSON lines file'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV or JSON lines file')
+        parser.add_argument('--vendor', required=True, help='Email of the vendor owning the products')
+        parser.add_argument('--format', dest='file_format', choices=FORMATS, help='File format (default: from the extension)')
+        parser.add_argument('--dry-run', action='store_true', help='Validate the file without creating products')
+        parser.add_argument('--chunk-size', type=int, help='Rows per batch (default: PRODUCT_IMPORT_CHUNK_SIZE)')
+    
+    def handle(self, *args, **options):
+        try:
+            vendor = get_user_model().objects.get(email=options['vendor'])
+        except get_user_model().DoesNotExist:
+            raise CommandError(f'No user with email {options["vendor"]}.')
+        
+        file_format = options['file_format'] or options['path'].rsplit('.', 1)[-1].lower()
+        if file_format == 'ndjson':
+            file_format = 'jsonl'
+        if file_format not in FORMATS:
+            raise CommandError(f'Unknown format {file_format}; use --format.')
+        
+        with open(options['path'], 'rb') as f:
+            result = import_products(
+                f, file_format, vendor, dry_run=options['dry_run'], chunk_size=options['chunk_size']
+            )
+        
+        for error in result.errors:
+            messages = '; '.join(f'{field}: {" ".join(errors)}' for field, errors in error['errors'].items())
+            self.stderr.write(f'Line {error["row"]}: {messages}')
+        
+        self.stdout.write(self.style.SUCCESS(
+            f'{result.total} row(s) read, {result.valid} valid, {result.created} product(s) created, '
+            f'{len(result.errors)} error(s).'
+        ))
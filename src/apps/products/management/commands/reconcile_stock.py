@@ -0,0 +1,68 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from django.db.models import Max, Min, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+from apps.products.ledger import ledger_balances
+from apps.products.models import Product, ProductStockStripe
+
+
+def _mismatches(products):
+    """Return ``(id, ledger stock, stock)`` of the products whose ledger balance differs from their stock."""
+    stripes = (
+        ProductStockStripe.objects.filter(product=OuterRef('pk'))
+        .values('product')
+        .annotate(total=Sum('stock'))
+        .values('total')
+    )
+    rows = (
+        ledger_balances(products)
+        .annotate(striped_stock=Coalesce(Subquery(stripes), 0))
+        .values_list('pk', 'ledger_stock', 'stock', 'stock_stripes', 'striped_stock')
+    )
+    # Striped products keep their stock in the stripes (see stock.py)
+    return [
+        (pk, ledger_stock, striped_stock if stock_stripes else stock)
+        for pk, ledger_stock, stock, stock_stripes, striped_stock in rows
+        if ledger_stock != (striped_stock if stock_stripes else stock)
+    ]
+
+
+def _check_chunk(start, end):
+    try:
+        return _mismatches(Product.objects.filter(pk__gte=start, pk__lt=end))
+    finally:
+        close_old_connections()
+
+
+class Command(BaseCommand):
+    help = 'Verify that the stock ledger balance of every product matches its stock'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=settings.STOCK_RECONCILE_CHUNK_SIZE, help='Product ids per chunk')
+        parser.add_argument('--workers', type=int, default=settings.STOCK_RECONCILE_WORKERS, help='Chunks checked at once')
+    
+    def handle(self, *args, **options):
+        bounds = Product.objects.aggregate(first=Min('pk'), last=Max('pk'))
+        if bounds['first'] is None:
+            self.stdout.write('No products.')
+            return
+        
+        size = max(options['chunk_size'], 1)
+        chunks = [(start, start + size) for start in range(bounds['first'], bounds['last'] + 1, size)]
+        with ThreadPoolExecutor(max_workers=max(options['workers'], 1)) as executor:
+            suspects = [pk for found in executor.map(_check_chunk, *zip(*chunks)) for pk, _, _ in found]
+        
+        # Check the suspects again, so a product corrected while the chunks ran isn't reported
+        mismatches = _mismatches(Product.objects.filter(pk__in=suspects)) if suspects else []
+        for pk, ledger_stock, stock in mismatches:
+            self.stdout.write(self.style.ERROR(f'Product {pk}: ledger {ledger_stock}, stock {stock}'))
+        
+        message = f'Checked {len(chunks)} chunks of {size} product ids: {len(mismatches)} mismatches.'
+        if mismatches:
+            self.stdout.write(self.style.WARNING(message))
+        else:
+            self.stdout.write(self.style.SUCCESS(message))
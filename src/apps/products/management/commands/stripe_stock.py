@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.products.models import Product
+from apps.products.stock import stripe_stock
+
+
+class Command(BaseCommand):
+    help = 'Split the stock of a hot product over several counter rows, or fold it back with --stripes 0'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('slug', help='Slug of the product')
+        parser.add_argument('--stripes', type=int, required=True, help='Number of stripes (0 to turn striping off)')
+    
+    def handle(self, *args, **options):
+        if not 0 <= options['stripes'] <= 256:
+            raise CommandError('--stripes must be between 0 and 256.')
+        try:
+            product = Product.objects.get(slug=options['slug'])
+        except Product.DoesNotExist:
+            raise CommandError(f'No product with slug {options["slug"]}.')
+        
+        total = stripe_stock(product, options['stripes'])
+        if options['stripes'] > 1:
+            self.stdout.write(self.style.SUCCESS(f'{product.name}: {total} in stock over {options["stripes"]} stripes.'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'{product.name}: {total} in stock, striping off.'))
@@ -0,0 +1,44 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.products.imports import FORMATS, read_rows
+from apps.products.sync import sync_products
+
+
+class Command(BaseCommand):
+    help = 'Update the stock and price of products in bulk from a CSV or JSON lines file'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV or JSON lines file with sku or slug, stock and price columns')
+        parser.add_argument('--vendor', required=True, help='Email of the vendor owning the products')
+        parser.add_argument('--format', dest='file_format', choices=FORMATS, help='File format (default: from the extension)')
+        parser.add_argument('--dry-run', action='store_true', help='Report the changes without writing them')
+        parser.add_argument('--batch-size', type=int, help='Entries per UPDATE (default: PRODUCT_SYNC_BATCH_SIZE)')
+    
+    def handle(self, *args, **options):
+        try:
+            vendor = get_user_model().objects.get(email=options['vendor'])
+        except get_user_model().DoesNotExist:
+            raise CommandError(f'No user with email {options["vendor"]}.')
+        
+        file_format = options['file_format'] or options['path'].rsplit('.', 1)[-1].lower()
+        if file_format == 'ndjson':
+            file_format = 'jsonl'
+        if file_format not in FORMATS:
+            raise CommandError(f'Unknown format {file_format}; use --format.')
+        
+        with open(options['path'], 'rb') as f:
+            result = sync_products(
+                read_rows(f, file_format), vendor, dry_run=options['dry_run'], batch_size=options['batch_size']
+            )
+        
+        for error in result.errors:
+            messages = '; '.join(f'{field}: {" ".join(errors)}' for field, errors in error['errors'].items())
+            self.stderr.write(f'Line {error["row"]}: {messages}')
+        
+        summary = result.as_dict()
+        self.stdout.write(self.style.SUCCESS(
+            f'{summary["total"]} entr(ies) read, {summary["updated"]} product(s) updated '
+            f'({summary["stock_changed"]} stock, {summary["price_changed"]} price), '
+            f'{summary["unchanged"]} unchanged, {summary["failed"]} error(s).'
+        ))
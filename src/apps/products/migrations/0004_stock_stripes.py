@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:25
+
+import django.core.validators
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0003_product_sku'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='stock_stripes',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.CreateModel(
+            name='ProductStockStripe',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('stripe', models.PositiveSmallIntegerField()),
+                ('stock', models.IntegerField(default=0, validators=[django.core.validators.MinValueValidator(0)])),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stock_stripe_rows', to='products.product')),
+            ],
+            options={
+                'verbose_name': 'Product Stock Stripe',
+                'verbose_name_plural': 'Product Stock Stripes',
+                'db_table': 'product_stock_stripes',
+                'constraints': [models.UniqueConstraint(fields=('product', 'stripe'), name='product_stock_stripes_uniq'), models.CheckConstraint(condition=models.Q(('stock__gte', 0)), name='product_stock_stripes_stock_gte_0')],
+            },
+        ),
+    ]
@@ -0,0 +1,75 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:28
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Sum
+
+
+def record_opening_balances(apps, schema_editor):
+    """Start the ledger of every existing product with its current stock."""
+    Product = apps.get_model('products', 'Product')
+    ProductStockStripe = apps.get_model('products', 'ProductStockStripe')
+    StockMovement = apps.get_model('products', 'StockMovement')
+    striped = dict(
+        ProductStockStripe.objects.values('product').annotate(total=Sum('stock')).values_list('product', 'total')
+    )
+    batch = []
+    products = Product.objects.values_list('pk', 'stock', 'stock_stripes').iterator(chunk_size=2000)
+    for product_id, stock, stripes in products:
+        if stripes:
+            stock = striped.get(product_id, 0)
+        if not stock:
+            continue
+        batch.append(StockMovement(product_id=product_id, quantity=stock, reason='opening'))
+        if len(batch) >= 2000:
+            StockMovement.objects.bulk_create(batch)
+            batch = []
+    StockMovement.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0004_stock_stripes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StockMovement',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('quantity', models.IntegerField(help_text='Units added (positive) or removed (negative).')),
+                ('reason', models.CharField(choices=[('opening', 'Opening balance'), ('order', 'Order'), ('cancellation', 'Order cancellation'), ('adjustment', 'Adjustment'), ('import', 'Import'), ('sync', 'Inventory sync')], max_length=20)),
+                ('order_id', models.BigIntegerField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('product', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='stock_movements', to='products.product')),
+                ('user', models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Stock Movement',
+                'verbose_name_plural': 'Stock Movements',
+                'db_table': 'stock_movements',
+                'ordering': ['-id'],
+                'indexes': [models.Index(fields=['product', 'id'], name='stock_movements_product_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='StockSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('stock', models.IntegerField()),
+                ('movement_id', models.BigIntegerField()),
+                ('taken_at', models.DateTimeField()),
+                ('product', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='stock_snapshots', to='products.product')),
+            ],
+            options={
+                'verbose_name': 'Stock Snapshot',
+                'verbose_name_plural': 'Stock Snapshots',
+                'db_table': 'stock_snapshots',
+                'indexes': [models.Index(fields=['product', '-movement_id'], name='stock_snapshots_product_idx')],
+            },
+        ),
+        migrations.RunPython(record_opening_balances, migrations.RunPython.noop),
+    ]
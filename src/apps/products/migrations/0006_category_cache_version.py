@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:00
+
+import time
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0005_stock_ledger'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='cache_version',
+            field=models.BigIntegerField(default=time.time_ns, editable=False),
+        ),
+    ]
@@ -1,7 +1,10 @@
+import time
+
 from django.db import models
 from django.conf import settings
 from django.core.validators import MinValueValidator
 from django.utils.text import slugify
+from .slugs import unique_slugs
 
 
 class Category(models.Model):
@@ -11,6 +14,8 @@ class Category(models.Model):
     slug = models.SlugField(max_length=100, unique=True, blank=True)
     description = models.TextField(blank=True)
     is_active = models.BooleanField(default=True)
+    # Bumped whenever cached responses of the category's products go stale (see caching.py)
+    cache_version = models.BigIntegerField(default=time.time_ns, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -26,6 +31,8 @@ class Category(models.Model):
     def save(self, *args, **kwargs):
         if not self.slug:
             self.slug = slugify(self.name)
+        # Invalidate cached catalog responses of the category
+        self.cache_version = time.time_ns()
         super().save(*args, **kwargs)
 
 
@@ -34,11 +41,15 @@ class Product(models.Model):
     
     name = models.CharField(max_length=200)
     slug = models.SlugField(max_length=200, unique=True, blank=True)
+    sku = models.CharField(max_length=64, blank=True, null=True)
     description = models.TextField()
     price = models.DecimalField(max_digits=10, decimal_places=2, validators=[MinValueValidator(0)])
     stock = models.IntegerField(default=0, validators=[MinValueValidator(0)])
+    # Hot SKUs keep their stock in this many ProductStockStripe rows (see stock.py); 0 = off
+    stock_stripes = models.PositiveSmallIntegerField(default=0, editable=False)
     category = models.ForeignKey(Category, on_delete=models.CASCADE, related_name='products')
     image = models.ImageField(upload_to='products/', blank=True, null=True)
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
     
     is_active = models.BooleanField(default=True)
     is_featured = models.BooleanField(default=False)
@@ -52,16 +63,120 @@ class Product(models.Model):
         verbose_name = 'Product'
         verbose_name_plural = 'Products'
         ordering = ['-created_at']
+        constraints = [
+            # SKUs come from the vendor's own systems, so they are unique per vendor
+            models.UniqueConstraint(fields=['created_by', 'sku'], name='products_vendor_sku_uniq'),
+        ]
     
     def __str__(self):
         return self.name
     
     def save(self, *args, **kwargs):
         if not self.slug:
-            self.slug = slugify(self.name)
+            self.slug = unique_slugs([self.name], Product.objects.all())[0]
         super().save(*args, **kwargs)
     
+    @property
+    def available_stock(self):
+        """Current stock, summing the stripes of a striped product (see stock.py)."""
+        from .stock import available_stock
+        return available_stock(self)
+    
     @property
     def in_stock(self):
         """Check if product is in stock."""
-        return self.stock > 0
\ No newline at end of file
+        return self.available_stock > 0
+
+
+class ProductStockStripe(models.Model):
+    """
+    One share of the stock of a hot product.
+    
+    Checkouts decrement a random stripe, so concurrent buyers of the product
+    don't all wait on the lock of its ``products`` row.
+    """
+    
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='stock_stripe_rows')
+    stripe = models.PositiveSmallIntegerField()
+    stock = models.IntegerField(default=0, validators=[MinValueValidator(0)])
+    
+    class Meta:
+        db_table = 'product_stock_stripes'
+        verbose_name = 'Product Stock Stripe'
+        verbose_name_plural = 'Product Stock Stripes'
+        constraints = [
+            models.UniqueConstraint(fields=['product', 'stripe'], name='product_stock_stripes_uniq'),
+            models.CheckConstraint(condition=models.Q(stock__gte=0), name='product_stock_stripes_stock_gte_0'),
+        ]
+    
+    def __str__(self):
+        return f"{self.product} stripe {self.stripe}: {self.stock}"
+
+
+class StockMovement(models.Model):
+    """
+    One change of a product's stock, in an append-only ledger.
+    
+    Rows are never updated or deleted, and outlive their product and user.
+    """
+    
+    REASON_CHOICES = [
+        ('opening', 'Opening balance'),
+        ('order', 'Order'),
+        ('cancellation', 'Order cancellation'),
+        ('adjustment', 'Adjustment'),
+        ('import', 'Import'),
+        ('sync', 'Inventory sync'),
+    ]
+    
+    product = models.ForeignKey(
+        Product, on_delete=models.DO_NOTHING, db_constraint=False, related_name='stock_movements'
+    )
+    quantity = models.IntegerField(help_text='Units added (positive) or removed (negative).')
+    reason = models.CharField(max_length=20, choices=REASON_CHOICES)
+    # No foreign key: orders is partitioned and archived
+    order_id = models.BigIntegerField(null=True, blank=True)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.DO_NOTHING, db_constraint=False,
+        null=True, blank=True, related_name='+'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'stock_movements'
+        verbose_name = 'Stock Movement'
+        verbose_name_plural = 'Stock Movements'
+        ordering = ['-id']
+        indexes = [
+            models.Index(fields=['product', 'id'], name='stock_movements_product_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.quantity:+d} {self.product_id} ({self.reason})"
+    
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValueError('Stock movements are append-only.')
+        super().save(*args, **kwargs)
+
+
+class StockSnapshot(models.Model):
+    """A product's ledger balance over its movements up to ``movement_id``."""
+    
+    product = models.ForeignKey(
+        Product, on_delete=models.DO_NOTHING, db_constraint=False, related_name='stock_snapshots'
+    )
+    stock = models.IntegerField()
+    movement_id = models.BigIntegerField()
+    taken_at = models.DateTimeField()
+    
+    class Meta:
+        db_table = 'stock_snapshots'
+        verbose_name = 'Stock Snapshot'
+        verbose_name_plural = 'Stock Snapshots'
+        indexes = [
+            models.Index(fields=['product', '-movement_id'], name='stock_snapshots_product_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.product_id}: {self.stock} at {self.taken_at:%Y-%m-%d %H:%M}"
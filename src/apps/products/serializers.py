@@ -1,8 +1,59 @@
 from rest_framework import serializers
+from .imports import FORMATS
 from .models import Category, Product
+from .stock import current_stock
+from apps.core.serializers import CompiledSerializerMixin, SparseFieldsetMixin
 
 
-class CategorySerializer(serializers.ModelSerializer):
+class ImageVariantField(serializers.Field):
+    """
+    Read-only field exposing one precomputed derivative of ``Product.image``.
+    
+    Falls back to the original image until the derivatives are generated.
+    """
+    
+    def __init__(self, variant, **kwargs):
+        self.variant = variant
+        kwargs.setdefault('source', '*')
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+    
+    def _build_url(self, url):
+        request = self.context.get('request')
+        if request is not None:
+            return request.build_absolute_uri(url)
+        return url
+    
+    def to_representation(self, product):
+        return self.represent(product.image.name, product.image_variants)
+    
+    def represent(self, image_name, variants):
+        """Build the representation from the stored image name and variants."""
+        if not image_name:
+            return None
+        
+        entry = (variants or {}).get(self.variant)
+        if entry is None:
+            return {
+                'url': self._build_url(Product._meta.get_field('image').storage.url(image_name)),
+                'fallback_url': None,
+                'width': None,
+                'height': None,
+            }
+        
+        return {
+            'url': self._build_url(entry['webp']),
+            'fallback_url': self._build_url(entry['jpeg']),
+            'width': entry['width'],
+            'height': entry['height'],
+        }
+    
+    def compile_source(self, prefix):
+        """Return the columns and function used by compiled serializers."""
+        return (f'{prefix}image', f'{prefix}image_variants'), self.represent
+
+
+class CategorySerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for Category model."""
     
     product_count = serializers.SerializerMethodField()
@@ -17,44 +68,59 @@ class CategorySerializer(serializers.ModelSerializer):
         return obj.products.filter(is_active=True).count()
 
 
-class ProductSerializer(serializers.ModelSerializer):
+# Columns ``current_stock`` reads: striped products report the sum of their stripes
+STOCK_COLUMNS = ('id', 'stock', 'stock_stripes')
+
+
+class ProductSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for Product model."""
     
     category_name = serializers.CharField(source='category.name', read_only=True)
+    stock = serializers.IntegerField(source='available_stock', read_only=True)
     in_stock = serializers.BooleanField(read_only=True)
     created_by_name = serializers.CharField(source='created_by.get_full_name', read_only=True)
+    preview = ImageVariantField('detail')
     
     class Meta:
         model = Product
         fields = (
-            'id', 'name', 'slug', 'description', 'price', 'stock', 
-            'category', 'category_name', 'image', 'is_active', 'is_featured',
+            'id', 'name', 'slug', 'sku', 'description', 'price', 'stock', 
+            'category', 'category_name', 'image', 'preview', 'is_active', 'is_featured',
             'in_stock', 'created_by', 'created_by_name', 'created_at', 'updated_at'
         )
         read_only_fields = ('id', 'slug', 'created_by', 'created_at', 'updated_at')
+        # Columns behind the computed fields, used to load only what a sparse fieldset needs
+        compiled_sources = {
+            'stock': (STOCK_COLUMNS, current_stock),
+            'in_stock': (STOCK_COLUMNS, lambda *columns: current_stock(*columns) > 0),
+            'created_by_name': (
+                ('created_by__first_name', 'created_by__last_name'),
+                lambda first, last: f"{first} {last}".strip(),
+            ),
+        }
     
     def validate_price(self, value):
         """Validate that price is positive."""
         if value <= 0:
             raise serializers.ValidationError("Price must be greater than 0.")
         return value
-    
-    def validate_stock(self, value):
-        """Validate that stock is not negative."""
-        if value < 0:
-            raise serializers.ValidationError("Stock cannot be negative.")
-        return value
 
 
-class ProductListSerializer(serializers.ModelSerializer):
+class ProductListSerializer(CompiledSerializerMixin, serializers.ModelSerializer):
     """Lightweight serializer for product list."""
     
     category_name = serializers.CharField(source='category.name', read_only=True)
+    stock = serializers.IntegerField(source='available_stock', read_only=True)
     in_stock = serializers.BooleanField(read_only=True)
+    thumbnail = ImageVariantField('card')
     
     class Meta:
         model = Product
-        fields = ('id', 'name', 'slug', 'price', 'stock', 'category_name', 'image', 'is_active', 'is_featured', 'in_stock')
+        fields = ('id', 'name', 'slug', 'price', 'stock', 'category_name', 'image', 'thumbnail', 'is_active', 'is_featured', 'in_stock')
+        compiled_sources = {
+            'stock': (STOCK_COLUMNS, current_stock),
+            'in_stock': (STOCK_COLUMNS, lambda *columns: current_stock(*columns) > 0),
+        }
 
 
 class ProductCreateUpdateSerializer(serializers.ModelSerializer):
@@ -62,7 +128,7 @@ class ProductCreateUpdateSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Product
-        fields = ('name', 'description', 'price', 'stock', 'category', 'image', 'is_active', 'is_featured')
+        fields = ('name', 'sku', 'description', 'price', 'stock', 'category', 'image', 'is_active', 'is_featured')
     
     def validate_price(self, value):
         """Validate that price is positive."""
@@ -74,4 +140,54 @@ class ProductCreateUpdateSerializer(serializers.ModelSerializer):
         """Validate that stock is not negative."""
         if value < 0:
             raise serializers.ValidationError("Stock cannot be negative.")
-        return value
\ No newline at end of file
+        return value
+    
+    def validate_sku(self, value):
+        """Store blank SKUs as NULL and keep SKUs unique per vendor."""
+        if not value:
+            return None
+        owner = self.instance.created_by if self.instance else self.context['request'].user
+        products = Product.objects.filter(created_by=owner, sku=value)
+        if self.instance:
+            products = products.exclude(pk=self.instance.pk)
+        if products.exists():
+            raise serializers.ValidationError("A product with this SKU already exists.")
+        return value
+
+
+class ProductImportSerializer(serializers.Serializer):
+    """Upload of a product import file."""
+    
+    file = serializers.FileField()
+    file_format = serializers.ChoiceField(choices=FORMATS, required=False)
+    dry_run = serializers.BooleanField(default=False)
+    
+    def validate(self, attrs):
+        """Infer the format from the file name when it isn't given."""
+        if not attrs.get('file_format'):
+            extension = attrs['file'].name.rsplit('.', 1)[-1].lower()
+            if extension == 'ndjson':
+                extension = 'jsonl'
+            if extension not in FORMATS:
+                raise serializers.ValidationError({'file_format': f'Choose one of: {", ".join(FORMATS)}.'})
+            attrs['file_format'] = extension
+        return attrs
+
+
+class ProductSyncSerializer(ProductImportSerializer):
+    """
+    Stock and price changes, as a JSON ``items`` list or an uploaded file.
+    
+    Entries are validated by ``sync_products`` rather than by a serializer
+    each, since a sync carries many thousands of them.
+    """
+    
+    items = serializers.ListField(child=serializers.DictField(), required=False, allow_empty=False)
+    file = serializers.FileField(required=False)
+    
+    def validate(self, attrs):
+        if ('items' in attrs) == ('file' in attrs):
+            raise serializers.ValidationError('Send either items or a file.')
+        if 'items' in attrs:
+            return attrs
+        return super().validate(attrs)
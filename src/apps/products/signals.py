@@ -0,0 +1,11 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from .models import Product
+from .images import needs_variants, schedule_variants
+
+
+@receiver(post_save, sender=Product)
+def refresh_image_variants(sender, instance, raw=False, **kwargs):
+    """Regenerate image derivatives when the product image is uploaded or changed."""
+    if not raw and needs_variants(instance):
+        schedule_variants(instance.pk)
@@ -0,0 +1,68 @@
+"""
+Collision-free product slugs.
+
+A product's slug is its slugified name, or ``<slug>-2``, ``<slug>-3``, ...
+when that is taken. ``unique_slugs`` assigns slugs to a whole batch of names
+by probing candidate slugs with exact ``slug IN (...)`` queries, which the
+unique index answers directly; names with many namesakes are probed over
+wider suffix windows in the following rounds.
+"""
+from collections import Counter
+
+from django.utils.text import slugify
+
+# Room left for a "-<n>" suffix in the slug column
+SUFFIX_LENGTH = 10
+FALLBACK_SLUG = 'product'
+# Suffixes probed per name in the first round; doubled in each later round
+PROBE_WINDOW = 4
+LOOKUP_BATCH_SIZE = 900
+
+
+def base_slug(name, max_length):
+    return slugify(name)[:max_length - SUFFIX_LENGTH].strip('-') or FALLBACK_SLUG
+
+
+def _taken(queryset, slugs):
+    slugs = list(slugs)
+    taken = set()
+    for start in range(0, len(slugs), LOOKUP_BATCH_SIZE):
+        taken.update(queryset.filter(slug__in=slugs[start:start + LOOKUP_BATCH_SIZE]).values_list('slug', flat=True))
+    return taken
+
+
+def unique_slugs(names, queryset):
+    """
+    Return one slug per name, unique among themselves and in ``queryset``.
+    
+    Concurrent writers can still take a slug before it is saved; the unique
+    index rejects the insert then.
+    """
+    max_length = queryset.model._meta.get_field('slug').max_length
+    bases = [base_slug(name, max_length) for name in names]
+    needed = Counter(bases)
+    
+    taken = _taken(queryset, needed)
+    free = {base: [] if base in taken else [base] for base in needed}
+    next_suffix = dict.fromkeys(needed, 2)
+    window = dict.fromkeys(needed, PROBE_WINDOW)
+    
+    while True:
+        probes = {}
+        for base, count in needed.items():
+            missing = count - len(free[base])
+            if missing <= 0:
+                continue
+            size = max(missing, window[base])
+            probes[base] = [f'{base}-{n}' for n in range(next_suffix[base], next_suffix[base] + size)]
+            next_suffix[base] += size
+            window[base] = size * 2
+        if not probes:
+            break
+        
+        taken = _taken(queryset, (slug for slugs in probes.values() for slug in slugs))
+        for base, slugs in probes.items():
+            free[base].extend(slug for slug in slugs if slug not in taken)
+    
+    available = {base: iter(slugs) for base, slugs in free.items()}
+    return [next(available[base]) for base in bases]
@@ -0,0 +1,204 @@
+"""
+Stock reservation, with striped counters for hot products.
+
+Checkout takes stock with ``take_stock`` and cancellation gives it back
+with ``return_stock``; both record the change in a ``StockLedger`` (see
+``ledger.py``). For most products both are a single conditional
+``UPDATE`` of the ``products`` row, so concurrent checkouts can't oversell
+or lose an update.
+
+During a flash sale every checkout of one product waits for the lock on
+that row. ``stripe_stock(product, n)`` splits its stock over ``n``
+``ProductStockStripe`` rows instead: a checkout decrements a random stripe
+holding enough, so up to ``n`` checkouts of the product proceed at once.
+When no single stripe holds enough, the stripes are locked in order and
+the quantity is borrowed across them.
+
+While a product is striped, ``Product.stock`` is the total as of the last
+``sync_striped_stock`` job (or stock change made through this module);
+``available_stock`` returns the current total, cached for
+``STOCK_STRIPE_CACHE_SECONDS`` and cleared by every stripe write. Product
+serializers, ``Product.in_stock`` and the cart checks read stock through
+it.
+"""
+import random
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import Product, ProductStockStripe
+
+STRIPED_STOCK_KEY = 'stock:striped:{}'
+
+
+class InsufficientStock(Exception):
+    """Raised when a product has less stock than requested."""
+    
+    def __init__(self, product_id, available):
+        super().__init__(f'Only {available} available.')
+        self.product_id = product_id
+        self.available = available
+
+
+def _stripe_total(product_id):
+    return ProductStockStripe.objects.filter(product_id=product_id).aggregate(total=Sum('stock'))['total'] or 0
+
+
+def stripe_totals(product_ids):
+    """Return the summed stripes of striped products, by product id (uncached)."""
+    totals = dict.fromkeys(product_ids, 0)
+    totals.update(
+        ProductStockStripe.objects.filter(product_id__in=totals)
+        .values('product')
+        .annotate(total=Sum('stock'))
+        .values_list('product', 'total')
+    )
+    return totals
+
+
+def current_stock(product_id, stock, stock_stripes):
+    """Return the stock of a product from its columns, summing its stripes when it is striped."""
+    if not stock_stripes:
+        return stock
+    return cache.get_or_set(
+        STRIPED_STOCK_KEY.format(product_id),
+        lambda: _stripe_total(product_id),
+        settings.STOCK_STRIPE_CACHE_SECONDS
+    )
+
+
+def available_stock(product):
+    """Return the stock of a product, summing its stripes when it is striped."""
+    return current_stock(product.pk, product.stock, product.stock_stripes)
+
+
+def _split(total, stripes):
+    share, extra = divmod(total, stripes)
+    return [share + (1 if stripe < extra else 0) for stripe in range(stripes)]
+
+
+def _write_stripes(product_id, total, stripes):
+    ProductStockStripe.objects.filter(product_id=product_id).delete()
+    if stripes:
+        ProductStockStripe.objects.bulk_create([
+            ProductStockStripe(product_id=product_id, stripe=stripe, stock=stock)
+            for stripe, stock in enumerate(_split(total, stripes))
+        ])
+    cache.delete(STRIPED_STOCK_KEY.format(product_id))
+
+
+@transaction.atomic
+def stripe_stock(product, stripes):
+    """
+    Split the stock of ``product`` over ``stripes`` counter rows.
+    
+    ``stripes`` of 0 (or 1) folds the stock back into ``Product.stock``.
+    """
+    stripes = 0 if stripes <= 1 else stripes
+    product = Product.objects.select_for_update().get(pk=product.pk)
+    total = _stripe_total(product.pk) if product.stock_stripes else product.stock
+    _write_stripes(product.pk, total, stripes)
+    Product.objects.filter(pk=product.pk).update(stock=total, stock_stripes=stripes, updated_at=timezone.now())
+    return total
+
+
+@transaction.atomic
+def set_stock(product_id, stock, ledger=None):
+    """
+    Set the stock of a product, spreading it over its stripes when it is striped.
+    
+    The change is added to ``ledger`` (a ``StockLedger``) when given.
+    """
+    product = Product.objects.select_for_update().only('stock', 'stock_stripes').get(pk=product_id)
+    if product.stock_stripes:
+        previous = _stripe_total(product_id)
+        _write_stripes(product_id, stock, product.stock_stripes)
+    else:
+        previous = product.stock
+    Product.objects.filter(pk=product_id).update(stock=stock, updated_at=timezone.now())
+    if ledger is not None:
+        ledger.add(product_id, stock - previous)
+
+
+def _take_from_stripes(product_id, stripes, quantity):
+    first = random.randrange(stripes)
+    for offset in range(stripes):
+        stripe = (first + offset) % stripes
+        taken = ProductStockStripe.objects.filter(
+            product_id=product_id, stripe=stripe, stock__gte=quantity
+        ).update(stock=F('stock') - quantity)
+        if taken:
+            cache.delete(STRIPED_STOCK_KEY.format(product_id))
+            return
+    
+    # No stripe holds enough on its own: borrow across them, locked in a fixed order
+    rows = list(ProductStockStripe.objects.select_for_update().filter(product_id=product_id).order_by('stripe'))
+    available = sum(row.stock for row in rows)
+    if available < quantity:
+        raise InsufficientStock(product_id, available)
+    remaining = quantity
+    for row in rows:
+        taken = min(row.stock, remaining)
+        row.stock -= taken
+        remaining -= taken
+    ProductStockStripe.objects.bulk_update(rows, ['stock'])
+    cache.delete(STRIPED_STOCK_KEY.format(product_id))
+
+
+def take_stock(product, quantity, ledger=None):
+    """
+    Take ``quantity`` units of a product's stock, or raise ``InsufficientStock``.
+    
+    Call inside the checkout's transaction, for products in a consistent
+    (e.g. id) order. The change is added to ``ledger`` when given.
+    """
+    if product.stock_stripes:
+        _take_from_stripes(product.pk, product.stock_stripes, quantity)
+    else:
+        taken = Product.objects.filter(pk=product.pk, stock__gte=quantity).update(
+            stock=F('stock') - quantity, updated_at=timezone.now()
+        )
+        if not taken:
+            available = Product.objects.filter(pk=product.pk).values_list('stock', flat=True).first()
+            raise InsufficientStock(product.pk, available or 0)
+    if ledger is not None:
+        ledger.add(product.pk, -quantity)
+
+
+def return_stock(product, quantity, ledger=None):
+    """Give back ``quantity`` units of a product's stock, e.g. of a cancelled order."""
+    if product.stock_stripes:
+        ProductStockStripe.objects.filter(
+            product_id=product.pk, stripe=random.randrange(product.stock_stripes)
+        ).update(stock=F('stock') + quantity)
+        cache.delete(STRIPED_STOCK_KEY.format(product.pk))
+    else:
+        Product.objects.filter(pk=product.pk).update(stock=F('stock') + quantity, updated_at=timezone.now())
+    if ledger is not None:
+        ledger.add(product.pk, quantity)
+
+
+def sync_striped_stock():
+    """Copy the stripe totals of striped products into ``Product.stock``; return the products changed."""
+    totals = (
+        ProductStockStripe.objects.filter(product=OuterRef('pk'))
+        .values('product')
+        .annotate(total=Sum('stock'))
+        .values('total')
+    )
+    total = Coalesce(Subquery(totals), 0)
+    changed = list(
+        Product.objects.filter(stock_stripes__gt=0)
+        .annotate(striped_stock=total)
+        .exclude(stock=F('striped_stock'))
+        .values_list('pk', flat=True)
+    )
+    # The total is computed again by each UPDATE, so a concurrent stock change isn't overwritten
+    now = timezone.now()
+    for product_id in changed:
+        Product.objects.filter(pk=product_id).update(stock=total, updated_at=now)
+    return len(changed)
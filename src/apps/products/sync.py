@@ -0,0 +1,215 @@
+"""
+Bulk stock and price synchronization.
+
+Vendors send entries such as ``{"sku": "A-1", "stock": 12, "price": "9.90"}``
+(or ``slug`` instead of ``sku``). They are applied in batches of
+``PRODUCT_SYNC_BATCH_SIZE``; each batch is:
+
+- validated with the import converters;
+- matched to products with one query: slugs among all products (then
+  checked for ownership), SKUs among the caller's own products;
+- compared with the current values of the locked rows (the stripe totals
+  for the stock of striped products), so unchanged products aren't
+  written;
+- written with one ``UPDATE ... FROM (VALUES ...)`` on PostgreSQL and
+  SQLite (a ``CASE`` based ``bulk_update`` elsewhere), setting
+  ``updated_at`` so product ETags change;
+- recorded as one ``StockLedger`` of ``sync`` movements;
+- followed by one bump of the cache versions of the categories touched.
+"""
+from collections import Counter
+from itertools import chain, islice
+
+from django.conf import settings
+from django.db import connections, router, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .caching import bump_category_versions
+from .imports import CONVERTERS, RowError
+from .ledger import StockLedger
+from .models import Product
+from .stock import set_stock, stripe_totals
+
+SYNC_FIELDS = ('stock', 'price')
+
+
+class SyncResult:
+    """Outcome of a sync: entries read, products changed and per-entry errors."""
+    
+    def __init__(self):
+        self.total = 0
+        self.updated = 0
+        self.unchanged = 0
+        self.changed = Counter()
+        self.stock_delta = 0
+        self.errors = []
+    
+    def add_error(self, row, key, errors):
+        self.errors.append({'row': row, 'key': key, 'errors': errors})
+    
+    def as_dict(self):
+        return {
+            'total': self.total,
+            'updated': self.updated,
+            'unchanged': self.unchanged,
+            'failed': len(self.errors),
+            'stock_changed': self.changed['stock'],
+            'price_changed': self.changed['price'],
+            'stock_delta': self.stock_delta,
+            'errors': self.errors,
+        }
+
+
+def _text(value):
+    return '' if value is None else str(value).strip()
+
+
+def validate_entry(entry):
+    """Return the ``(lookup, key)`` and the new values of an entry."""
+    if not isinstance(entry, dict) or '__invalid__' in entry:
+        raise RowError('Invalid JSON object.')
+    
+    sku, slug = _text(entry.get('sku')), _text(entry.get('slug'))
+    if not sku and not slug:
+        raise RowError('Provide a sku or a slug.')
+    
+    values = {}
+    errors = {}
+    for field in SYNC_FIELDS:
+        if entry.get(field) in (None, ''):
+            continue
+        try:
+            values[field] = CONVERTERS[field](entry[field])
+        except RowError as e:
+            errors[field] = [str(e)]
+    if errors:
+        raise RowError(errors)
+    if not values:
+        raise RowError('Provide a stock or a price.')
+    return ('sku', sku) if sku else ('slug', slug), values
+
+
+def _supports_update_from(connection):
+    if connection.vendor == 'sqlite':
+        return connection.Database.sqlite_version_info >= (3, 33)
+    return connection.vendor == 'postgresql'
+
+
+def _write(changes, now):
+    """Set the stock and price of ``changes`` (``[(id, stock, price)]``)."""
+    connection = connections[router.db_for_write(Product)]
+    if not _supports_update_from(connection):
+        Product.objects.bulk_update(
+            [Product(pk=pk, stock=stock, price=price, updated_at=now) for pk, stock, price in changes],
+            ['stock', 'price', 'updated_at']
+        )
+        return
+    
+    table = connection.ops.quote_name(Product._meta.db_table)
+    updated_at = connection.ops.adapt_datetimefield_value(now)
+    batch_size = connection.ops.bulk_batch_size(['id', 'stock', 'price', 'updated_at'], changes)
+    with connection.cursor() as cursor:
+        for start in range(0, len(changes), batch_size):
+            batch = changes[start:start + batch_size]
+            rows = ', '.join(['(CAST(%s AS bigint), CAST(%s AS integer), CAST(%s AS numeric))'] * len(batch))
+            cursor.execute(
+                f'WITH v (id, stock, price) AS (VALUES {rows}) '
+                f'UPDATE {table} SET stock = v.stock, price = v.price, updated_at = %s '
+                f'FROM v WHERE {table}.id = v.id',
+                [*chain.from_iterable(batch), updated_at]
+            )
+
+
+def sync_batch(entries, user, result, dry_run=False):
+    """Apply one batch of ``(row, entry)`` pairs."""
+    wanted = {}
+    for row, entry in entries:
+        try:
+            key, values = validate_entry(entry)
+        except RowError as e:
+            errors = e.args[0]
+            key = entry.get('sku') or entry.get('slug') if isinstance(entry, dict) else None
+            result.add_error(row, key, errors if isinstance(errors, dict) else {'non_field_errors': [errors]})
+            continue
+        wanted[key] = (row, values)
+    if not wanted:
+        return
+    
+    slugs = [value for lookup, value in wanted if lookup == 'slug']
+    skus = [value for lookup, value in wanted if lookup == 'sku']
+    lookups = Q(slug__in=slugs) | Q(created_by=user, sku__in=skus)
+    
+    with transaction.atomic():
+        products = Product.objects.filter(lookups)
+        if not dry_run:
+            products = products.select_for_update()
+        found = {}
+        for product in products.values('id', 'slug', 'sku', 'created_by_id', 'category_id', 'stock', 'price', 'stock_stripes'):
+            found[('slug', product['slug'])] = product
+            if product['sku'] and product['created_by_id'] == user.pk:
+                found[('sku', product['sku'])] = product
+        
+        matched = {}
+        for key, (row, values) in wanted.items():
+            product = found.get(key)
+            if product is None:
+                result.add_error(row, key[1], {key[0]: ['Product not found.']})
+                continue
+            if product['created_by_id'] != user.pk and not user.is_staff:
+                result.add_error(row, key[1], {key[0]: ['You can only update your own products.']})
+                continue
+            # A later entry for the same product (by sku or slug) wins
+            matched[product['id']] = (product, values)
+        
+        # Product.stock of a striped product lags behind its stripes, so compare with their sum
+        striped_ids = [product_id for product_id, (product, _) in matched.items() if product['stock_stripes']]
+        for product_id, total in stripe_totals(striped_ids).items():
+            matched[product_id][0]['stock'] = total
+        
+        changes = []
+        categories = set()
+        striped = {}
+        ledger = StockLedger('sync', user)
+        for product, values in matched.values():
+            new = {field: values.get(field, product[field]) for field in SYNC_FIELDS}
+            changed = [field for field in SYNC_FIELDS if new[field] != product[field]]
+            if not changed:
+                result.unchanged += 1
+                continue
+            result.updated += 1
+            result.changed.update(changed)
+            result.stock_delta += new['stock'] - product['stock']
+            changes.append((product['id'], new['stock'], new['price']))
+            categories.add(product['category_id'])
+            if product['stock_stripes'] and 'stock' in changed:
+                striped[product['id']] = new['stock']
+            elif 'stock' in changed:
+                ledger.add(product['id'], new['stock'] - product['stock'])
+        
+        if changes and not dry_run:
+            _write(changes, timezone.now())
+            # Hot products keep their stock in stripes (see stock.py)
+            for product_id, stock in striped.items():
+                set_stock(product_id, stock, ledger)
+            ledger.write()
+    
+    if categories and not dry_run:
+        bump_category_versions(categories)
+
+
+def sync_products(entries, user, dry_run=False, batch_size=None):
+    """
+    Apply stock and price changes from ``(row, entry)`` pairs.
+    
+    Returns a ``SyncResult``.
+    """
+    batch_size = batch_size or settings.PRODUCT_SYNC_BATCH_SIZE
+    result = SyncResult()
+    entries = iter(entries)
+    while True:
+        batch = list(islice(entries, batch_size))
+        if not batch:
+            return result
+        result.total += len(batch)
+        sync_batch(batch, user, result, dry_run)
@@ -1,3 +1,350 @@
-from django.test import TestCase
+import io
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework.test import APIClient
+from apps.core.serializers import defer_unused_text_fields, serializer_lookups
+from apps.orders.models import Order
+from apps.orders.serializers import OrderListSerializer
+from apps.payments.models import Payment
+from apps.payments.serializers import PaymentSerializer
+from .caching import bump_category_versions
+from .imports import import_products
+from .ledger import StockLedger, balance, ledger_balances, snapshot_stock
+from .models import Category, Product, ProductStockStripe, StockMovement, StockSnapshot
+from .slugs import unique_slugs
+from .stock import InsufficientStock, available_stock, return_stock, stripe_stock, take_stock
+from .serializers import ProductListSerializer, ProductSerializer
+
+
+def select_columns(queryset):
+    """Return the SELECT column list of a queryset's SQL."""
+    sql = str(queryset.query)
+    return sql[len('SELECT '):sql.index(' FROM ')]
+
+
+class DeferTextFieldsTests(SimpleTestCase):
+    """The SELECT column lists of list queries skip text columns the serializer doesn't output."""
+    
+    def test_product_list_skips_descriptions(self):
+        queryset = Product.objects.filter(is_active=True).select_related('category', 'created_by')
+        columns = select_columns(defer_unused_text_fields(queryset, serializer_lookups(ProductListSerializer)))
+        
+        self.assertNotIn('"products"."description"', columns)
+        self.assertNotIn('"categories"."description"', columns)
+        self.assertIn('"products"."name"', columns)
+        self.assertIn('"categories"."name"', columns)
+    
+    def test_product_detail_keeps_description(self):
+        queryset = Product.objects.select_related('category', 'created_by')
+        columns = select_columns(defer_unused_text_fields(queryset, serializer_lookups(ProductSerializer)))
+        
+        self.assertIn('"products"."description"', columns)
+        self.assertNotIn('"categories"."description"', columns)
+    
+    def test_compiled_product_list_selects_serialized_columns(self):
+        queryset = ProductListSerializer.get_compiled_plan().values(Product.objects.filter(is_active=True))
+        columns = select_columns(queryset)
+        
+        self.assertNotIn('"products"."description"', columns)
+        self.assertNotIn('"categories"."description"', columns)
+        self.assertIn('"categories"."name"', columns)
+    
+    def test_order_list_skips_shipping_address_and_notes(self):
+        queryset = OrderListSerializer.get_compiled_plan().values(Order.objects.all())
+        columns = select_columns(queryset)
+        
+        self.assertNotIn('"orders"."shipping_address"', columns)
+        self.assertNotIn('"orders"."notes"', columns)
+    
+    def test_payment_list_skips_joined_order_text(self):
+        queryset = Payment.objects.select_related('order', 'user')
+        columns = select_columns(defer_unused_text_fields(queryset, serializer_lookups(PaymentSerializer)))
+        
+        self.assertNotIn('"orders"."shipping_address"', columns)
+        self.assertNotIn('"orders"."notes"', columns)
+        self.assertNotIn('"payments"."refund_reason"', columns)
+        self.assertIn('"payments"."failure_reason"', columns)
+        self.assertIn('"orders"."order_number"', columns)
+
+
+class ProductDetailCachingTests(TestCase):
+    """Product detail ETags change with the product, its category and the requested fieldset."""
+    
+    def setUp(self):
+        vendor = get_user_model().objects.create_user('vendor@example.com', None, role='vendor')
+        self.category = Category.objects.create(name='Books')
+        Product.objects.create(name='Book', description='', price=10, stock=5, category=self.category, created_by=vendor)
+        self.client = APIClient()
+        self.addCleanup(cache.clear)
+    
+    def get(self, query='', etag=None):
+        headers = {'HTTP_IF_NONE_MATCH': etag} if etag else {}
+        return self.client.get(f'/api/v1/products/book/{query}', **headers)
+    
+    def test_not_modified(self):
+        etag = self.get()['ETag']
+        self.assertEqual(self.get(etag=etag).status_code, 304)
+    
+    def test_fieldsets_have_their_own_etag(self):
+        full = self.get()
+        sparse = self.get('?fields=name,price')
+        
+        self.assertNotEqual(full['ETag'], sparse['ETag'])
+        self.assertEqual(set(sparse.json()), {'name', 'price'})
+        # A cached fieldset doesn't validate the full representation, nor the reverse
+        self.assertEqual(self.get(etag=sparse['ETag']).status_code, 200)
+        self.assertEqual(self.get('?fields=name,price', etag=full['ETag']).status_code, 200)
+        self.assertEqual(self.get('?fields=price,name', etag=sparse['ETag']).status_code, 304)
+    
+    def test_category_changes_invalidate(self):
+        etag = self.get()['ETag']
+        self.category.name = 'Novels'
+        self.category.save()
+        
+        response = self.get(etag=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['category_name'], 'Novels')
+        
+        etag = response['ETag']
+        bump_category_versions([self.category.pk])
+        self.assertEqual(self.get(etag=etag).status_code, 200)
+
+
+class StripedStockTests(TestCase):
+    """Striped stock is taken from one stripe, or borrowed across them, and never oversold."""
+    
+    def setUp(self):
+        vendor = get_user_model().objects.create_user('vendor@example.com', None, role='vendor')
+        category = Category.objects.create(name='Books')
+        self.product = Product.objects.create(name='Book', description='', price=10, stock=10, category=category, created_by=vendor)
+        stripe_stock(self.product, 4)
+        self.product.refresh_from_db()
+        self.addCleanup(cache.clear)
+    
+    def stripes(self):
+        return list(ProductStockStripe.objects.filter(product=self.product).order_by('stripe').values_list('stock', flat=True))
+    
+    def test_stock_is_split_over_the_stripes(self):
+        self.assertEqual(self.stripes(), [3, 3, 2, 2])
+        self.assertEqual(available_stock(self.product), 10)
+    
+    def test_take_and_return(self):
+        ledger = StockLedger('order')
+        take_stock(self.product, 2, ledger)
+        self.assertEqual(available_stock(self.product), 8)
+        
+        return_stock(self.product, 1, ledger)
+        ledger.write()
+        self.assertEqual(sum(self.stripes()), 9)
+        self.assertEqual(list(StockMovement.objects.values_list('quantity', flat=True).order_by('id')), [-2, 1])
+    
+    def test_quantity_larger_than_any_stripe_is_borrowed(self):
+        take_stock(self.product, 7)
+        self.assertEqual(sum(self.stripes()), 3)
+        self.assertTrue(all(stock >= 0 for stock in self.stripes()))
+    
+    def test_insufficient_stock(self):
+        with self.assertRaises(InsufficientStock) as raised:
+            take_stock(self.product, 11)
+        self.assertEqual(raised.exception.available, 10)
+        self.assertEqual(sum(self.stripes()), 10)
+    
+    def test_unstriping_folds_the_stock_back(self):
+        take_stock(self.product, 3)
+        self.assertEqual(stripe_stock(self.product, 0), 7)
+        
+        self.product.refresh_from_db()
+        self.assertEqual((self.product.stock, self.product.stock_stripes, self.stripes()), (7, 0, []))
+
+
+@override_settings(STOCK_SNAPSHOT_LAG_SECONDS=0)
+class StockLedgerTests(TestCase):
+    """Every stock change is a movement, and snapshots plus later movements give the balance."""
+    
+    def setUp(self):
+        self.vendor = get_user_model().objects.create_user('vendor@example.com', None, role='vendor', is_verified=True)
+        self.category = Category.objects.create(name='Books')
+        self.client = APIClient()
+        self.client.force_authenticate(self.vendor)
+        self.addCleanup(cache.clear)
+    
+    def create_product(self, stock=5):
+        response = self.client.post('/api/v1/products/', {
+            'name': 'Book', 'description': 'A book', 'price': '10.00', 'stock': stock, 'category': self.category.pk,
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        return Product.objects.get()
+    
+    def test_created_product_has_an_opening_balance(self):
+        product = self.create_product()
+        
+        movement = StockMovement.objects.get()
+        self.assertEqual((movement.product_id, movement.quantity, movement.reason), (product.pk, 5, 'opening'))
+        self.assertEqual(balance(product.pk), 5)
+    
+    def test_balance_from_snapshot_and_later_movements(self):
+        product = self.create_product()
+        ledger = StockLedger('order')
+        take_stock(product, 2, ledger)
+        ledger.write()
+        
+        self.assertEqual(snapshot_stock(), 1)
+        self.assertEqual(StockSnapshot.objects.get().stock, 3)
+        # Nothing moved since
+        self.assertEqual(snapshot_stock(), 0)
+        
+        return_stock(product, 1, ledger)
+        ledger.write()
+        self.assertEqual(balance(product.pk), 4)
+        self.assertEqual(ledger_balances(Product.objects.all()).get().ledger_stock, 4)
+        
+        product.refresh_from_db()
+        self.assertEqual(product.stock, 4)
+    
+    def test_stock_changed_outside_the_ledger_shows_up(self):
+        product = self.create_product()
+        Product.objects.filter(pk=product.pk).update(stock=7)
+        
+        product = ledger_balances(Product.objects.all()).get()
+        self.assertNotEqual(product.ledger_stock, product.stock)
+
+
+class ProductImportTests(TestCase):
+    """Valid rows are created in chunks with unique slugs; invalid ones are reported by line."""
+    
+    def setUp(self):
+        self.vendor = get_user_model().objects.create_user('vendor@example.com', None, role='vendor', is_verified=True)
+        self.category = Category.objects.create(name='Books')
+        Product.objects.create(name='Book', description='', price=10, stock=5, category=self.category, created_by=self.vendor)
+        self.client = APIClient()
+        self.client.force_authenticate(self.vendor)
+        self.addCleanup(cache.clear)
+    
+    def upload(self, name, content, **data):
+        upload = SimpleUploadedFile(name, content.encode())
+        return self.client.post('/api/v1/products/import/', {'file': upload, **data}, format='multipart')
+    
+    def test_csv_import(self):
+        response = self.upload('products.csv', (
+            'name,description,price,stock,category\n'
+            'Book,Second edition,12.50,3,books\n'
+            'Book,Third edition,15,,Books\n'
+            'Pen,Blue,-1,2,Books\n'
+            'Mug,Large,8,1,Kitchen\n'
+        ))
+        
+        self.assertEqual(response.status_code, 201)
+        data = response.json()
+        self.assertEqual((data['total'], data['created'], data['failed']), (4, 2, 2))
+        self.assertEqual([(error['row'], list(error['errors'])) for error in data['errors']], [(4, ['price']), (5, ['category'])])
+        
+        self.assertEqual(list(Product.objects.order_by('pk').values_list('slug', 'stock')), [('book', 5), ('book-2', 3), ('book-3', 0)])
+        self.assertEqual(list(StockMovement.objects.values_list('reason', 'quantity')), [('import', 3)])
+    
+    def test_jsonl_import_in_chunks(self):
+        content = '{"name": "Pen", "description": "Blue", "price": "2", "category": "books"}\nnot json\n' * 2
+        result = import_products(io.BytesIO(content.encode()), 'jsonl', self.vendor, chunk_size=3)
+        
+        self.assertEqual((result.total, result.created), (4, 2))
+        self.assertEqual([error['row'] for error in result.errors], [2, 4])
+        self.assertEqual(sorted(Product.objects.filter(name='Pen').values_list('slug', flat=True)), ['pen', 'pen-2'])
+    
+    def test_dry_run(self):
+        response = self.upload('products.ndjson', '{"name": "Pen", "description": "Blue", "price": "2", "category": "books"}\n', dry_run=True)
+        
+        self.assertEqual((response.status_code, response.json()['valid']), (200, 1))
+        self.assertFalse(Product.objects.filter(name='Pen').exists())
+    
+    def test_unknown_format(self):
+        self.assertEqual(self.upload('products.xlsx', '').status_code, 400)
+    
+    def test_customers_are_refused(self):
+        self.client.force_authenticate(get_user_model().objects.create_user('buyer@example.com', None))
+        self.assertEqual(self.upload('products.csv', 'name\n').status_code, 403)
+    
+    def test_unique_slugs_skip_taken_suffixes(self):
+        for slug in ('pen', 'pen-2', 'pen-4'):
+            Product.objects.create(name='Pen', slug=slug, description='', price=1, category=self.category, created_by=self.vendor)
+        
+        slugs = unique_slugs(['Pen'] * 7 + ['Book'], Product.objects.all())
+        self.assertEqual(slugs, ['pen-3', 'pen-5', 'pen-6', 'pen-7', 'pen-8', 'pen-9', 'pen-10', 'book-2'])
+
+
+class ProductSyncTests(TestCase):
+    """Stock and price changes are matched by SKU or slug and only written when they change."""
+    
+    def setUp(self):
+        User = get_user_model()
+        self.vendor = User.objects.create_user('vendor@example.com', None, role='vendor', is_verified=True)
+        self.category = Category.objects.create(name='Books')
+        self.book = self.product('Book', sku='B-1')
+        self.pen = self.product('Pen', sku='P-1')
+        other = User.objects.create_user('other@example.com', None, role='vendor', is_verified=True)
+        self.foreign = self.product('Mug', created_by=other)
+        
+        self.client = APIClient()
+        self.client.force_authenticate(self.vendor)
+        self.addCleanup(cache.clear)
+    
+    def product(self, name, **fields):
+        fields.setdefault('created_by', self.vendor)
+        return Product.objects.create(name=name, description='', price=10, stock=5, category=self.category, **fields)
+    
+    def sync(self, items, **data):
+        response = self.client.post('/api/v1/products/sync/', {'items': items, **data}, format='json')
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+    
+    def test_sync(self):
+        version = self.category.cache_version
+        result = self.sync([
+            {'sku': 'B-1', 'stock': 8, 'price': '12.50'},
+            {'slug': 'pen', 'stock': 5, 'price': '10.00'},
+            {'slug': 'mug', 'stock': 1},
+            {'sku': 'X-1', 'stock': 1},
+            {'sku': 'B-1', 'price': 'free'},
+            {'sku': 'P-1'},
+        ])
+        
+        self.assertEqual(
+            (result['updated'], result['unchanged'], result['failed'], result['stock_delta']), (1, 1, 4, 3)
+        )
+        self.assertEqual([(error['row'], error['key']) for error in result['errors']], [
+            (5, 'B-1'), (6, 'P-1'), (3, 'mug'), (4, 'X-1'),
+        ])
+        
+        self.book.refresh_from_db()
+        self.assertEqual((self.book.stock, str(self.book.price)), (8, '12.50'))
+        self.assertEqual(list(StockMovement.objects.values_list('product', 'reason', 'quantity')), [(self.book.pk, 'sync', 3)])
+        self.assertEqual(Product.objects.get(pk=self.foreign.pk).stock, 5)
+        self.category.refresh_from_db()
+        self.assertNotEqual(self.category.cache_version, version)
+    
+    def test_striped_stock_is_spread_over_the_stripes(self):
+        stripe_stock(self.book, 3)
+        take_stock(Product.objects.get(pk=self.book.pk), 2)
+        
+        # Product.stock still says 5, the stripes hold 3
+        result = self.sync([{'sku': 'B-1', 'stock': 9}])
+        self.assertEqual(result['stock_delta'], 6)
+        self.assertEqual(ProductStockStripe.objects.filter(product=self.book).count(), 3)
+        self.assertEqual(available_stock(Product.objects.get(pk=self.book.pk)), 9)
+        self.assertEqual(list(StockMovement.objects.values_list('quantity', flat=True)), [6])
+    
+    def test_dry_run(self):
+        result = self.sync([{'sku': 'B-1', 'stock': 8}], dry_run=True)
+        
+        self.assertEqual(result['updated'], 1)
+        self.assertEqual(Product.objects.get(pk=self.book.pk).stock, 5)
+        self.assertFalse(StockMovement.objects.exists())
+    
+    def test_invalid_requests(self):
+        response = self.client.post('/api/v1/products/sync/', {'dry_run': True}, format='json')
+        self.assertEqual(response.status_code, 400)
+        
+        self.client.force_authenticate(get_user_model().objects.create_user('buyer@example.com', None))
+        response = self.client.post('/api/v1/products/sync/', {'items': [{'sku': 'B-1', 'stock': 1}]}, format='json')
+        self.assertEqual(response.status_code, 403)
@@ -3,6 +3,8 @@ from .views import (
     CategoryListCreateView,
     CategoryDetailView,
     ProductListCreateView,
+    ProductImportView,
+    ProductSyncView,
     ProductDetailView,
     ProductUpdateView,
     ProductDeleteView
@@ -17,6 +19,8 @@ urlpatterns = [
     
     # Products
     path('', ProductListCreateView.as_view(), name='product_list_create'),
+    path('import/', ProductImportView.as_view(), name='product_import'),
+    path('sync/', ProductSyncView.as_view(), name='product_sync'),
     path('<slug:slug>/', ProductDetailView.as_view(), name='product_detail'),
     path('<slug:slug>/update/', ProductUpdateView.as_view(), name='product_update'),
     path('<slug:slug>/delete/', ProductDeleteView.as_view(), name='product_delete'),
@@ -1,15 +1,28 @@
 from rest_framework import generics, filters, status
 from rest_framework.permissions import IsAuthenticated, AllowAny, IsAuthenticatedOrReadOnly
 from rest_framework.response import Response
+from rest_framework.parsers import FormParser, MultiPartParser
 from django_filters.rest_framework import DjangoFilterBackend
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import Http404
 from .models import Category, Product
 from .serializers import (
     CategorySerializer,
     ProductSerializer,
     ProductListSerializer,
-    ProductCreateUpdateSerializer
+    ProductCreateUpdateSerializer,
+    ProductImportSerializer,
+    ProductSyncSerializer
 )
 from .permissions import IsAdminOrVendor
+from .caching import ProductValidators
+from .imports import import_products, read_rows
+from .ledger import StockLedger
+from .stock import current_stock, set_stock
+from .sync import sync_products
+from apps.core.serializers import CompiledListMixin, SparseFieldsetViewMixin
 
 
 class CategoryListCreateView(generics.ListCreateAPIView):
@@ -40,7 +53,7 @@ class CategoryDetailView(generics.RetrieveUpdateDestroyAPIView):
     lookup_field = 'slug'
 
 
-class ProductListCreateView(generics.ListCreateAPIView):
+class ProductListCreateView(CompiledListMixin, generics.ListCreateAPIView):
     """API endpoint to list all products or create a new one."""
     
     queryset = Product.objects.filter(is_active=True).select_related('category', 'created_by')
@@ -58,17 +71,107 @@ class ProductListCreateView(generics.ListCreateAPIView):
         return ProductListSerializer
     
     def perform_create(self, serializer):
-        """Save the product with the current user as creator."""
-        serializer.save(created_by=self.request.user)
+        """Save the product with the current user as creator, recording its opening stock."""
+        with transaction.atomic():
+            product = serializer.save(created_by=self.request.user)
+            ledger = StockLedger('opening', self.request.user)
+            ledger.add(product.pk, product.stock)
+            ledger.write()
 
 
-class ProductDetailView(generics.RetrieveAPIView):
+class ProductImportView(generics.GenericAPIView):
+    """
+    API endpoint for vendors to create products in bulk from a CSV or JSON lines file.
+    
+    Valid rows are created; invalid ones are reported with their line number.
+    """
+    
+    serializer_class = ProductImportSerializer
+    permission_classes = (IsAuthenticated,)
+    parser_classes = (MultiPartParser, FormParser)
+    
+    def post(self, request):
+        if not request.user.can_sell_products():
+            return Response(
+                {'error': 'Only vendors can import products.'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        
+        result = import_products(data['file'], data['file_format'], request.user, dry_run=data['dry_run'])
+        return Response(
+            result.as_dict(),
+            status=status.HTTP_201_CREATED if result.created else status.HTTP_200_OK
+        )
+
+
+class ProductSyncView(generics.GenericAPIView):
+    """
+    API endpoint for vendors to update the stock and price of many products at once.
+    
+    Products are keyed by ``sku`` (among the vendor's own) or ``slug``;
+    changes are written with one query per batch and summarized.
+    """
+    
+    serializer_class = ProductSyncSerializer
+    permission_classes = (IsAuthenticated,)
+    
+    def post(self, request):
+        if not request.user.can_sell_products():
+            return Response(
+                {'error': 'Only vendors can sync products.'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        
+        if 'items' in data:
+            entries = enumerate(data['items'], start=1)
+        else:
+            entries = read_rows(data['file'], data['file_format'])
+        result = sync_products(entries, request.user, dry_run=data['dry_run'])
+        return Response(result.as_dict())
+
+
+class ProductDetailView(SparseFieldsetViewMixin, generics.RetrieveAPIView):
     """API endpoint to retrieve product details."""
     
     queryset = Product.objects.filter(is_active=True).select_related('category', 'created_by')
     serializer_class = ProductSerializer
     permission_classes = (AllowAny,)
     lookup_field = 'slug'
+    
+    def retrieve(self, request, *args, **kwargs):
+        """Serve the product with conditional GET and a pre-rendered payload."""
+        # Validators come from a narrow row, so 304s never touch the serializer
+        row = (
+            Product.objects.filter(is_active=True, slug=kwargs[self.lookup_field])
+            .values('id', 'category_id', 'category__cache_version', 'updated_at', 'stock', 'stock_stripes')
+            .first()
+        )
+        if row is None:
+            raise Http404
+        
+        validators = ProductValidators(
+            row['id'], row['category_id'], row['updated_at'], row['category__cache_version'],
+            striped_stock=current_stock(row['id'], row['stock'], row['stock_stripes']) if row['stock_stripes'] else None,
+            fields=self.get_sparse_fields()
+        )
+        
+        if validators.is_not_modified(request):
+            return validators.apply(Response(status=status.HTTP_304_NOT_MODIFIED))
+        
+        data = cache.get(validators.payload_key)
+        if data is None:
+            data = self.get_serializer(self.get_object()).data
+            cache.set(validators.payload_key, data, settings.CATALOG_CACHE_TIMEOUT)
+        
+        return validators.apply(Response(data))
 
 
 class ProductUpdateView(generics.UpdateAPIView):
@@ -85,6 +188,21 @@ class ProductUpdateView(generics.UpdateAPIView):
         if user.is_staff:
             return Product.objects.all()
         return Product.objects.filter(created_by=user)
+    
+    def perform_update(self, serializer):
+        """Set a new stock through ``set_stock``, so it is spread over stripes and recorded in the ledger."""
+        stock = serializer.validated_data.pop('stock', None)
+        with transaction.atomic():
+            # Lock the row and save its current stock, so a concurrent checkout isn't overwritten
+            serializer.instance.stock = (
+                Product.objects.select_for_update().values_list('stock', flat=True).get(pk=serializer.instance.pk)
+            )
+            product = serializer.save()
+            if stock is not None:
+                ledger = StockLedger('adjustment', self.request.user)
+                set_stock(product.pk, stock, ledger)
+                ledger.write()
+                product.stock = stock
 
 
 class ProductDeleteView(generics.DestroyAPIView):
@@ -1,6 +1,8 @@
 from django.contrib import admin
 from django.utils.html import format_html
 from .models import Review, ReviewHelpful, ReviewReport, VendorResponse
+from apps.core.bulk import run_from_admin
+from apps.core.paginator import EstimatedCountPaginator
 
 
 class VendorResponseInline(admin.StackedInline):
@@ -22,8 +24,11 @@ class ReviewAdmin(admin.ModelAdmin):
     search_fields = ('product__name', 'user__email', 'title', 'comment')
     readonly_fields = ('user', 'product', 'order', 'helpful_count', 'created_at', 'updated_at')
     list_editable = ('is_approved',)
+    list_select_related = ('product', 'user')
     ordering = ('-created_at',)
     inlines = [VendorResponseInline]
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     
     fieldsets = (
         ('Review Information', {
@@ -48,14 +53,12 @@ class ReviewAdmin(admin.ModelAdmin):
     
     def approve_reviews(self, request, queryset):
         """Bulk approve reviews."""
-        count = queryset.update(is_approved=True)
-        self.message_user(request, f'{count} review(s) approved.')
+        run_from_admin(self, request, queryset, 'reviews.approve_reviews', '{count} review(s) approved.')
     approve_reviews.short_description = 'Approve selected reviews'
     
     def disapprove_reviews(self, request, queryset):
         """Bulk disapprove reviews."""
-        count = queryset.update(is_approved=False)
-        self.message_user(request, f'{count} review(s) disapproved.')
+        run_from_admin(self, request, queryset, 'reviews.disapprove_reviews', '{count} review(s) disapproved.')
     disapprove_reviews.short_description = 'Disapprove selected reviews'
 
 
@@ -66,7 +69,11 @@ class ReviewHelpfulAdmin(admin.ModelAdmin):
     list_display = ('review', 'user', 'created_at')
     list_filter = ('created_at',)
     search_fields = ('review__product__name', 'user__email')
+    # Review.__str__ shows the reviewer's name and the product
+    list_select_related = ('review__user', 'review__product', 'user')
     readonly_fields = ('review', 'user', 'created_at')
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
 
 @admin.register(ReviewReport)
@@ -81,7 +88,11 @@ class ReviewReportAdmin(admin.ModelAdmin):
     search_fields = ('review__product__name', 'reported_by__email', 'description')
     readonly_fields = ('review', 'reported_by', 'created_at')
     list_editable = ('status',)
+    list_select_related = ('review__user', 'review__product', 'reported_by')
+    autocomplete_fields = ('reviewed_by',)
     ordering = ('-created_at',)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     
     fieldsets = (
         ('Report Information', {
@@ -100,35 +111,17 @@ class ReviewReportAdmin(admin.ModelAdmin):
     
     def mark_reviewed(self, request, queryset):
         """Mark reports as reviewed."""
-        from django.utils import timezone
-        count = queryset.update(
-            status='reviewed',
-            reviewed_by=request.user,
-            reviewed_at=timezone.now()
-        )
-        self.message_user(request, f'{count} report(s) marked as reviewed.')
+        run_from_admin(self, request, queryset, 'reviews.mark_reports_reviewed', '{count} report(s) marked as reviewed.')
     mark_reviewed.short_description = 'Mark as reviewed'
     
     def mark_dismissed(self, request, queryset):
         """Mark reports as dismissed."""
-        from django.utils import timezone
-        count = queryset.update(
-            status='dismissed',
-            reviewed_by=request.user,
-            reviewed_at=timezone.now()
-        )
-        self.message_user(request, f'{count} report(s) dismissed.')
+        run_from_admin(self, request, queryset, 'reviews.mark_reports_dismissed', '{count} report(s) dismissed.')
     mark_dismissed.short_description = 'Dismiss reports'
     
     def mark_action_taken(self, request, queryset):
         """Mark reports as action taken."""
-        from django.utils import timezone
-        count = queryset.update(
-            status='action_taken',
-            reviewed_by=request.user,
-            reviewed_at=timezone.now()
-        )
-        self.message_user(request, f'Action taken on {count} report(s).')
+        run_from_admin(self, request, queryset, 'reviews.mark_reports_action_taken', 'Action taken on {count} report(s).')
     mark_action_taken.short_description = 'Mark action taken'
 
 
@@ -139,4 +132,5 @@ class VendorResponseAdmin(admin.ModelAdmin):
     list_display = ('review', 'vendor', 'created_at', 'updated_at')
     list_filter = ('created_at',)
     search_fields = ('review__product__name', 'vendor__email', 'response')
+    list_select_related = ('review__user', 'review__product', 'vendor')
     readonly_fields = ('review', 'vendor', 'created_at', 'updated_at')
\ No newline at end of file
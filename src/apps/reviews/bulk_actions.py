@@ -0,0 +1,69 @@
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+from apps.core import events
+from apps.core.bulk import bulk_action
+from apps.users.models import User
+from .models import Review, ReviewReport
+
+
+def _set_approval(ids, approved):
+    """
+    Approve or disapprove the reviews among ``ids`` whose state changes.
+    
+    ``queryset.update()`` skips the review signals, so the change of each
+    vendor's rating counters is computed here and applied from the outbox.
+    """
+    changed = list(
+        Review.objects.select_for_update()
+        .filter(pk__in=ids, is_approved=not approved)
+        .values_list('pk', flat=True)
+    )
+    if not changed:
+        return 0
+    
+    contributions = list(
+        Review.objects.filter(pk__in=changed)
+        .values('product__created_by_id')
+        .annotate(
+            review_count=Count('pk'),
+            rating_sum=Sum('rating'),
+            pending_responses=Count('pk', filter=Q(vendor_response__isnull=True)),
+        )
+    )
+    sign = 1 if approved else -1
+    
+    Review.objects.filter(pk__in=changed).update(is_approved=approved)
+    
+    events.publish_many(events.VENDOR_REVIEWS_CHANGED, User, {
+        row['product__created_by_id']: {
+            'review_count': sign * row['review_count'],
+            'rating_sum': sign * row['rating_sum'],
+            'pending_responses': sign * row['pending_responses'],
+        }
+        for row in contributions
+    })
+    return len(changed)
+
+
+@bulk_action('reviews.approve_reviews')
+def approve_reviews(ids, user):
+    return _set_approval(ids, approved=True)
+
+
+@bulk_action('reviews.disapprove_reviews')
+def disapprove_reviews(ids, user):
+    return _set_approval(ids, approved=False)
+
+
+def _mark_reports(status):
+    def handler(ids, user):
+        return ReviewReport.objects.filter(pk__in=ids).update(
+            status=status,
+            reviewed_by=user,
+            reviewed_at=timezone.now()
+        )
+    return handler
+
+
+for _status in ('reviewed', 'dismissed', 'action_taken'):
+    bulk_action(f'reviews.mark_reports_{_status}')(_mark_reports(_status))
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0002_order_archive'),
+        ('reviews', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='review',
+            name='order',
+            field=models.ForeignKey(blank=True, db_constraint=False, help_text='Order from which this review was made (for verified purchase)', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='reviews', to='orders.order'),
+        ),
+    ]
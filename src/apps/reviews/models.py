@@ -16,6 +16,8 @@ class Review(models.Model):
         null=True, 
         blank=True,
         related_name='reviews',
+        # No database constraint: orders is partitioned (see apps.orders.partitions)
+        db_constraint=False,
         help_text='Order from which this review was made (for verified purchase)'
     )
     
@@ -3,6 +3,7 @@ from django.contrib.auth import get_user_model
 from .models import Review, ReviewHelpful, ReviewReport, VendorResponse
 from apps.products.models import Product
 from apps.orders.models import Order
+from apps.core.serializers import CompiledSerializerMixin, SparseFieldsetMixin
 
 User = get_user_model()
 
@@ -18,7 +19,7 @@ class VendorResponseSerializer(serializers.ModelSerializer):
         read_only_fields = ('id', 'created_at', 'updated_at')
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for product reviews."""
     
     user_name = serializers.CharField(source='user.get_full_name', read_only=True)
@@ -109,7 +110,7 @@ class ReviewCreateSerializer(serializers.ModelSerializer):
         return attrs
 
 
-class ReviewListSerializer(serializers.ModelSerializer):
+class ReviewListSerializer(CompiledSerializerMixin, serializers.ModelSerializer):
     """Lightweight serializer for review lists."""
     
     user_name = serializers.CharField(source='user.get_full_name', read_only=True)
@@ -120,6 +121,10 @@ class ReviewListSerializer(serializers.ModelSerializer):
             'id', 'user_name', 'rating', 'title', 'comment',
             'is_verified_purchase', 'helpful_count', 'created_at'
         )
+        compiled_sources = {
+            # Same as User.get_full_name()
+            'user_name': (('user__first_name', 'user__last_name'), lambda first, last: f"{first} {last}".strip()),
+        }
 
 
 class ReviewReportSerializer(serializers.ModelSerializer):
@@ -1,3 +1,41 @@
+from django.contrib.auth import get_user_model
 from django.test import TestCase
 
-# Create your tests here.
+from apps.analytics.models import VendorSalesSummary
+from apps.core import events
+from apps.core.bulk import run_bulk_action
+from apps.products.models import Category, Product
+from .models import Review
+
+
+class ReviewBulkActionTests(TestCase):
+    """Bulk (dis)approvals update the vendor's rating counters through the outbox."""
+    
+    def setUp(self):
+        User = get_user_model()
+        self.admin = User.objects.create_user('admin@example.com', None, is_staff=True)
+        self.vendor = User.objects.create_user('vendor@example.com', None, role='vendor')
+        category = Category.objects.create(name='Books')
+        product = Product.objects.create(name='Book', description='', price=10, stock=5, category=category, created_by=self.vendor)
+        for n, rating in enumerate((5, 2, 4)):
+            buyer = User.objects.create_user(f'buyer{n}@example.com', None)
+            Review.objects.create(
+                product=product, user=buyer, rating=rating, title='Review', comment='', is_approved=rating != 4
+            )
+    
+    def counters(self):
+        events.dispatch_pending()
+        summary = VendorSalesSummary.objects.get(vendor=self.vendor)
+        return summary.review_count, summary.rating_sum, summary.pending_responses
+    
+    def test_approve_and_disapprove(self):
+        self.assertEqual(self.counters(), (2, 7, 2))
+        
+        # Only the review whose state changes is counted
+        affected, _ = run_bulk_action('reviews.approve_reviews', Review.objects.all(), self.admin)
+        self.assertEqual(affected, 1)
+        self.assertEqual(self.counters(), (3, 11, 3))
+        
+        affected, _ = run_bulk_action('reviews.disapprove_reviews', Review.objects.filter(rating__gte=4), self.admin)
+        self.assertEqual(affected, 2)
+        self.assertEqual(self.counters(), (1, 2, 1))
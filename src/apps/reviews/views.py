@@ -6,6 +6,7 @@ from django.shortcuts import get_object_or_404
 from django.db.models import Avg
 from .models import Review, ReviewHelpful, ReviewReport, VendorResponse
 from apps.products.models import Product
+from apps.core.serializers import CompiledListMixin, DeferTextFieldsMixin
 from .serializers import (
     ReviewSerializer,
     ReviewCreateSerializer,
@@ -16,11 +17,12 @@ from .serializers import (
 )
 
 
-class ProductReviewListView(generics.ListAPIView):
+class ProductReviewListView(CompiledListMixin, generics.ListAPIView):
     """API endpoint to list reviews for a product."""
     
     serializer_class = ReviewListSerializer
     permission_classes = (AllowAny,)
+    throttle_scope = 'reviews'
     
     def get_queryset(self):
         """Return approved reviews for the product."""
@@ -55,7 +57,7 @@ class ProductReviewStatsView(APIView):
         return Response(stats)
 
 
-class MyReviewListView(generics.ListAPIView):
+class MyReviewListView(DeferTextFieldsMixin, generics.ListAPIView):
     """API endpoint to list current user's reviews."""
     
     serializer_class = ReviewSerializer
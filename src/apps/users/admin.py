@@ -3,6 +3,7 @@ from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.contrib.auth import get_user_model
 from django.utils.html import format_html
 from .models import EmailVerificationToken, VendorRequest, Address
+from apps.core.bulk import run_from_admin
 
 User = get_user_model()
 
@@ -106,47 +107,18 @@ class VendorRequestAdmin(admin.ModelAdmin):
     
     def approve_requests(self, request, queryset):
         """Bulk approve vendor requests."""
-        from django.utils import timezone
-        
-        count = 0
-        for vendor_request in queryset.filter(status='pending'):
-            vendor_request.status = 'approved'
-            vendor_request.reviewed_by = request.user
-            vendor_request.reviewed_at = timezone.now()
-            vendor_request.save()
-            
-            # Update user role
-            user = vendor_request.user
-            user.role = 'vendor'
-            user.vendor_approved_by = request.user
-            user.vendor_approved_date = timezone.now()
-            user.vendor_request_pending = False
-            user.save()
-            
-            count += 1
-        
-        self.message_user(request, f'{count} vendor request(s) approved successfully.')
+        run_from_admin(
+            self, request, queryset, 'users.approve_vendor_requests',
+            '{count} vendor request(s) approved successfully.'
+        )
     approve_requests.short_description = 'Approve selected vendor requests'
     
     def reject_requests(self, request, queryset):
         """Bulk reject vendor requests."""
-        from django.utils import timezone
-        
-        count = 0
-        for vendor_request in queryset.filter(status='pending'):
-            vendor_request.status = 'rejected'
-            vendor_request.reviewed_by = request.user
-            vendor_request.reviewed_at = timezone.now()
-            vendor_request.save()
-            
-            # Update user status
-            user = vendor_request.user
-            user.vendor_request_pending = False
-            user.save()
-            
-            count += 1
-        
-        self.message_user(request, f'{count} vendor request(s) rejected.')
+        run_from_admin(
+            self, request, queryset, 'users.reject_vendor_requests',
+            '{count} vendor request(s) rejected.'
+        )
     reject_requests.short_description = 'Reject selected vendor requests'
     
     
@@ -0,0 +1,10 @@
+from django.urls import path
+from .async_views import AsyncResendVerificationEmailView, AsyncUserLoginView, AsyncUserRegistrationView
+
+app_name = 'users_async'
+
+urlpatterns = [
+    path('register/', AsyncUserRegistrationView.as_view(), name='register'),
+    path('login/', AsyncUserLoginView.as_view(), name='login'),
+    path('resend-verification/', AsyncResendVerificationEmailView.as_view(), name='resend_verification'),
+]
@@ -0,0 +1,105 @@
+"""
+Async (ASGI) variants of the user endpoints that wait on SMTP or password hashing.
+
+Passwords are hashed and checked on the hashing pool (see ``hashing.py``)
+while the event loop keeps serving other requests.
+"""
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from rest_framework import status
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.core.async_views import AsyncAPIView
+from .hashing import ahash_password
+from .models import EmailVerificationToken
+from .serializers import ResendVerificationSerializer, UserRegistrationSerializer, UserSerializer
+from .utils import send_verification_email
+
+User = get_user_model()
+
+
+class AsyncUserRegistrationView(AsyncAPIView):
+    """API endpoint for user registration."""
+    
+    authentication_required = False
+    throttle_scope = 'register'
+    
+    async def post(self, request):
+        serializer = await self.validate(UserRegistrationSerializer, request)
+        
+        if serializer.errors:
+            return self.respond(serializer.errors, status.HTTP_400_BAD_REQUEST)
+        
+        data = dict(serializer.validated_data)
+        password = data.pop('password')
+        data.pop('password2')
+        # All new users start as customers and unverified
+        user = User(**data, role='customer', is_verified=False)
+        user.email = User.objects.normalize_email(user.email)
+        user.password = await ahash_password(password)
+        await user.asave()
+        
+        # Create verification token and send email without holding the event loop
+        token = await EmailVerificationToken.objects.acreate(user=user)
+        await sync_to_async(send_verification_email, thread_sensitive=False)(user, token)
+        
+        return self.respond({
+            'user': await sync_to_async(lambda: UserSerializer(user).data)(),
+            'message': 'User registered successfully. Please check your email to verify your account.'
+        }, status.HTTP_201_CREATED)
+
+
+class AsyncUserLoginView(AsyncAPIView):
+    """API endpoint for user login (JWT token)."""
+    
+    authentication_required = False
+    throttle_scope = 'login'
+    
+    async def post(self, request):
+        data = self.parse_body(request)
+        errors = {field: ['This field is required.'] for field in ('email', 'password') if not data.get(field)}
+        if errors:
+            return self.respond(errors, status.HTTP_400_BAD_REQUEST)
+        
+        user = await User.objects.filter(email=data['email']).afirst()
+        if user is None:
+            # Hash anyway, so unknown emails take as long to reject as wrong passwords
+            await ahash_password(data['password'])
+        elif await user.acheck_password(data['password']) and user.is_active:
+            if not user.is_verified:
+                return self.respond({
+                    'error': 'Email not verified. Please verify your email before logging in.',
+                    'email': user.email
+                }, status.HTTP_403_FORBIDDEN)
+            
+            # Outstanding tokens are recorded for the blacklist
+            refresh = await sync_to_async(RefreshToken.for_user)(user)
+            return self.respond({'refresh': str(refresh), 'access': str(refresh.access_token)})
+        raise AuthenticationFailed('No active account found with the given credentials')
+
+
+class AsyncResendVerificationEmailView(AsyncAPIView):
+    """API endpoint to resend verification email."""
+    
+    authentication_required = False
+    throttle_scope = 'verification_email'
+    
+    async def post(self, request):
+        serializer = await self.validate(ResendVerificationSerializer, request)
+        
+        if serializer.errors:
+            return self.respond(serializer.errors, status.HTTP_400_BAD_REQUEST)
+        
+        user = await User.objects.aget(email=serializer.validated_data['email'])
+        
+        # Invalidate old tokens
+        await EmailVerificationToken.objects.filter(user=user, is_used=False).aupdate(is_used=True)
+        
+        # Create new token and send email without holding the event loop
+        token = await EmailVerificationToken.objects.acreate(user=user)
+        await sync_to_async(send_verification_email, thread_sensitive=False)(user, token)
+        
+        return self.respond({
+            'message': 'Verification email sent successfully. Please check your inbox.'
+        })
@@ -0,0 +1,44 @@
+from django.utils import timezone
+from apps.core import events
+from apps.core.bulk import bulk_action
+from .models import User, VendorRequest
+
+
+def _review_vendor_requests(ids, reviewer, approved):
+    """Approve or reject the pending requests among ``ids`` with two UPDATEs."""
+    rows = dict(
+        VendorRequest.objects.select_for_update()
+        .filter(pk__in=ids, status='pending')
+        .values_list('pk', 'user_id')
+    )
+    if not rows:
+        return 0
+    
+    now = timezone.now()
+    VendorRequest.objects.filter(pk__in=rows).update(
+        status='approved' if approved else 'rejected',
+        reviewed_by=reviewer,
+        reviewed_at=now,
+    )
+    
+    users = User.objects.filter(pk__in=set(rows.values()))
+    if approved:
+        users.update(role='vendor', vendor_approved_by=reviewer, vendor_approved_date=now, vendor_request_pending=False)
+    else:
+        users.update(vendor_request_pending=False)
+    
+    # The notification emails are sent from the outbox
+    events.publish_many(events.VENDOR_REQUEST_REVIEWED, VendorRequest, {
+        pk: {'user_id': user_id, 'approved': approved} for pk, user_id in rows.items()
+    })
+    return len(rows)
+
+
+@bulk_action('users.approve_vendor_requests')
+def approve_vendor_requests(ids, reviewer):
+    return _review_vendor_requests(ids, reviewer, approved=True)
+
+
+@bulk_action('users.reject_vendor_requests')
+def reject_vendor_requests(ids, reviewer):
+    return _review_vendor_requests(ids, reviewer, approved=False)
@@ -0,0 +1,27 @@
+"""
+Password hashers with cost parameters taken from settings.
+
+The algorithm names are unchanged, so hashes stay interchangeable with
+Django's own hashers. When the parameters change, ``must_update`` flags
+old hashes and they are upgraded on the next successful login.
+"""
+from django.conf import settings
+from django.contrib.auth.hashers import Argon2PasswordHasher, ScryptPasswordHasher
+
+
+class TunedScryptPasswordHasher(ScryptPasswordHasher):
+    """scrypt with ``PASSWORD_SCRYPT_*`` parameters."""
+    
+    work_factor = settings.PASSWORD_SCRYPT_WORK_FACTOR
+    block_size = settings.PASSWORD_SCRYPT_BLOCK_SIZE
+    parallelism = settings.PASSWORD_SCRYPT_PARALLELISM
+    # Enough memory for the configured parameters (128 * n * r bytes) plus headroom
+    maxmem = 256 * work_factor * block_size
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    """Argon2id with ``PASSWORD_ARGON2_*`` parameters (requires ``argon2-cffi``)."""
+    
+    time_cost = settings.PASSWORD_ARGON2_TIME_COST
+    memory_cost = settings.PASSWORD_ARGON2_MEMORY_COST
+    parallelism = settings.PASSWORD_ARGON2_PARALLELISM
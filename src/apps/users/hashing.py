@@ -0,0 +1,57 @@
+"""
+Password hashing on a bounded worker pool.
+
+Hashing is CPU bound, so a burst of logins on many request threads (or on
+the event loop under ASGI) would oversubscribe the CPU. Every hash and
+verification is instead run on a pool of ``PASSWORD_HASHING_WORKERS``
+threads; callers wait for their turn. The hash functions release the GIL,
+so the pool scales across cores.
+"""
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, make_password
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    """Return the shared hashing pool, creating it on first use."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.PASSWORD_HASHING_WORKERS,
+                thread_name_prefix='password-hashing'
+            )
+        return _executor
+
+
+def _verify(raw_password, encoded):
+    """Return ``(is_correct, must_update)`` for a password and a stored hash."""
+    outdated = []
+    is_correct = check_password(raw_password, encoded, setter=outdated.append)
+    return is_correct, bool(outdated)
+
+
+def hash_password(raw_password):
+    """Hash a password with the preferred hasher on the hashing pool."""
+    return _get_executor().submit(make_password, raw_password).result()
+
+
+def verify_password(raw_password, encoded):
+    """Check a password against a stored hash on the hashing pool. Returns ``(is_correct, must_update)``."""
+    return _get_executor().submit(_verify, raw_password, encoded).result()
+
+
+async def ahash_password(raw_password):
+    """Async version of ``hash_password``; the event loop keeps serving while the pool hashes."""
+    return await asyncio.wrap_future(_get_executor().submit(make_password, raw_password))
+
+
+async def averify_password(raw_password, encoded):
+    """Async version of ``verify_password``; the event loop keeps serving while the pool checks."""
+    return await asyncio.wrap_future(_get_executor().submit(_verify, raw_password, encoded))
@@ -0,0 +1,28 @@
+from datetime import timedelta
+
+from django.apps import apps
+from django.utils import timezone
+
+from apps.core.jobs import delete_in_batches, periodic_job
+
+from .models import EmailVerificationToken
+
+
+@periodic_job(interval=timedelta(hours=1))
+def purge_expired_verification_tokens():
+    """Delete email verification tokens that have expired."""
+    return {'deleted': delete_in_batches(
+        EmailVerificationToken.objects.filter(expires_at__lt=timezone.now())
+    )}
+
+
+@periodic_job(interval=timedelta(hours=6))
+def flush_expired_jwt_tokens():
+    """Delete expired outstanding refresh tokens (and their blacklist entries)."""
+    if not apps.is_installed('rest_framework_simplejwt.token_blacklist'):
+        return {'skipped': 'token_blacklist is not installed'}
+    
+    from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+    return {'deleted': delete_in_batches(
+        OutstandingToken.objects.filter(expires_at__lt=timezone.now())
+    )}
@@ -0,0 +1,68 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import get_hasher, get_hashers
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = 'Measure password verifications (logins) per second for the configured hashers'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--seconds',
+            type=float,
+            default=3.0,
+            help='How long each measurement runs',
+        )
+        parser.add_argument(
+            '--threads',
+            type=int,
+            default=settings.PASSWORD_HASHING_WORKERS,
+            help='Threads used for the parallel measurement (default: PASSWORD_HASHING_WORKERS)',
+        )
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Benchmark every hasher in PASSWORD_HASHERS, not only the preferred one',
+        )
+    
+    def handle(self, *args, **options):
+        hashers = get_hashers() if options['all'] else [get_hasher()]
+        threads = options['threads']
+        cores = min(threads, os.cpu_count() or 1)
+        
+        self.stdout.write(f'{threads} threads on {os.cpu_count()} CPUs, {options["seconds"]}s per run')
+        for hasher in hashers:
+            try:
+                encoded = hasher.encode('correct horse battery staple', hasher.salt())
+            except ValueError as e:
+                self.stdout.write(self.style.WARNING(f'{hasher.algorithm}: skipped ({e})'))
+                continue
+            
+            single = self.measure(hasher, encoded, 1, options['seconds'])
+            parallel = self.measure(hasher, encoded, threads, options['seconds'])
+            self.stdout.write(
+                f'{hasher.algorithm:<16} {1000 / single:7.1f} ms/login  '
+                f'{single:7.1f} logins/s on 1 thread  '
+                f'{parallel:8.1f} logins/s on {threads} threads  '
+                f'({parallel / cores:.1f} per core)'
+            )
+    
+    def measure(self, hasher, encoded, threads, seconds):
+        """Return the number of verifications per second achieved with ``threads`` threads."""
+        deadline = time.perf_counter() + seconds
+        
+        def worker():
+            count = 0
+            while time.perf_counter() < deadline:
+                hasher.verify('correct horse battery staple', encoded)
+                count += 1
+            return count
+        
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            total = sum(pool.map(lambda _: worker(), range(threads)))
+        return total / (time.perf_counter() - started)
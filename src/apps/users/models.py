@@ -3,6 +3,8 @@ from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin, BaseU
 from django.utils import timezone
 import uuid
 
+from .hashing import ahash_password, averify_password, hash_password, verify_password
+
 
 class UserManager(BaseUserManager):
     """Custom user manager for email-based authentication."""
@@ -93,6 +95,28 @@ class User(AbstractBaseUser, PermissionsMixin):
     def can_sell_products(self):
         """Check if user can sell products (vendor or admin)."""
         return self.role in ['vendor', 'admin']
+    
+    def set_password(self, raw_password):
+        """Hash the password on the bounded hashing pool."""
+        self.password = hash_password(raw_password)
+        self._password = raw_password
+    
+    def check_password(self, raw_password):
+        """Check the password on the hashing pool, upgrading outdated hashes."""
+        is_correct, must_update = verify_password(raw_password, self.password)
+        if is_correct and must_update:
+            self.set_password(raw_password)
+            self._password = None
+            self.save(update_fields=['password'])
+        return is_correct
+    
+    async def acheck_password(self, raw_password):
+        """Async version of ``check_password`` that doesn't block the event loop."""
+        is_correct, must_update = await averify_password(raw_password, self.password)
+        if is_correct and must_update:
+            self.password = await ahash_password(raw_password)
+            await self.asave(update_fields=['password'])
+        return is_correct
 
 
 class Address(models.Model):
@@ -1,4 +1,6 @@
 from rest_framework import serializers
+from rest_framework.exceptions import PermissionDenied
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from django.contrib.auth import get_user_model
 from django.contrib.auth.password_validation import validate_password
 from .models import VendorRequest, Address
@@ -20,6 +22,19 @@ class AddressSerializer(serializers.ModelSerializer):
         read_only_fields = ('id', 'created_at', 'updated_at')
 
 
+
+class UserLoginSerializer(TokenObtainPairSerializer):
+    """Serializer for user login; unverified users are refused before any token is issued."""
+    
+    @classmethod
+    def get_token(cls, user):
+        if not user.is_verified:
+            raise PermissionDenied({
+                'error': 'Email not verified. Please verify your email before logging in.',
+                'email': user.email
+            })
+        return super().get_token(user)
+
 class UserRegistrationSerializer(serializers.ModelSerializer):
     """Serializer for user registration."""
     
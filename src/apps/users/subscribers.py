@@ -0,0 +1,11 @@
+from apps.core.events import subscriber, VENDOR_REQUEST_REVIEWED
+from .models import User
+from .utils import send_vendor_approval_email
+
+
+@subscriber(VENDOR_REQUEST_REVIEWED)
+def notify_vendor_request_reviewed(event):
+    user = User.objects.get(pk=event.payload['user_id'])
+    if not send_vendor_approval_email(user, approved=event.payload['approved']):
+        # Leave the event pending so the outbox retries it
+        raise RuntimeError(f'Could not send the vendor request email to {user.email}')
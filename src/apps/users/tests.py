@@ -1,3 +1,37 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.test import TestCase
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
 
-# Create your tests here.
+
+class LoginTests(TestCase):
+    """Only verified users get a token pair, and nothing is issued to the others."""
+    
+    def setUp(self):
+        self.user = get_user_model().objects.create_user('buyer@example.com', 'Secret-123', is_verified=True)
+        self.client = APIClient()
+        self.addCleanup(cache.clear)
+    
+    def login(self, password='Secret-123'):
+        return self.client.post('/api/v1/auth/login/', {'email': 'buyer@example.com', 'password': password}, format='json')
+    
+    def test_verified_user(self):
+        response = self.login()
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.json()), {'refresh', 'access'})
+        self.assertEqual(OutstandingToken.objects.filter(user=self.user).count(), 1)
+    
+    def test_unverified_user(self):
+        self.user.is_verified = False
+        self.user.save()
+        response = self.login()
+        
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(response.json()['email'], 'buyer@example.com')
+        self.assertFalse(OutstandingToken.objects.exists())
+    
+    def test_wrong_password(self):
+        self.assertEqual(self.login('wrong').status_code, 401)
+        self.assertFalse(OutstandingToken.objects.exists())
@@ -8,6 +8,7 @@ from django.utils import timezone
 from django.shortcuts import get_object_or_404
 from .serializers import (
     UserRegistrationSerializer,
+    UserLoginSerializer,
     UserSerializer,
     UserUpdateSerializer,
     ChangePasswordSerializer,
@@ -20,6 +21,7 @@ from .serializers import (
 )
 from .models import EmailVerificationToken, VendorRequest, Address
 from .utils import send_verification_email
+from apps.core import events
 
 User = get_user_model()
 
@@ -53,6 +55,7 @@ class UserRegistrationView(generics.CreateAPIView):
     
     queryset = User.objects.all()
     permission_classes = (AllowAny,)
+    throttle_scope = 'register'
     serializer_class = UserRegistrationSerializer
     
     def create(self, request, *args, **kwargs):
@@ -117,6 +120,7 @@ class ResendVerificationEmailView(APIView):
     """API endpoint to resend verification email."""
     
     permission_classes = (AllowAny,)
+    throttle_scope = 'verification_email'
     
     def post(self, request):
         serializer = ResendVerificationSerializer(data=request.data)
@@ -143,24 +147,8 @@ class UserLoginView(TokenObtainPairView):
     """API endpoint for user login (JWT token)."""
     
     permission_classes = (AllowAny,)
-    
-    def post(self, request, *args, **kwargs):
-        response = super().post(request, *args, **kwargs)
-        
-        # Check if user is verified
-        if response.status_code == 200:
-            email = request.data.get('email')
-            try:
-                user = User.objects.get(email=email)
-                if not user.is_verified:
-                    return Response({
-                        'error': 'Email not verified. Please verify your email before logging in.',
-                        'email': email
-                    }, status=status.HTTP_403_FORBIDDEN)
-            except User.DoesNotExist:
-                pass
-        
-        return response
+    serializer_class = UserLoginSerializer
+    throttle_scope = 'login'
 
 
 class UserProfileView(generics.RetrieveAPIView):
@@ -323,6 +311,8 @@ class ReviewVendorRequestView(APIView):
         user.vendor_request_pending = False
         user.save()
         
+        events.publish(events.VENDOR_REQUEST_REVIEWED, vendor_request, user_id=user.id, approved=action == 'approve')
+        
         message = f'Vendor request {"approved" if action == "approve" else "rejected"} successfully.'
         
         return Response({
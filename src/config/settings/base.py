@@ -48,6 +48,7 @@ INSTALLED_APPS = [
     
     "rest_framework",
     "rest_framework_simplejwt",
+    "rest_framework_simplejwt.token_blacklist",
     "corsheaders",
     "drf_spectacular",
     'django_filters',
@@ -58,7 +59,8 @@ INSTALLED_APPS = [
     "apps.cart.apps.CartConfig",
     "apps.payments.apps.PaymentsConfig",
     "apps.reviews.apps.ReviewsConfig",
-    "apps.core",
+    "apps.analytics.apps.AnalyticsConfig",
+    "apps.core.apps.CoreConfig",
 
 ]
 
@@ -127,6 +129,30 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Password hashing
+# PASSWORD_HASHER selects the hasher for new hashes: 'scrypt' or 'argon2' (needs argon2-cffi).
+# Hashes made by any other listed hasher are upgraded on the next successful login.
+PASSWORD_HASHER = os.getenv('PASSWORD_HASHER', default='scrypt')
+PASSWORD_HASHERS = [
+    'apps.users.hashers.TunedScryptPasswordHasher',
+    'apps.users.hashers.TunedArgon2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+]
+if PASSWORD_HASHER == 'argon2':
+    PASSWORD_HASHERS.insert(0, PASSWORD_HASHERS.pop(1))
+
+PASSWORD_SCRYPT_WORK_FACTOR = int(os.getenv('PASSWORD_SCRYPT_WORK_FACTOR', 2 ** 14))
+PASSWORD_SCRYPT_BLOCK_SIZE = int(os.getenv('PASSWORD_SCRYPT_BLOCK_SIZE', 8))
+PASSWORD_SCRYPT_PARALLELISM = int(os.getenv('PASSWORD_SCRYPT_PARALLELISM', 1))
+PASSWORD_ARGON2_TIME_COST = int(os.getenv('PASSWORD_ARGON2_TIME_COST', 2))
+PASSWORD_ARGON2_MEMORY_COST = int(os.getenv('PASSWORD_ARGON2_MEMORY_COST', 19456))
+PASSWORD_ARGON2_PARALLELISM = int(os.getenv('PASSWORD_ARGON2_PARALLELISM', 1))
+
+# Threads hashing and verifying passwords (bounds login CPU use per process)
+PASSWORD_HASHING_WORKERS = int(os.getenv('PASSWORD_HASHING_WORKERS', os.cpu_count() or 1))
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/6.0/topics/i18n/
 
@@ -149,6 +175,14 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 MEDIA_URL = 'media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Cache: production needs one shared by every process, e.g. Redis (check --deploy errors on LocMemCache)
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', default=''),
+    }
+}
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
@@ -162,10 +196,34 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'apps.core.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'apps.core.renderers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
+    'DEFAULT_THROTTLE_CLASSES': (
+        'apps.core.throttling.TokenBucketThrottle',
+        'apps.core.throttling.SearchThrottle',
+    ),
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
 }
 
+# Token-bucket throttling per view throttle_scope:
+# burst = requests allowed back to back, sustained = refill rate
+TOKEN_BUCKET_RATES = {
+    'login': {'burst': 10, 'sustained': '30/hour'},
+    'register': {'burst': 5, 'sustained': '20/hour'},
+    'verification_email': {'burst': 3, 'sustained': '10/hour'},
+    'reviews': {'burst': 60, 'sustained': '300/min'},
+    'search': {'burst': 30, 'sustained': '120/min'},
+    'quotes': {'burst': 30, 'sustained': '300/min'},
+}
+
 # CORS Settings
 CORS_ALLOWED_ORIGINS = os.getenv('CORS_ALLOWED_ORIGINS', default='http://localhost:3000').split(',')
 CORS_ALLOW_CREDENTIALS = True
@@ -188,6 +246,78 @@ SIMPLE_JWT = {
     'AUTH_HEADER_TYPES': ('Bearer',),
 }
 
+# Catalog HTTP caching (seconds)
+CATALOG_CACHE_MAX_AGE = int(os.getenv('CATALOG_CACHE_MAX_AGE', 60))
+CATALOG_CACHE_S_MAXAGE = int(os.getenv('CATALOG_CACHE_S_MAXAGE', 3600))
+CATALOG_CACHE_TIMEOUT = int(os.getenv('CATALOG_CACHE_TIMEOUT', 86400))
+
+# Number of threads generating product image derivatives
+PRODUCT_IMAGE_WORKERS = int(os.getenv('PRODUCT_IMAGE_WORKERS', 2))
+
+# Domain events (transactional outbox)
+# Dotted path to a callable receiving each OutboxEvent, e.g. a message queue producer
+EVENT_BUS_BACKEND = os.getenv('EVENT_BUS_BACKEND', default='')
+EVENT_BUS_MAX_ATTEMPTS = int(os.getenv('EVENT_BUS_MAX_ATTEMPTS', 10))
+# How long a dispatcher holds a batch before another may take it over (longer than a batch takes)
+EVENT_BUS_LEASE_SECONDS = int(os.getenv('EVENT_BUS_LEASE_SECONDS', 300))
+EVENT_RETENTION_DAYS = int(os.getenv('EVENT_RETENTION_DAYS', 7))
+
+# Periodic maintenance jobs (run_jobs command)
+JOBS_BATCH_SIZE = int(os.getenv('JOBS_BATCH_SIZE', 1000))
+JOBS_MAX_BATCHES = int(os.getenv('JOBS_MAX_BATCHES', 50))
+CART_ABANDONED_DAYS = int(os.getenv('CART_ABANDONED_DAYS', 30))
+PAYMENT_PENDING_TIMEOUT_HOURS = int(os.getenv('PAYMENT_PENDING_TIMEOUT_HOURS', 24))
+
+# Admin bulk actions over more rows than this run in the background, in JOBS_BATCH_SIZE batches
+ADMIN_BULK_ACTION_INLINE_LIMIT = int(os.getenv('ADMIN_BULK_ACTION_INLINE_LIMIT', 1000))
+BULK_ACTION_WORKERS = int(os.getenv('BULK_ACTION_WORKERS', 2))
+BULK_ACTION_STALE_MINUTES = int(os.getenv('BULK_ACTION_STALE_MINUTES', 10))
+
+# Admin changelists of tables above this many rows show Postgres' estimated count
+ADMIN_ESTIMATED_COUNT_THRESHOLD = int(os.getenv('ADMIN_ESTIMATED_COUNT_THRESHOLD', 100000))
+
+# How long responses of Idempotency-Key requests are replayed
+IDEMPOTENCY_KEY_TTL_HOURS = int(os.getenv('IDEMPOTENCY_KEY_TTL_HOURS', 24))
+
+# Snowflake ids (order numbers). Set SNOWFLAKE_NODE_ID (0-1023) to pin this process'
+# node id; otherwise each process leases a free one from the database (PostgreSQL).
+SNOWFLAKE_NODE_ID = int(os.environ['SNOWFLAKE_NODE_ID']) if os.getenv('SNOWFLAKE_NODE_ID') else None
+SNOWFLAKE_LEASE_SECONDS = int(os.getenv('SNOWFLAKE_LEASE_SECONDS', 600))
+# A process stops using its node id this long before the lease ends (maximum clock skew between hosts)
+SNOWFLAKE_LEASE_MARGIN_SECONDS = int(os.getenv('SNOWFLAKE_LEASE_MARGIN_SECONDS', 30))
+
+# Monthly partitions of orders and order_items (PostgreSQL): months created in advance,
+# months kept in the database, and where older months are archived
+ORDER_PARTITION_MONTHS_AHEAD = int(os.getenv('ORDER_PARTITION_MONTHS_AHEAD', 3))
+ORDER_HOT_MONTHS = int(os.getenv('ORDER_HOT_MONTHS', 24))
+ORDER_ARCHIVE_ROOT = os.getenv('ORDER_ARCHIVE_ROOT', BASE_DIR / 'archive' / 'orders')
+ORDER_ARCHIVE_CACHE_SECONDS = int(os.getenv('ORDER_ARCHIVE_CACHE_SECONDS', 3600))
+
+# Order pricing where no tax rule or shipping zone matches the destination
+ORDER_DEFAULT_TAX_RATE = os.getenv('ORDER_DEFAULT_TAX_RATE', '10')
+ORDER_DEFAULT_SHIPPING_COST = os.getenv('ORDER_DEFAULT_SHIPPING_COST', '10.00')
+# How long checkout accepts a quote's totals
+ORDER_QUOTE_TTL_SECONDS = int(os.getenv('ORDER_QUOTE_TTL_SECONDS', 900))
+
+# Streamed exports: rows fetched per database round trip, bytes per write
+EXPORT_CHUNK_SIZE = int(os.getenv('EXPORT_CHUNK_SIZE', 2000))
+EXPORT_BUFFER_SIZE = int(os.getenv('EXPORT_BUFFER_SIZE', 64 * 1024))
+
+# Rows validated and inserted per batch by product imports
+PRODUCT_IMPORT_CHUNK_SIZE = int(os.getenv('PRODUCT_IMPORT_CHUNK_SIZE', 1000))
+
+# Stock and price changes applied per UPDATE by product syncs
+PRODUCT_SYNC_BATCH_SIZE = int(os.getenv('PRODUCT_SYNC_BATCH_SIZE', 5000))
+
+# How long the summed stock of a striped (hot) product is cached
+STOCK_STRIPE_CACHE_SECONDS = int(os.getenv('STOCK_STRIPE_CACHE_SECONDS', 5))
+
+# Stock ledger: snapshots only cover movements older than the lag (so late
+# commits aren't skipped); reconciliation compares products in parallel chunks
+STOCK_SNAPSHOT_LAG_SECONDS = int(os.getenv('STOCK_SNAPSHOT_LAG_SECONDS', 300))
+STOCK_RECONCILE_CHUNK_SIZE = int(os.getenv('STOCK_RECONCILE_CHUNK_SIZE', 5000))
+STOCK_RECONCILE_WORKERS = int(os.getenv('STOCK_RECONCILE_WORKERS', 4))
+
 # Stripe Settings
 STRIPE_PUBLISHABLE_KEY = os.getenv('STRIPE_PUBLISHABLE_KEY', default='')
 STRIPE_SECRET_KEY = os.getenv('STRIPE_SECRET_KEY', default='')
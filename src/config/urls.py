@@ -37,6 +37,13 @@ urlpatterns = [
     path('api/v1/products/', include('apps.products.urls')),
     path('api/v1/cart/', include('apps.cart.urls')),
     path('api/v1/orders/', include('apps.orders.urls')),
+    path('api/v1/analytics/', include('apps.analytics.urls')),
+    path('api/v1/exports/', include('apps.core.export_urls')),
+    
+    # Async variants of I/O-bound endpoints (serve with config.asgi)
+    path('api/v1/async/auth/', include('apps.users.async_urls')),
+    path('api/v1/async/products/', include('apps.products.async_urls')),
+    path('api/v1/async/payments/', include('apps.payments.async_urls')),
     
      
 ]